@@ -1,4 +1,4 @@
 from backend.extraction.extract_info_from_config_file_and_documents import (
     extract_infos_from_config_file_and_files_tree,
 )
-from backend.generation.fill_template import fill_template
+from backend.generation.fill_template import fill_template, fill_templates_batch
@@ -1,13 +1,15 @@
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 import backend.config_file.info_page.read as info_page
 from backend.config_file.info_page import NAME_WORKSHEET as NAME_WORKSHEET_INFO
 from backend.config_file.info_page.read import read_info_page_and_preprocess
+from backend.config_file.info_page.utils import get_excel_sheet as get_excel_sheet_info
 from backend.config_file.info_page.write import write_values
 from backend.config_file.source_page import NAME_WORKSHEET as NAME_WORKSHEET_SOURCE
 from backend.config_file.source_page import TYPE_SOURCES, read_source_page
 from backend.excel.excel_book import ExcelBook
+from backend.excel.excel_book_texts import ExcelBookTexts
 from backend.info_struct.info_extraction_datas import InfoExtractionDatas
 from backend.info_struct.info_values import InfoValues
 from logger import f, logger
@@ -18,6 +20,7 @@ from logs_label import (
     SourceNotGiven,
     SourceNotUseful,
 )
+from timing import timer
 from vars import SUPPORTED_FILES_EXT_EXTRACTION
 
 # ------------------- Public Method -------------------
@@ -26,12 +29,23 @@ from vars import SUPPORTED_FILES_EXT_EXTRACTION
 # > read
 
 
+def load_config_file(path_config_file: Path) -> ExcelBookTexts:
+    """
+    The texts of the config file, read once : they can be given to the reading
+    and to the filling of the same config file.
+    """
+
+    return ExcelBookTexts(path_config_file)
+
+
 def read_config_file(
-    path_config_file: Path, path_folder_sources: Path
+    path_config_file: Path,
+    path_folder_sources: Path,
+    texts: Optional[ExcelBookTexts] = None,
 ) -> Tuple[TYPE_SOURCES, Dict[str, InfoExtractionDatas]]:
 
     # open the excel
-    em = ExcelBook(path_config_file)
+    em = texts or load_config_file(path_config_file)
 
     # read the source page : read the label and the path of each file
     sources = read_source_page(em)
@@ -53,7 +67,7 @@ def read_config_file(
 def read_info_values(path_config_file: Path) -> InfoValues:
 
     # open the excel
-    em = ExcelBook(path_config_file)
+    em = load_config_file(path_config_file)
 
     # read
     return info_page.read_info_values(em)
@@ -62,15 +76,26 @@ def read_info_values(path_config_file: Path) -> InfoValues:
 # > write
 
 
+@timer.timed("config write")
 def fill_config_file(
-    path_config_file: Path, infos: InfoValues, path_output: Path
+    path_config_file: Path,
+    infos: InfoValues,
+    path_output: Path,
+    texts: Optional[ExcelBookTexts] = None,
 ) -> None:
+    """
+    Args:
+        texts (Optional[ExcelBookTexts]): texts of the config file already read,
+        used to locate the rows to fill.
+    """
 
     # open
     eb = ExcelBook(path_config_file)
 
     # write
-    write_values(eb, infos)
+    write_values(
+        eb, infos, texts=None if texts is None else get_excel_sheet_info(texts)
+    )
 
     # save
     eb.save(path_output)
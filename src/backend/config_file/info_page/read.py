@@ -12,8 +12,7 @@ from backend.config_file.info_page.info_list_helper import (
     rearange_structure_info_list,
 )
 from backend.config_file.info_page.utils import check_header, get_excel_sheet
-from backend.excel.excel_book import ExcelBook
-from backend.excel.excel_sheet import ExcelSheet
+from backend.excel.excel_book_texts import TYPE_EXCEL_BOOK_READ, TYPE_EXCEL_SHEET_READ
 from backend.info_struct import ExtractionData, InfoExtractionDatas, InfoValues
 from logger import INFO, f, logger
 from logs_label import EmptyInfoExcel, NameDuplicated
@@ -33,7 +32,7 @@ def _preprocess_info(data: Datas, content: str):
     return func(content)
 
 
-def read_line(es: ExcelSheet, row: int) -> ExtractionData:
+def read_line(es: TYPE_EXCEL_SHEET_READ, row: int) -> ExtractionData:
     d = {
         data.name.lower(): _preprocess_info(
             data=data, content=es.get_text_cell(row, data.col)
@@ -46,7 +45,7 @@ def read_line(es: ExcelSheet, row: int) -> ExtractionData:
 # ------------------------- Main -------------------------
 
 
-def read_info_page(eb: ExcelBook) -> List[ExtractionData]:
+def read_info_page(eb: TYPE_EXCEL_BOOK_READ) -> List[ExtractionData]:
 
     es = get_excel_sheet(eb)
 
@@ -62,7 +61,7 @@ def read_info_page(eb: ExcelBook) -> List[ExtractionData]:
     # read data
     infos: List[ExtractionData] = []
 
-    for current_row in range(FIRST_ROW_INFO, es.get_row_dimension() + 1):
+    for current_row in es.get_populated_rows(min_row=FIRST_ROW_INFO):
         # retrieve metadata and data of the info
         info = read_line(es, current_row)
 
@@ -132,7 +131,7 @@ def checks_and_filter(
 # def checks_and_filter_global(eds : List[ExtractionData]) -> ExtractionData:
 
 
-def read_info_page_and_preprocess(em: ExcelBook) -> Dict[str, InfoExtractionDatas]:
+def read_info_page_and_preprocess(em: TYPE_EXCEL_BOOK_READ) -> Dict[str, InfoExtractionDatas]:
     """
     Purposes :
     1. Read, from config file, the info page
@@ -184,7 +183,7 @@ def read_info_page_and_preprocess(em: ExcelBook) -> Dict[str, InfoExtractionData
     }
 
 
-def read_info_values(em: ExcelBook) -> InfoValues:
+def read_info_values(em: TYPE_EXCEL_BOOK_READ) -> InfoValues:
 
     eds = read_info_page(em)
 
@@ -1,11 +1,10 @@
 from logging import WARNING
 
 from backend.config_file.info_page import NAME_WORKSHEET, ROW_HEADER, TITLE_ERROR, Datas
-from backend.excel.excel_book import ExcelBook
-from backend.excel.excel_sheet import ExcelSheet
+from backend.excel.excel_book_texts import TYPE_EXCEL_BOOK_READ, TYPE_EXCEL_SHEET_READ
 
 
-def check_header(es: ExcelSheet):
+def check_header(es: TYPE_EXCEL_SHEET_READ):
 
     for data in Datas:
 
@@ -18,5 +17,5 @@ def check_header(es: ExcelSheet):
         )
 
 
-def get_excel_sheet(eb: ExcelBook) -> ExcelSheet:
+def get_excel_sheet(eb: TYPE_EXCEL_BOOK_READ) -> TYPE_EXCEL_SHEET_READ:
     return eb.get_excel_sheet(NAME_WORKSHEET)
@@ -1,4 +1,4 @@
-from typing import List, NamedTuple
+from typing import List, NamedTuple, Optional
 
 from backend.config_file.info_page import Datas
 from backend.config_file.info_page.info_list_helper import (
@@ -10,6 +10,7 @@ from backend.config_file.info_page.info_list_helper import (
 from backend.config_file.info_page.read import InfoValues, read_line
 from backend.config_file.info_page.utils import get_excel_sheet
 from backend.excel.excel_book import ExcelBook
+from backend.excel.excel_book_texts import TYPE_EXCEL_SHEET_READ, ExcelSheetTexts
 from backend.excel.excel_sheet import ExcelSheet
 from backend.info_struct.extraction_data import ExtractionData
 from backend.info_struct.info_values import InfoValues
@@ -18,21 +19,32 @@ from logger import logger
 # ------------------- Public Method -------------------
 
 
-def write_values(eb: ExcelBook, infos: InfoValues) -> None:
+def write_values(
+    eb: ExcelBook, infos: InfoValues, texts: Optional[ExcelSheetTexts] = None
+) -> None:
+    """
+    Args:
+        texts (Optional[ExcelSheetTexts]): texts of the info page already read,
+        the rows to write on are located from them instead of reading the sheet again.
+    """
 
     es = get_excel_sheet(eb)
-    _write_values_independent_info(es, infos)
-    _write_values_list_info(es, infos)
+    rows = es if texts is None else texts
+
+    _write_values_independent_info(es, rows, infos)
+    _write_values_list_info(es, rows, infos)
 
 
 # ------------------- Private Method -------------------
 
 
-def _write_values_independent_info(es: ExcelSheet, infos: InfoValues) -> None:
+def _write_values_independent_info(
+    es: ExcelSheet, rows: TYPE_EXCEL_SHEET_READ, infos: InfoValues
+) -> None:
 
-    for current_row in range(1, es.get_row_dimension() + 1):
+    for current_row in rows.get_populated_rows():
         # retrieve metadata and data of the info
-        info = read_line(es, current_row)
+        info = read_line(rows, current_row)
 
         if info.name is None:
             continue
@@ -47,7 +59,9 @@ def _write_values_independent_info(es: ExcelSheet, infos: InfoValues) -> None:
             )
 
 
-def _write_values_list_info(es: ExcelSheet, infos: InfoValues):
+def _write_values_list_info(
+    es: ExcelSheet, rows: TYPE_EXCEL_SHEET_READ, infos: InfoValues
+):
 
     # get the (first_name, start row, end row, list of the sub information) of each list
 
@@ -62,26 +76,28 @@ def _write_values_list_info(es: ExcelSheet, infos: InfoValues):
     )
 
     lists: List[row_info_type] = []
+    first_names = set()
     current_row = 1
-    max_row = es.get_row_dimension() + 1
+    max_row = rows.get_row_dimension() + 1
     while current_row < max_row:
 
         # find the beginning of a list info
-        info = read_line(es, current_row)
+        info = read_line(rows, current_row)
 
         if not is_info_list(info.name):
             current_row += 1
             continue
 
         first_name = get_first_name(info.name)
-        assert not first_name in [e.first_name for e in lists]
+        assert not first_name in first_names
+        first_names.add(first_name)
 
         start = current_row
 
         # search the end of this list
         sub_infos = []
         while current_row < max_row:
-            info = read_line(es, current_row)
+            info = read_line(rows, current_row)
             if not is_info_list(info.name):
                 break
 
@@ -106,48 +122,31 @@ def _write_values_list_info(es: ExcelSheet, infos: InfoValues):
     # filter by keeping the lists that any of their information have been found
     lists = [e for e in lists if e.first_name in infos.list_infos.keys()]
 
-    # insert rows
-    for idx_row_info, row_info in enumerate(lists):
-
-        infos_extracted = infos.list_infos.get(row_info.first_name)
-
-        nb_to_add = len(row_info.sub_infos) * (len(infos_extracted) - 1)
-        if nb_to_add == 0:
-            continue
-
-        # insert
-        es.insert_rows(row=row_info.end_row + 1, amount=nb_to_add)
-
-        # copy content
-        for idx in range(len(infos_extracted) - 1):
-
-            es.copy_rectangle(
-                from_row=row_info.start_row,
-                from_col=1,
-                to_row=row_info.end_row + 1 + idx * len(row_info.sub_infos),
-                to_col=1,
-                nb_row=len(row_info.sub_infos),
-            )
-
-        # update start and end
-        for idx in range(idx_row_info + 1, len(lists)):
-            row_info_to_update = lists[idx]
-            lists[idx] = row_info_type(
-                first_name=row_info_to_update.first_name,
-                start_row=row_info_to_update.start_row + nb_to_add,
-                end_row=row_info_to_update.end_row + nb_to_add,
-                sub_infos=row_info_to_update.sub_infos,
+    # final layout : the rows of each list are repeated once per element,
+    # all the rows being moved at once
+    es.expand_row_blocks(
+        [
+            (
+                row_info.start_row,
+                row_info.end_row,
+                max(len(infos.list_infos[row_info.first_name]) - 1, 0),
             )
+            for row_info in lists
+        ]
+    )
 
     # write on the rows
+    nb_rows_added = 0
     for row_info in lists:
 
-        for idx_ele_lst, info_extracted in enumerate(
-            infos.list_infos.get(row_info.first_name)
-        ):
+        infos_extracted = infos.list_infos[row_info.first_name]
+        nb_sub_infos = len(row_info.sub_infos)
+        start_row = row_info.start_row + nb_rows_added
+
+        for idx_ele_lst, info_extracted in enumerate(infos_extracted):
 
             # compute row
-            row_first = row_info.start_row + idx_ele_lst * len(sub_infos)
+            row_first = start_row + idx_ele_lst * nb_sub_infos
 
             # write on instuction column
             es.ws.cell(
@@ -164,3 +163,5 @@ def _write_values_list_info(es: ExcelSheet, infos: InfoValues):
 
                 if value:
                     es.ws.cell(row, Datas.VALUE.col, value)
+
+        nb_rows_added += nb_sub_infos * max(len(infos_extracted) - 1, 0)
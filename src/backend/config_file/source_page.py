@@ -2,7 +2,7 @@ from collections import Counter
 from pathlib import Path
 from typing import Dict
 
-from backend.excel.excel_book import ExcelBook, ExcelSheet
+from backend.excel.excel_book_texts import TYPE_EXCEL_BOOK_READ, TYPE_EXCEL_SHEET_READ
 from logger import logger
 from logs_label import (
     EmptyInfoExcel,
@@ -27,7 +27,7 @@ ROW_HEADER = 2
 FIRST_ROW_DATA = 3
 
 
-def check_header(es: ExcelSheet, col: int, expected_header: str):
+def check_header(es: TYPE_EXCEL_SHEET_READ, col: int, expected_header: str):
     es.check_content_cell(
         page_name=NAME_WORKSHEET,
         row=ROW_HEADER,
@@ -36,7 +36,7 @@ def check_header(es: ExcelSheet, col: int, expected_header: str):
     )
 
 
-def read_source_page(em: ExcelBook) -> TYPE_SOURCES:
+def read_source_page(em: TYPE_EXCEL_BOOK_READ) -> TYPE_SOURCES:
     es = em.get_excel_sheet(name=NAME_WORKSHEET)
 
     # checks
@@ -47,7 +47,7 @@ def read_source_page(em: ExcelBook) -> TYPE_SOURCES:
 
     sources: TYPE_SOURCES = {}
 
-    for current_row in range(FIRST_ROW_DATA, es.get_row_dimension() + 1):
+    for current_row in es.get_populated_rows(min_row=FIRST_ROW_DATA):
 
         # reading
         name_source = es.get_text_cell(row=current_row, col=COL_NAME)
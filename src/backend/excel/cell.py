@@ -1,6 +1,7 @@
-from dataclasses import dataclass
+from copy import copy
 from typing import Any, Optional, Union
 
+from openpyxl.cell.cell import Cell as OpenpyxlCell
 from openpyxl.cell.rich_text import CellRichText
 from openpyxl.styles.borders import Border
 from openpyxl.styles.fills import PatternFill
@@ -9,16 +10,76 @@ from openpyxl.styles.fonts import Font
 from backend.table.cell_base import CellBase
 
 
-@dataclass
 class Cell(CellBase):
-    row: int
-    col: int
-    value: Optional[Union[CellRichText, str]]
-    str: Optional[str]
-    font: Font
-    fill: PatternFill
-    border: Border
-    alignment: Any
-    number_format: Any
-    protection: Any
-    has_style: bool
+    """
+    View over an openpyxl cell : value and text are read once,
+    the style attributes are only resolved when accessed.
+    """
+
+    __slots__ = ("value", "_cell", "_style")
+
+    def __init__(
+        self,
+        row: int,
+        col: int,
+        value: Optional[Union[CellRichText, str]],
+        str: Optional[str],
+        cell: OpenpyxlCell,
+        snapshot: bool = False,
+    ):
+        """
+        Args:
+            snapshot (bool): resolve the style now, the view does not follow
+            the later changes of the openpyxl cell.
+        """
+        super().__init__(row=row, col=col, str=str)
+        self.value = value
+        self._cell = cell
+        self._style = None
+
+        if snapshot:
+            self._style = {
+                "font": copy(cell.font),
+                "fill": copy(cell.fill),
+                "border": copy(cell.border),
+                "alignment": copy(cell.alignment),
+                "number_format": cell.number_format,
+                "protection": copy(cell.protection),
+                "has_style": cell.has_style,
+            }
+
+    def _get_style(self, name: str) -> Any:
+        if self._style is not None:
+            return self._style[name]
+        return getattr(self._cell, name)
+
+    @property
+    def font(self) -> Font:
+        return self._get_style("font")
+
+    @property
+    def fill(self) -> PatternFill:
+        return self._get_style("fill")
+
+    @property
+    def border(self) -> Border:
+        return self._get_style("border")
+
+    @property
+    def alignment(self) -> Any:
+        return self._get_style("alignment")
+
+    @property
+    def number_format(self) -> Any:
+        return self._get_style("number_format")
+
+    @property
+    def protection(self) -> Any:
+        return self._get_style("protection")
+
+    @property
+    def has_style(self) -> bool:
+        return self._get_style("has_style")
+
+    def __repr__(self):
+        return f"Cell(row={self.row}, col={self.col}, str={self.str})"
@@ -0,0 +1,83 @@
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from openpyxl import load_workbook
+
+from backend.excel.excel_book import ExcelBook
+from backend.excel.excel_sheet import ExcelSheet
+from backend.excel.excel_sheet_checks import ExcelSheetChecks
+from logs_label import ExcelNotExisting, NoRightWorksheet
+
+
+class ExcelSheetTexts(ExcelSheetChecks):
+    """Texts of a worksheet, only the populated rows are kept"""
+
+    def __init__(self, name: str, rows: Dict[int, Tuple[Optional[str], ...]]):
+        self.name = name
+        # {row: (text col 1, text col 2, ...)}
+        self.rows = rows
+
+    def get_text_cell(self, row: int, col: int) -> Optional[str]:
+        texts = self.rows.get(row)
+        if texts is None or col > len(texts):
+            return None
+        return texts[col - 1]
+
+    def get_populated_rows(self, min_row: int = 1) -> List[int]:
+        return [row for row in self.rows if row >= min_row]
+
+    def get_row_dimension(self) -> int:
+        return max(self.rows, default=0)
+
+
+class ExcelBookTexts:
+    """
+    Texts of a workbook, read once in read-only mode.
+    Same reading interface as 'ExcelBook', without the styles.
+    """
+
+    def __init__(self, path_excel: Path):
+        self.path_excel = path_excel
+        if not path_excel.exists():
+            raise ExcelNotExisting(path_excel)
+
+        wb = load_workbook(path_excel, read_only=True)
+        try:
+            self.sheets: Dict[str, ExcelSheetTexts] = {
+                name: ExcelSheetTexts(name=name, rows=_read_rows(ws))
+                for name, ws in zip(wb.sheetnames, wb.worksheets)
+            }
+        finally:
+            wb.close()
+
+    def get_excel_sheet(self, name: str) -> ExcelSheetTexts:
+        if name not in self.sheets:
+            raise NoRightWorksheet(
+                excel_name=self.get_excel_name(),
+                page_name=f"The page worksheet named '{name}' does not exist or is does not have the right name.",
+            )
+        return self.sheets[name]
+
+    def get_excel_name(self) -> str:
+        return Path(self.path_excel).name
+
+
+def _read_rows(ws) -> Dict[int, Tuple[Optional[str], ...]]:
+
+    # the dimensions written in the file can be wrong
+    ws.reset_dimensions()
+
+    rows = {}
+    for row, values in enumerate(ws.iter_rows(values_only=True), start=1):
+        texts = tuple(
+            None if value is None else ExcelSheet._text(value) for value in values
+        )
+        if any(texts):
+            rows[row] = texts
+
+    return rows
+
+
+# what the readers accept : the whole workbook or only its texts
+TYPE_EXCEL_SHEET_READ = Union[ExcelSheet, ExcelSheetTexts]
+TYPE_EXCEL_BOOK_READ = Union[ExcelBook, ExcelBookTexts]
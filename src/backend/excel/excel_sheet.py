@@ -1,18 +1,24 @@
+from bisect import bisect_left, bisect_right
 from copy import copy
-from typing import Any, Callable, List, Optional, Tuple
+from itertools import accumulate
+from typing import Any, Callable, Iterator, List, Optional, Tuple
 
+from openpyxl.cell.cell import Cell as OpenpyxlCell
 from openpyxl.cell.rich_text import CellRichText, TextBlock
+from openpyxl.styles.cell_style import StyleArray
 from openpyxl.styles.fonts import Font
 from openpyxl.workbook import Workbook
 from openpyxl.worksheet.worksheet import Worksheet
 
 from backend.excel.cell import Cell
+from backend.excel.excel_sheet_checks import ExcelSheetChecks
 from backend.table.table_base import TableBase
-from logger import WARNING, f, logger
-from logs_label import EmptynessExcelCell, ExactnessExcelCell, FullnessExcelCell
 
+# (row, col, value, whole style array) of a cell, before a copy
+TYPE_CELL_SNAPSHOT = Tuple[int, int, Any, Optional[StyleArray]]
 
-class ExcelSheet(TableBase[Cell]):
+
+class ExcelSheet(TableBase[Cell], ExcelSheetChecks):
     """Wrapper around openpyxl Worksheet"""
 
     def __init__(self, ws: Worksheet, name: str, wb: Workbook):
@@ -26,28 +32,44 @@ class ExcelSheet(TableBase[Cell]):
     def none_transformation(s: Optional[Any]) -> Optional[Any]:
         return None if (s is None or s == "" or s == "None") else s
 
-    def get_cell(self, row: int, col: int) -> Cell:
+    @staticmethod
+    def _text(value: Optional[Any]) -> Optional[str]:
+        return ExcelSheet.none_transformation(str(value).strip())
+
+    def get_cell(self, row: int, col: int, copy: bool = False) -> Cell:
+
+        c = self.ws._cells.get((row, col))
+        if c is None:
+            # not stored : a default cell, without adding it to the sheet
+            c = OpenpyxlCell(self.ws, row=row, column=col)
 
-        c = self.ws.cell(row, col)
-        # assert isinstance(font, Font), f"type : {type(font)}"
+        value = ExcelSheet.none_transformation(c.value)
+        if copy and isinstance(value, CellRichText):
+            value = CellRichText(list(value))
 
         return Cell(
             row=row,
             col=col,
-            value=ExcelSheet.none_transformation(self.ws.cell(row, col).value),
-            str=self.get_text_cell(row, col),
-            font=c.font,
-            fill=c.fill,
-            border=c.border,
-            alignment=c.alignment,
-            number_format=c.number_format,
-            protection=c.protection,
-            has_style=c.has_style,
+            value=value,
+            str=ExcelSheet._text(c.value),
+            cell=c,
+            snapshot=copy,
         )
 
     def get_text_cell(self, row: int, col: int) -> Optional[str]:
-        s = str(self.ws.cell(row, col).value).strip()
-        return ExcelSheet.none_transformation(s)
+        # reading must not create the cell
+        c = self.ws._cells.get((row, col))
+        return ExcelSheet._text(None if c is None else c.value)
+
+    def iter_cells(
+        self, min_row: int = 1, min_col: int = 1, max_col: Optional[int] = None
+    ) -> Iterator[Cell]:
+        for row, col in sorted(self.ws._cells):
+            if row < min_row or col < min_col or (max_col is not None and col > max_col):
+                continue
+
+            if self.get_text_cell(row, col) is not None:
+                yield self.get_cell(row, col)
 
     def get_row_dimension(self) -> int:
         return self.ws.max_row
@@ -69,141 +91,183 @@ class ExcelSheet(TableBase[Cell]):
         col: int,
         replace_text: Callable[[str], Tuple[str, int]],
     ) -> int:
-        nb_changes = 0
 
         # read
         cell_value = self.ws.cell(row, col).value
         if cell_value is None:
-            return nb_changes
-
-        if isinstance(cell_value, str):
-            # replace
-            cell_value, nb_new_changes = replace_text(cell_value)
-            nb_changes += nb_new_changes
-
-            # write
-            self.ws.cell(row, col, value=cell_value)
-        elif isinstance(cell_value, CellRichText):
-            # replace
-            for i, e in enumerate(cell_value):
+            return 0
+
+        # replace
+        cell_value, nb_changes = ExcelSheet._replace_text_value(
+            cell_value, replace_text
+        )
+
+        # write
+        self.ws.cell(row, col, value=cell_value)
+
+        return nb_changes
+
+    @staticmethod
+    def _replace_text_value(
+        value: Any, replace_text: Callable[[str], Tuple[str, int]]
+    ) -> Tuple[Any, int]:
+        """
+        Returns:
+            Tuple[Any, int]: new value (the given one is left untouched) and number of changes
+        """
+
+        if isinstance(value, str):
+            return replace_text(value)
+
+        if isinstance(value, CellRichText):
+            nb_changes = 0
+            new_value = CellRichText()
+            for e in value:
                 text = e if isinstance(e, str) else e.text
 
                 text, nb_new_changes = replace_text(text)
                 nb_changes += nb_new_changes
 
-                if isinstance(e, str):
-                    cell_value[i] = text
-                else:
-                    cell_value[i] = TextBlock(e.font, text)
+                new_value.append(text if isinstance(e, str) else TextBlock(e.font, text))
 
-                self.ws.cell(row, col, value=cell_value)
-        else:
-            raise ValueError(f"Excel cell type not implemmented : {type(cell_value)}")
+            return new_value, nb_changes
 
-        return nb_changes
+        raise ValueError(f"Excel cell type not implemmented : {type(value)}")
 
     def erase_cell(self, row: int, col: int) -> None:
         cell = self.ws.cell(row=row, column=col)
         cell.value = ""
         cell.font = Font()
 
-    # ------------------- Checkers -------------------
+    # ------------------- Copy -------------------
 
-    def check_content_cell(
-        self,
-        page_name: str,
-        row: int,
-        col: int,
-        expected_content: str,
-        log_level: str = WARNING,
-    ) -> bool:
-        """
-        Returns:
-            bool: True if an error has been detected
-        """
+    def duplicate_rows(
+        self, start_row: int, end_row: int, amount: int, from_col: int = 1
+    ) -> None:
+        if amount == 0:
+            return
 
-        content = self.get_text_cell(row=row, col=col)
-        if content is None or content.lower() != expected_content.lower():
-            logger.log(
-                level=log_level,
-                msg=f"{page_name} : Text cell{f(row=row, col=col)} should be '{expected_content}' but is '{content}'",
-                extra=ExactnessExcelCell(
-                    page_name=page_name,
-                    row=row,
-                    col=col,
-                    expected=expected_content,
-                    actual=content,
-                ),
-            )
-            return True
-        return False
+        nb_row = end_row - start_row + 1
+        self.insert_rows(row=end_row + 1, amount=nb_row * amount)
 
-    def check_emptiness_row(
-        self,
-        page_name: str,
-        row: int,
-        header_name_cols: Tuple[str, int],
-        log_level: str = WARNING,
-    ) -> bool:
-        """
-        Returns:
-            bool: True if an error has been detected
-        """
+        block = self._snapshot_rows(start_row, end_row, from_col)
+        for idx in range(1, amount + 1):
+            self._paste_snapshot(block, offset=nb_row * idx)
+
+    def expand_row_blocks(
+        self, blocks: List[Tuple[int, int, int]], from_col: int = 1
+    ) -> None:
+        # final layout : each row is moved by the rows added by the blocks above it
+        blocks = sorted(block for block in blocks if block[2] > 0)
+        if not blocks:
+            return
 
-        not_empty_cols = [
-            (header_name, content)
-            for header_name, col in header_name_cols
-            if (content := self.get_text_cell(row=row, col=col))
+        ends = [end_row for _, end_row, _ in blocks]
+        nb_rows_added = [
+            (end_row - start_row + 1) * amount for start_row, end_row, amount in blocks
         ]
+        offsets = list(accumulate(nb_rows_added, initial=0))
+
+        # one pass on the cells : snapshot the blocks and move every cell once
+        starts = [start_row for start_row, _, _ in blocks]
+        snapshots: List[List[TYPE_CELL_SNAPSHOT]] = [[] for _ in blocks]
+
+        cells = dict(self.ws._cells)
+        self.ws._cells.clear()
+        for (row, col), c in cells.items():
+            idx_block = bisect_right(starts, row) - 1
+            if idx_block >= 0 and row <= ends[idx_block] and col >= from_col:
+                snapshots[idx_block].append(ExcelSheet._snapshot_cell(c, row, col))
+
+            c.row = row + offsets[bisect_left(ends, row)]
+            self.ws._cells[(c.row, col)] = c
+
+        # paste the copies right after their block
+        for (start_row, end_row, amount), offset, block in zip(
+            blocks, offsets, snapshots
+        ):
+            nb_row = end_row - start_row + 1
+            for idx in range(1, amount + 1):
+                self._paste_snapshot(block, offset=offset + nb_row * idx)
+
+    def repeat_block(
+        self,
+        start_row: int,
+        end_row: int,
+        replace_texts: List[Callable[[str], Tuple[str, int]]],
+        from_col: int = 1,
+    ) -> int:
+        if not replace_texts:
+            return 0
 
-        if not_empty_cols:
-            not_empty_cols_names = [header_name for header_name, _ in not_empty_cols]
-            contents = [content for _, content in not_empty_cols]
-            logger.log(
-                level=log_level,
-                msg=f"{page_name} : Column(s) [{', '.join(not_empty_cols_names)}] is/are not empty on the row {row}.\n"
-                + f"Here is the content : {contents}.\n"
-                + "The excel may have a mistake.",
-                extra=FullnessExcelCell(
-                    page_name=page_name,
-                    header_names=not_empty_cols,
-                    row=row,
-                    actuals=contents,
-                ),
-            )
+        nb_row = end_row - start_row + 1
+        self.insert_rows(row=end_row + 1, amount=nb_row * (len(replace_texts) - 1))
 
-        return not_empty_cols
+        block = self._snapshot_rows(start_row, end_row, from_col)
 
-    def check_fullness_row(
-        self,
-        page_name: str,
-        row: int,
-        header_name_cols: List[Tuple[str, int]],
-        log_level: str = WARNING,
-    ) -> bool:
-        """
-        Returns:
-            bool: True if an error has been detected
-        """
+        # write each element, already filled
+        nb_changes = 0
+        for idx, replace_text in enumerate(replace_texts):
+            offset = nb_row * idx
+            for row, col, value, style in block:
+                nb_new_changes = 0
+                if value is not None:
+                    value, nb_new_changes = ExcelSheet._replace_text_value(
+                        value, replace_text
+                    )
+                    nb_changes += nb_new_changes
+
+                # the block itself keeps its cells when nothing changed
+                if idx == 0 and nb_new_changes == 0:
+                    continue
+
+                # the inserted rows are empty : no need to create empty cells
+                if value is None and style is None:
+                    continue
+
+                dst_cell = self.ws.cell(row=row + offset, column=col)
+                dst_cell.value = value
+                if idx > 0 and style is not None:
+                    dst_cell._style = copy(style)
+
+        return nb_changes
 
-        empty_cols = [
-            header_name
-            for header_name, col in header_name_cols
-            if self.get_text_cell(row=row, col=col) is None
+    @staticmethod
+    def _snapshot_cell(c: OpenpyxlCell, row: int, col: int) -> TYPE_CELL_SNAPSHOT:
+        return (
+            row,
+            col,
+            ExcelSheet.none_transformation(c.value),
+            c._style if c.has_style else None,
+        )
+
+    def _snapshot_rows(
+        self, start_row: int, end_row: int, from_col: int
+    ) -> List[TYPE_CELL_SNAPSHOT]:
+        """The stored cells of the rows, from 'from_col', without creating the others"""
+
+        max_col = self.get_col_dimension()
+        return [
+            ExcelSheet._snapshot_cell(c, row, col)
+            for row in range(start_row, end_row + 1)
+            for col in range(from_col, max_col + 1)
+            if (c := self.ws._cells.get((row, col))) is not None
         ]
 
-        if empty_cols:
-            logger.log(
-                level=log_level,
-                msg=f"{page_name} : Column(s) [{', '.join(empty_cols)}] is/are empty on the row {row}.\n"
-                + f"The excel may have a mistake.",
-                extra=EmptynessExcelCell(
-                    page_name=page_name, header_names=empty_cols, row=row
-                ),
-            )
-        return empty_cols
+    def _paste_snapshot(self, block: List[TYPE_CELL_SNAPSHOT], offset: int) -> None:
+        """Write a copy of the cells 'offset' rows lower, into empty rows"""
 
-    # ------------------- Copy -------------------
+        for row, col, value, style in block:
+            # no need to create empty cells
+            if value is None and style is None:
+                continue
+
+            dst_cell = self.ws.cell(row=row + offset, column=col)
+            dst_cell.value = (
+                CellRichText(list(value)) if isinstance(value, CellRichText) else value
+            )
+            if style is not None:
+                dst_cell._style = copy(style)
 
     def copy_cell(self, src_cell: Cell, row: int, col: int) -> None:
 
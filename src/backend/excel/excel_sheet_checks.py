@@ -0,0 +1,109 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+
+from logger import WARNING, f, logger
+from logs_label import EmptynessExcelCell, ExactnessExcelCell, FullnessExcelCell
+
+
+class ExcelSheetChecks(ABC):
+    """Checks of the content of a worksheet, only relying on the texts of the cells"""
+
+    @abstractmethod
+    def get_text_cell(self, row: int, col: int) -> Optional[str]:
+        pass
+
+    # ------------------- Checkers -------------------
+
+    def check_content_cell(
+        self,
+        page_name: str,
+        row: int,
+        col: int,
+        expected_content: str,
+        log_level: str = WARNING,
+    ) -> bool:
+        """
+        Returns:
+            bool: True if an error has been detected
+        """
+
+        content = self.get_text_cell(row=row, col=col)
+        if content is None or content.lower() != expected_content.lower():
+            logger.log(
+                level=log_level,
+                msg=f"{page_name} : Text cell{f(row=row, col=col)} should be '{expected_content}' but is '{content}'",
+                extra=ExactnessExcelCell(
+                    page_name=page_name,
+                    row=row,
+                    col=col,
+                    expected=expected_content,
+                    actual=content,
+                ),
+            )
+            return True
+        return False
+
+    def check_emptiness_row(
+        self,
+        page_name: str,
+        row: int,
+        header_name_cols: Tuple[str, int],
+        log_level: str = WARNING,
+    ) -> bool:
+        """
+        Returns:
+            bool: True if an error has been detected
+        """
+
+        not_empty_cols = [
+            (header_name, content)
+            for header_name, col in header_name_cols
+            if (content := self.get_text_cell(row=row, col=col))
+        ]
+
+        if not_empty_cols:
+            not_empty_cols_names = [header_name for header_name, _ in not_empty_cols]
+            contents = [content for _, content in not_empty_cols]
+            logger.log(
+                level=log_level,
+                msg=f"{page_name} : Column(s) [{', '.join(not_empty_cols_names)}] is/are not empty on the row {row}.\n"
+                + f"Here is the content : {contents}.\n"
+                + "The excel may have a mistake.",
+                extra=FullnessExcelCell(
+                    page_name=page_name,
+                    header_names=not_empty_cols,
+                    row=row,
+                    actuals=contents,
+                ),
+            )
+
+        return not_empty_cols
+
+    def check_fullness_row(
+        self,
+        page_name: str,
+        row: int,
+        header_name_cols: List[Tuple[str, int]],
+        log_level: str = WARNING,
+    ) -> bool:
+        """
+        Returns:
+            bool: True if an error has been detected
+        """
+
+        empty_cols = [
+            header_name
+            for header_name, col in header_name_cols
+            if self.get_text_cell(row=row, col=col) is None
+        ]
+
+        if empty_cols:
+            logger.log(
+                level=log_level,
+                msg=f"{page_name} : Column(s) [{', '.join(empty_cols)}] is/are empty on the row {row}.\n"
+                + f"The excel may have a mistake.",
+                extra=EmptynessExcelCell(
+                    page_name=page_name, header_names=empty_cols, row=row
+                ),
+            )
+        return empty_cols
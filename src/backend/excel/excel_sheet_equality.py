@@ -1,14 +1,21 @@
+import hashlib
+import weakref
 from copy import copy
+from dataclasses import dataclass
+from functools import lru_cache
 from itertools import product
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
 from xml.etree.ElementTree import fromstring
 
 from openpyxl.cell.rich_text import CellRichText, TextBlock
 from openpyxl.styles import Border
 from openpyxl.styles.borders import Border
+from openpyxl.styles.cell_style import StyleArray
 from openpyxl.styles.colors import Color
 from openpyxl.styles.fills import PatternFill
 from openpyxl.styles.fonts import Font
 from openpyxl.utils import get_column_letter
+from openpyxl.workbook.workbook import Workbook
 
 from backend.excel.cell import Cell
 from backend.excel.excel_sheet import ExcelSheet
@@ -82,6 +89,19 @@ def get_theme_colors(wb):
     return colors
 
 
+# resolved once per workbook, freed with it
+_THEME_COLORS_CACHE: "weakref.WeakKeyDictionary[Workbook, Optional[List[str]]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_theme_colors_cached(wb) -> Optional[List[str]]:
+    if wb not in _THEME_COLORS_CACHE:
+        _THEME_COLORS_CACHE[wb] = get_theme_colors(wb)
+    return _THEME_COLORS_CACHE[wb]
+
+
+@lru_cache(maxsize=None)
 def apply_tint(rgb, tint):
     # rgb: 'RRGGBB'
     r = int(rgb[0:2], 16)
@@ -110,7 +130,7 @@ def normalize_color_visual(color, wb):
 
     # Theme → resolve
     if color.theme is not None:
-        theme_colors = get_theme_colors(wb)
+        theme_colors = get_theme_colors_cached(wb)
         if not theme_colors:
             return None
 
@@ -288,6 +308,161 @@ def is_empty(
     return True
 
 
+# ------------------- Fingerprint -------------------
+
+
+class _StyleKeys:
+    """
+    Normalized keys of the styles, as strict as the 'equals_*' functions.
+    The cells share the styles of the workbook by id : each one is normalized once.
+    """
+
+    def __init__(self, wb: Workbook):
+        self.wb = wb
+        # (kind, style ids) -> key
+        self._memo: Dict[Tuple[str, Hashable], Any] = {}
+
+    def _memoized(self, kind: str, style_id: Hashable, build: Callable[[], Any]) -> Any:
+        key = self._memo.get((kind, style_id))
+        if key is None:
+            key = build()
+            self._memo[(kind, style_id)] = key
+        return key
+
+    def color(self, color: Optional[Color]) -> Any:
+        return normalize_color_visual(color, self.wb)
+
+    def side(self, s) -> Any:
+        if s is None:
+            return None
+        return (s.style, self.color(s.color))
+
+    def font(self, f1: Optional[Font]) -> Any:
+        if f1 is None:
+            return None
+        return (
+            f1.name,
+            f1.sz,
+            f1.b,
+            f1.i,
+            f1.u,
+            f1.strike,
+            self.color(f1.color),
+            f1.vertAlign,
+            f1.scheme,
+        )
+
+    def font_id(self, font_id: int) -> Any:
+        return self._memoized(
+            "font", font_id, lambda: self.font(self.wb._fonts[font_id])
+        )
+
+    def fill_id(self, fill_id: int) -> Any:
+        def build():
+            f1 = self.wb._fills[fill_id]
+            return (repr(f1.fgColor), repr(f1.bgColor))
+
+        return self._memoized("fill", fill_id, build)
+
+    def border_id(self, border_id: int) -> Any:
+        def build():
+            b = self.wb._borders[border_id]
+            return (
+                b.outline,
+                b.diagonalUp,
+                b.diagonalDown,
+                repr(b.start),
+                repr(b.end),
+                *(
+                    self.side(side)
+                    for side in (
+                        b.left,
+                        b.right,
+                        b.top,
+                        b.bottom,
+                        b.diagonal,
+                        b.vertical,
+                        b.horizontal,
+                    )
+                ),
+            )
+
+        return self._memoized("border", border_id, build)
+
+    def value(self, value: Any) -> Any:
+        if isinstance(value, CellRichText):
+            return tuple(
+                (run.text, self.font(run.font)) if isinstance(run, TextBlock) else run
+                for run in value
+            )
+        return value
+
+    def style(self, text: Optional[str], style: StyleArray) -> str:
+        """Digest of the styles compared for a cell : short to hash in the rows"""
+
+        font_id = style.fontId if text else None
+        fill_id = style.fillId if text else None
+        return self._memoized(
+            "style",
+            (font_id, fill_id, style.borderId),
+            lambda: hashlib.sha256(
+                repr(
+                    (
+                        None if font_id is None else self.font_id(font_id),
+                        None if fill_id is None else self.fill_id(fill_id),
+                        self.border_id(style.borderId),
+                    )
+                ).encode()
+            ).hexdigest(),
+        )
+
+    def cell(self, raw_value: Any, style: StyleArray) -> Any:
+        """Key of an openpyxl cell, from its raw value and its style ids"""
+
+        value = ExcelSheet.none_transformation(raw_value)
+        text = ExcelSheet._text(raw_value)
+        return (text, type(value).__name__, self.value(value), self.style(text, style))
+
+
+@dataclass
+class SheetFingerprint:
+    """Hash of each row (values and normalized styles) and of the whole sheet"""
+
+    rows: List[str]
+    digest: str
+
+
+def sheet_fingerprint(es: ExcelSheet, max_row: int, max_col: int) -> SheetFingerprint:
+    """
+    Only the stored cells are walked : a stored cell with the key of a missing one
+    (no value, default border) is skipped, as the missing cells are.
+    """
+
+    keys = _StyleKeys(es.wb)
+    key_missing = keys.cell(None, StyleArray())
+
+    cells_per_row: Dict[int, List[Tuple[int, Any]]] = {}
+    for (row, col), c in es.ws._cells.items():
+        if row > max_row or col > max_col:
+            continue
+
+        key = keys.cell(c.value, c._style)
+        if key != key_missing:
+            cells_per_row.setdefault(row, []).append((col, key))
+
+    hash_empty_row = hashlib.sha256(repr([]).encode()).hexdigest()
+    rows = [hash_empty_row] * max_row
+    for row, cells in cells_per_row.items():
+        rows[row - 1] = hashlib.sha256(repr(sorted(cells)).encode()).hexdigest()
+
+    return SheetFingerprint(
+        rows=rows, digest=hashlib.sha256("".join(rows).encode()).hexdigest()
+    )
+
+
+# ------------------- Sheet equality -------------------
+
+
 def excelsheet_equals(es1: ExcelSheet, es2: ExcelSheet) -> bool:
 
     min_dim_row = min(es1.get_row_dimension(), es2.get_row_dimension())
@@ -300,17 +475,27 @@ def excelsheet_equals(es1: ExcelSheet, es2: ExcelSheet) -> bool:
         )
         return False
 
-    # check cells equality
-    for row, col in product(range(1, min_dim_row + 1), range(1, min_dim_col + 1)):
+    # check cells equality : only the rows with different fingerprints are compared cell by cell
+    fp1 = sheet_fingerprint(es1, max_row=min_dim_row, max_col=min_dim_col)
+    fp2 = sheet_fingerprint(es2, max_row=min_dim_row, max_col=min_dim_col)
 
-        c1 = es1.get_cell(row, col)
-        c2 = es2.get_cell(row, col)
+    if fp1.digest != fp2.digest:
+        rows_to_check = [
+            row
+            for row, (h1, h2) in enumerate(zip(fp1.rows, fp2.rows), start=1)
+            if h1 != h2
+        ]
 
-        if not equals_cell(c1, c2, es1.wb):
-            logger.info(
-                f"Excel equality : Sheets {f(name1=es1.name, name2=es2.name)} : cells not equal {f(row=row, col=col)}"
-            )
-            return False
+        for row, col in product(rows_to_check, range(1, min_dim_col + 1)):
+
+            c1 = es1.get_cell(row, col)
+            c2 = es2.get_cell(row, col)
+
+            if not equals_cell(c1, c2, es1.wb):
+                logger.info(
+                    f"Excel equality : Sheets {f(name1=es1.name, name2=es2.name)} : cells not equal {f(row=row, col=col)}"
+                )
+                return False
 
     # check emptyness
     return (
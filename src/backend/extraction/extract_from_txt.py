@@ -7,12 +7,14 @@ from backend.info_struct import InfoExtractionDatas, InfoValues
 from backend.llm.llm_base import LlmBase
 from logger import logger
 from logs_label import ExtensionFileNotSupported, FileDataError, PathNotExisting
+from progress import LAZY_PROGRESS, TYPE_PROGRESS_CALLBACK
 
 
 def extract_from_txt(
     llm: LlmBase,
     path_txt: Path,
     info_to_extract: InfoExtractionDatas,
+    on_progress: TYPE_PROGRESS_CALLBACK = LAZY_PROGRESS,
 ) -> InfoValues:
 
     # checks
@@ -38,7 +40,7 @@ def extract_from_txt(
 
     # extract
     info_values = extract_info_from_natural_language(
-        llm=llm, info_to_extract=info_to_extract, text=text
+        llm=llm, info_to_extract=info_to_extract, text=text, on_progress=on_progress
     )
 
     return info_values
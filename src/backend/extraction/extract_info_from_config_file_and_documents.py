@@ -2,9 +2,14 @@ import os
 from pathlib import Path
 from typing import Dict, Optional
 
-from backend.config_file.config_file import fill_config_file, read_config_file
+from backend.config_file.config_file import (
+    fill_config_file,
+    load_config_file,
+    read_config_file,
+)
 from backend.extraction.extract_from_txt import extract_from_txt
 from backend.extraction.extract_info_from_pdf import extract_info_from_pdf
+from backend.extraction.manifest import ExtractionManifest, hash_file
 from backend.info_struct import InfoExtractionDatas, InfoValues
 from backend.llm.claude_client import ClaudeClient
 from backend.llm.llm_test import LlmTest
@@ -16,6 +21,8 @@ from logs_label import (
     ExtractionNotFoundInfo,
     PathNotExisting,
 )
+from progress import LAZY_PROGRESS, TYPE_PROGRESS_CALLBACK, Progress
+from timing import timer
 from vars import TEST_WITHOUT_INTERNET
 
 # ------------------- Public method -------------------
@@ -25,7 +32,17 @@ def extract_infos_from_config_file_and_files_tree(
     path_config_file: Path,
     path_folder_sources: Path,
     path_folder_output: Optional[Path] = None,
+    incremental: bool = True,
+    on_progress: TYPE_PROGRESS_CALLBACK = LAZY_PROGRESS,
 ) -> Path:
+    """
+    Args:
+        incremental (bool): only extract the infos whose source or definition changed
+        since the previous run, the others are taken from the manifest saved next to
+        the filled config file.
+        on_progress (TYPE_PROGRESS_CALLBACK): called when a source starts (with the
+        sources done) and with the pages OCR'd and the llm calls of the source.
+    """
 
     if not path_config_file.exists():
         raise PathNotExisting(path=path_config_file)
@@ -41,7 +58,10 @@ def extract_infos_from_config_file_and_files_tree(
 
     # read config file
     logger.info("Reading config file...")
-    sources, extraction_datas = read_config_file(path_config_file, path_folder_sources)
+    texts = load_config_file(path_config_file)
+    sources, extraction_datas = read_config_file(
+        path_config_file, path_folder_sources, texts=texts
+    )
 
     # extract info with llm
     logger.info("Extracting infos...")
@@ -51,50 +71,85 @@ def extract_infos_from_config_file_and_files_tree(
         + f"{sum(e.count_extract_data() for e in extraction_datas.values())} information must be extracted.",
     )
 
+    if path_folder_output is None:
+        path_folder_output = path_folder_sources
+
+    info_path_file = path_folder_output / f"{path_config_file.stem}_rempli.xlsx"
+
+    # what has already been extracted by the previous runs
+    manifest = (
+        ExtractionManifest.load(info_path_file.with_suffix(".manifest.json"))
+        if incremental
+        else None
+    )
+
     all_infos_found: InfoValues = InfoValues(independant_infos={}, list_infos={})
     llm = LlmTest() if TEST_WITHOUT_INTERNET else ClaudeClient()
 
-    for source_name, infos in extraction_datas.items():
+    for nb_sources_done, (source_name, infos) in enumerate(extraction_datas.items()):
+        on_progress(
+            Progress(
+                "source", nb_sources_done, len(extraction_datas), detail=source_name
+            )
+        )
 
         path = (path_folder_sources / sources[source_name]).resolve()
 
-        # pdf
-        if path.suffix == ".pdf":
-            new_infos_found = extract_info_from_pdf(
-                llm,
-                path_pdf=path,
-                info_to_extract=infos,
-            )
-        elif path.suffix == ".txt":
-            new_infos_found = extract_from_txt(
-                llm=llm, path_txt=path, info_to_extract=infos
-            )
-        else:
-            logger.error(
-                f"Not support extension '{path.suffix}' of file : {path}",
-                extra=ExtensionFileNotSupported(),
-            )
-            continue
+        # only the new or changed infos are extracted
+        source_hash = hash_file(path) if manifest is not None else None
+        if source_hash is not None:
+            infos, infos_known = manifest.split(source_name, source_hash, infos)
+            all_infos_found.update(infos_known)
+
+            if infos.count_extract_data() == 0:
+                continue
+
+        with timer.span("source", source=source_name):
+            # pdf
+            if path.suffix == ".pdf":
+                new_infos_found = extract_info_from_pdf(
+                    llm,
+                    path_pdf=path,
+                    info_to_extract=infos,
+                    on_progress=on_progress,
+                )
+            elif path.suffix == ".txt":
+                new_infos_found = extract_from_txt(
+                    llm=llm,
+                    path_txt=path,
+                    info_to_extract=infos,
+                    on_progress=on_progress,
+                )
+            else:
+                logger.error(
+                    f"Not support extension '{path.suffix}' of file : {path}",
+                    extra=ExtensionFileNotSupported(),
+                )
+                continue
 
         # checks and filter
         new_infos_filtered = _check_and_filter_result_extraction(
             info_to_extract=infos, info_values=new_infos_found
         )
 
+        if source_hash is not None:
+            manifest.store(source_name, source_hash, infos, new_infos_filtered)
+
         # save new infos by merging
         all_infos_found.update(new_infos_filtered)
 
+    on_progress(Progress("source", len(extraction_datas), len(extraction_datas)))
+
     logger.info(
         f"{all_infos_found.count_values()} information have been extracted with success."
     )
 
-    # copy and fill config file
-    if path_folder_output is None:
-        path_folder_output = path_folder_sources
+    if manifest is not None:
+        manifest.save()
 
-    info_path_file = path_folder_output / f"{path_config_file.stem}_rempli.xlsx"
+    # copy and fill config file
     fill_config_file(
-        path_config_file, infos=all_infos_found, path_output=info_path_file
+        path_config_file, infos=all_infos_found, path_output=info_path_file, texts=texts
     )
 
     return info_path_file
@@ -111,7 +166,8 @@ def _check_and_filter_result_extraction(
     names_all_extracted = info_values.get_names(keep_none_values=True)
 
     # - found wrong names and filter
-    wrong_names = [name for name in names_all_extracted if name not in names_to_extract]
+    set_to_extract = set(names_to_extract)
+    wrong_names = [name for name in names_all_extracted if name not in set_to_extract]
     if wrong_names:
         logger.warning(
             f"{wrong_names} were extracted but were not asked.",
@@ -120,8 +176,9 @@ def _check_and_filter_result_extraction(
         info_values.filter_names(names_to_remove=wrong_names)
 
     # - those not in the extraction result at all
+    set_all_extracted = set(names_all_extracted)
     missing_names = [
-        name for name in names_to_extract if name not in names_all_extracted
+        name for name in names_to_extract if name not in set_all_extracted
     ]
     if missing_names:
         logger.warning(
@@ -13,6 +13,8 @@ from backend.info_struct.info_values import InfoValues
 from backend.llm.llm_base import LlmBase
 from logger import logger
 from logs_label import LlmFailedAnswer
+from progress import LAZY_PROGRESS, TYPE_PROGRESS_CALLBACK, Progress
+from timing import timer
 
 # ------------------- Constants -------------------
 
@@ -27,7 +29,12 @@ def extract_info_from_natural_language(
     llm: LlmBase,
     info_to_extract: InfoExtractionDatas,
     text: str,
+    on_progress: TYPE_PROGRESS_CALLBACK = LAZY_PROGRESS,
 ) -> InfoValues:
+    """
+    Args:
+        on_progress (TYPE_PROGRESS_CALLBACK): called after each llm call
+    """
 
     if text == "":
         logger.info("Text empty : no extraction")
@@ -38,6 +45,13 @@ def extract_info_from_natural_language(
     # - build prompt
     prompt_short_list_info = build_prompt_short_and_list_infos(info_to_extract)
 
+    # one call for the short and list infos, one per exact info
+    nb_calls = int(prompt_short_list_info is not None) + sum(
+        info.extract_exactly_info for info in info_to_extract.independant_infos
+    )
+    nb_calls_done = 0
+    on_progress(Progress("llm call", nb_calls_done, nb_calls))
+
     # - call llm if needed
     extracted_json_short_list = (
         _call_llm(
@@ -46,10 +60,13 @@ def extract_info_from_natural_language(
         if prompt_short_list_info
         else {}
     )
+    if prompt_short_list_info:
+        nb_calls_done += 1
+        on_progress(Progress("llm call", nb_calls_done, nb_calls))
     if extracted_json_short_list is not None:
         # postprocess
         info_values = postprocess_llm_answer_short_list_info(extracted_json_short_list)
-        logger.info(info_values)
+        logger.debug(info_values)
     else:
         logger.error(
             "Failed to extract short and list info.",
@@ -71,6 +88,8 @@ def extract_info_from_natural_language(
         extracted_json_exact = _call_llm(
             llm=llm, prompt_system=prompt_system, text_where_to_extract=text
         )
+        nb_calls_done += 1
+        on_progress(Progress("llm call", nb_calls_done, nb_calls))
         if not extracted_json_exact:
             logger.error(
                 f"Failed to extract exact info '{info.name}'",
@@ -78,7 +97,7 @@ def extract_info_from_natural_language(
             )
             continue
 
-        logger.info(f"Exact info extracted json : {extracted_json_exact}")
+        logger.debug("Exact info extracted json : %s", extracted_json_exact)
 
         # - convert answer
         exact_info_text = from_response_llm_exact_info_extract_exact_text(
@@ -101,13 +120,13 @@ def extract_info_from_natural_language(
 
 def _response_to_json(text_response: str) -> Optional[dict]:
 
-    logger.info(f"text_response : {text_response}")
+    logger.debug("text_response : %s", text_response)
     res = re.search(pattern="```json(.*)```", string=text_response, flags=re.DOTALL)
     if not res:
         res = re.search(pattern="({.*})```", string=text_response, flags=re.DOTALL)
 
     extracted_str = res.group(1)
-    logger.info(f"extracted_str : {extracted_str}")
+    logger.debug("extracted_str : %s", extracted_str)
 
     # convert to json, raises JSONDecodeError
     try:
@@ -127,12 +146,13 @@ def _call_llm(
 
     messages = llm.build_messages(msg=text_where_to_extract)
 
-    text_response = llm.create_message(
-        system=prompt_system,
-        messages=messages,
-        max_tokens=MAX_TOKENS,
-        temperature=TEMPERATURE,
-        top_p=TOP_P,
-    )
+    with timer.span("llm call", llm=type(llm).__name__):
+        text_response = llm.create_message(
+            system=prompt_system,
+            messages=messages,
+            max_tokens=MAX_TOKENS,
+            temperature=TEMPERATURE,
+            top_p=TOP_P,
+        )
 
     return _response_to_json(text_response)
@@ -11,6 +11,7 @@ from backend.llm.llm_base import LlmBase
 from backend.read_pdf.read_pdf import is_scanned, read_all_pdf
 from logger import logger
 from logs_label import ExtensionFileNotSupported, FileDataError, PathNotExisting
+from progress import LAZY_PROGRESS, TYPE_PROGRESS_CALLBACK
 from vars import DEFAULT_LOGGER, PATH_ROOT, PATH_TEST_DOCS
 
 # ------------------- Public Method -------------------
@@ -20,13 +21,14 @@ def extract_info_from_pdf(
     llm: LlmBase,
     path_pdf: Path,
     info_to_extract: InfoExtractionDatas,
+    on_progress: TYPE_PROGRESS_CALLBACK = LAZY_PROGRESS,
 ) -> InfoValues:
 
     if path_pdf.suffix != ".pdf":
         raise ExtensionFileNotSupported(path=path_pdf)
 
     # get pages
-    pages = _get_pdf_pages(path_pdf)
+    pages = _get_pdf_pages(path_pdf, on_progress)
 
     if pages is None:
         return InfoValues.empty()
@@ -36,6 +38,7 @@ def extract_info_from_pdf(
         llm=llm,
         info_to_extract=info_to_extract,
         text="\n\n".join(pages[:]),
+        on_progress=on_progress,
     )
 
     # return
@@ -45,7 +48,9 @@ def extract_info_from_pdf(
 # ------------------- Private Method -------------------
 
 
-def _get_pdf_pages(pdf_path: Path) -> Optional[List[str]]:
+def _get_pdf_pages(
+    pdf_path: Path, on_progress: TYPE_PROGRESS_CALLBACK = LAZY_PROGRESS
+) -> Optional[List[str]]:
 
     rel_path_from_root = os.path.relpath(path=pdf_path.resolve(), start=PATH_ROOT)
 
@@ -61,7 +66,7 @@ def _get_pdf_pages(pdf_path: Path) -> Optional[List[str]]:
     if not pages:
         # read pdf
         try:
-            pages = read_all_pdf(pdf_path)
+            pages = read_all_pdf(pdf_path, on_progress=on_progress)
         except FileDataError:
             logger.error(
                 f"pdf data error, relative path from root : {rel_path_from_root}",
@@ -6,6 +6,7 @@ from backend.info_struct import InfoExtractionDatas, InfoValues
 from backend.info_struct.extraction_data import ExtractionData
 from logger import logger
 from logs_label import LlmWrongFormat
+from timing import timer
 
 # ------------------------- Helper -------------------------
 
@@ -54,6 +55,7 @@ def _build_prompt_one_list_info(
     return f'"{first_name}" : [{sub_dict_str}, ...]'
 
 
+@timer.timed("prompt build")
 def build_prompt_short_and_list_infos(infos: InfoExtractionDatas) -> Optional[str]:
 
     # short (not exact) and independant info
@@ -76,7 +78,7 @@ def build_prompt_short_and_list_infos(infos: InfoExtractionDatas) -> Optional[st
 
     # add the json wrapper
     prompt_infos = _wrapped_prompt_with_json_header(combined_infos)
-    logger.info(prompt_infos)
+    logger.debug(prompt_infos)
 
     # add the instructions
     return SHORT_LIST_INFO_INSTRUCTIONS.format(prompt_infos=prompt_infos)
@@ -86,6 +88,7 @@ def _convert_str_to_optional_str(s: str) -> Optional[str]:
     return None if s.lower() == "none" else s
 
 
+@timer.timed("postprocess")
 def postprocess_llm_answer_short_list_info(
     extracted_json: Dict[str, Union[str, List[Dict[str, str]]]],
 ) -> InfoValues:
@@ -183,8 +186,8 @@ def postprocess_llm_answer_short_list_info(
         ]
         for first_name, lst in list_infos.items()
     }
-    logger.info(independant_infos)
-    logger.info(list_infos)
+    logger.debug(independant_infos)
+    logger.debug(list_infos)
 
     # 4. Combine independant and list infos
     return InfoValues(independant_infos=independant_infos, list_infos=list_infos)
@@ -206,6 +209,7 @@ EXACT_INFO_INSTRUCTIONS_FORMAT = """
 """
 
 
+@timer.timed("prompt build")
 def build_prompt_exact_infos(ed: ExtractionData) -> str:
 
     description = (
@@ -219,6 +223,7 @@ def build_prompt_exact_infos(ed: ExtractionData) -> str:
     return prompt_system_title + EXACT_INFO_INSTRUCTIONS_FORMAT
 
 
+@timer.timed("postprocess")
 def from_response_llm_exact_info_extract_exact_text(
     text_where_to_search: str,
     extracted_json: Dict[str, str],
@@ -0,0 +1,176 @@
+import hashlib
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from backend.info_struct import ExtractionData, InfoExtractionDatas, InfoValues
+from logger import f, logger
+
+# increased when the prompts or the answers processing change : everything is extracted again
+MANIFEST_VERSION = 1
+
+# ------------------- Structure -------------------
+
+
+@dataclass
+class InfoEntry:
+    # hash of what the prompt is built from
+    fingerprint: str
+    # value of an independant info or elements of a list info
+    result: object
+
+
+@dataclass
+class SourceEntry:
+    hash: str
+    independant_infos: Dict[str, InfoEntry] = field(default_factory=dict)
+    list_infos: Dict[str, InfoEntry] = field(default_factory=dict)
+
+
+@dataclass
+class ExtractionManifest:
+    """
+    What has already been extracted from each source.
+    A (source, info) is extracted again only if the file of the source
+    or the definition of the info changed.
+    """
+
+    path: Path
+    sources: Dict[str, SourceEntry] = field(default_factory=dict)
+
+    @staticmethod
+    def load(path: Path) -> "ExtractionManifest":
+
+        manifest = ExtractionManifest(path=path)
+        if not path.exists():
+            return manifest
+
+        try:
+            with open(path, mode="r") as fp:
+                data = json.load(fp)
+        except (OSError, json.JSONDecodeError):
+            logger.warning(
+                f"Extraction manifest unreadable : everything is extracted. {f(path=path)}"
+            )
+            return manifest
+
+        if data.get("version") != MANIFEST_VERSION:
+            return manifest
+
+        manifest.sources = {
+            source_name: SourceEntry(
+                hash=source["hash"],
+                independant_infos={
+                    name: InfoEntry(**entry)
+                    for name, entry in source["independant_infos"].items()
+                },
+                list_infos={
+                    name: InfoEntry(**entry)
+                    for name, entry in source["list_infos"].items()
+                },
+            )
+            for source_name, source in data["sources"].items()
+        }
+        return manifest
+
+    def save(self) -> None:
+        with open(self.path, mode="w") as fp:
+            json.dump(
+                {
+                    "version": MANIFEST_VERSION,
+                    "sources": {
+                        source_name: asdict(source)
+                        for source_name, source in self.sources.items()
+                    },
+                },
+                fp,
+                ensure_ascii=False,
+                indent=1,
+            )
+
+    # ------------------- Diff -------------------
+
+    def split(
+        self, source_name: str, source_hash: str, infos: InfoExtractionDatas
+    ) -> Tuple[InfoExtractionDatas, InfoValues]:
+        """
+        Returns:
+            Tuple[InfoExtractionDatas, InfoValues]: the infos to extract
+            and the values already extracted of the others
+        """
+
+        source = self.sources.get(source_name)
+        if source is None or source.hash != source_hash:
+            source = SourceEntry(hash=source_hash)
+
+        to_extract = InfoExtractionDatas(independant_infos=[], list_infos={})
+        values = InfoValues.empty()
+
+        for ed in infos.independant_infos:
+            entry = source.independant_infos.get(ed.name)
+            if entry is not None and entry.fingerprint == fingerprint_infos([ed]):
+                values.independant_infos[ed.name] = entry.result
+            else:
+                to_extract.independant_infos.append(ed)
+
+        for first_name, eds in infos.list_infos.items():
+            entry = source.list_infos.get(first_name)
+            if entry is not None and entry.fingerprint == fingerprint_infos(eds):
+                values.list_infos[first_name] = entry.result
+            else:
+                to_extract.list_infos[first_name] = eds
+
+        logger.info(
+            f"Extraction manifest : {len(values.get_names(keep_none_values=True))} information reused, "
+            + f"{to_extract.count_extract_data()} to extract. {f(source=source_name)}"
+        )
+
+        return to_extract, values
+
+    def store(
+        self,
+        source_name: str,
+        source_hash: str,
+        infos: InfoExtractionDatas,
+        values: InfoValues,
+    ) -> None:
+        """Store the values extracted, those missing from the answer are not stored"""
+
+        source = self.sources.get(source_name)
+        if source is None or source.hash != source_hash:
+            source = SourceEntry(hash=source_hash)
+            self.sources[source_name] = source
+
+        for ed in infos.independant_infos:
+            if ed.name in values.independant_infos:
+                source.independant_infos[ed.name] = InfoEntry(
+                    fingerprint=fingerprint_infos([ed]),
+                    result=values.independant_infos[ed.name],
+                )
+
+        for first_name, eds in infos.list_infos.items():
+            if first_name in values.list_infos:
+                source.list_infos[first_name] = InfoEntry(
+                    fingerprint=fingerprint_infos(eds),
+                    result=values.list_infos[first_name],
+                )
+
+
+# ------------------- Fingerprint -------------------
+
+
+def fingerprint_infos(eds: List[ExtractionData]) -> str:
+    """Hash of what the prompt of the infos is built from"""
+
+    return hashlib.sha256(
+        json.dumps(
+            [[ed.name, ed.description, ed.extract_exactly_info] for ed in eds]
+        ).encode()
+    ).hexdigest()
+
+
+def hash_file(path: Path) -> Optional[str]:
+    if not path.exists():
+        return None
+    return hashlib.sha256(path.read_bytes()).hexdigest()
@@ -1,4 +1,4 @@
 """Generation module"""
 
-from backend.generation.fill_template import fill_template
+from backend.generation.fill_template import fill_template, fill_templates_batch
 
@@ -1,4 +1,3 @@
-from copy import deepcopy
 from dataclasses import dataclass
 from pathlib import Path
 from typing import List
@@ -21,7 +20,7 @@ from backend.generation.list.fill_table_list import (
 from backend.generation.replace_text import build_replace_text
 from backend.info_struct import InfoValues
 from backend.my_docx.docx_helper import (
-    duplicate_paragraphs,
+    duplicate_paragraphs_xml,
     extract_text_from_run_xml,
     remove_paragraph,
     replace_text_paragraphs,
@@ -99,25 +98,30 @@ def _fill_table_list(table: DocxTable, infos: InfoValues) -> int:
 
 @dataclass
 class RunWrapper:
-    idx_paragraph: int
+    paragraph: Paragraph
     run: CT_R
 
     def __repr__(self):
-        return f"Run(idx={self.idx_paragraph}, text='{extract_text_from_run_xml(self.run)}')"
+        return f"Run(paragraph='{self.paragraph.text}', text='{extract_text_from_run_xml(self.run)}')"
 
 
 def _fill_list_without_table(doc: Docx, infos: InfoValues) -> int:
 
-    childs: List[CT_R] = [child for p in doc.paragraphs for child in p._p]
-    print(len(childs), [extract_text_from_run_xml(child) for child in childs])
+    paragraphs = doc.paragraphs
+
+    childs: List[CT_R] = [child for p in paragraphs for child in p._p]
+    if logger.is_debug():
+        logger.debug(
+            f"Runs : {len(childs)} {[extract_text_from_run_xml(child) for child in childs]}"
+        )
 
     # find beginning and end
     row_instructions: List[RowInstruction[RunWrapper]] = [
         RowInstruction(
             text=text,
-            tracability=RunWrapper(idx_paragraph=idx_paragraph, run=child),
+            tracability=RunWrapper(paragraph=p, run=child),
         )
-        for idx_paragraph, p in enumerate(doc.paragraphs)
+        for p in paragraphs
         for child in p._p
         if (text := extract_text_from_run_xml(child))
         if is_instruction(text)
@@ -135,31 +139,16 @@ def _fill_list_without_table(doc: Docx, infos: InfoValues) -> int:
             logger.info(f"{instr.first_name} not in infos")
             continue
 
-        logger.debug(f"infos : {list_info}")
+        logger.debug("infos : %s", list_info)
 
-        nb_paragraphs_each_block = instr.end.idx_paragraph - (
-            instr.start.idx_paragraph + 1
+        # duplicate paragraphs (the anchors are elements : nothing to shift)
+        parent = instr.start.paragraph._parent
+        blocks = duplicate_paragraphs_xml(
+            instr.start.paragraph._p, instr.end.paragraph._p, n=len(list_info) - 1
         )
 
-        # duplicate paragraphs
-        nb_paragraphs_added = duplicate_paragraphs(
-            doc,
-            start_idx_paragraph=instr.start.idx_paragraph + 1,
-            end_idx_paragraph=instr.end.idx_paragraph - 1,
-            n=len(list_info) - 1,
-        )
-
-        # update start and end
-        for instr_other in list_instructions:
-            if instr_other.start.idx_paragraph > instr.start.idx_paragraph:
-                instr_other.start.idx_paragraph += nb_paragraphs_added
-
-            if instr_other.end.idx_paragraph > instr.start.idx_paragraph:
-                instr_other.end.idx_paragraph += nb_paragraphs_added
-
         # replace
-
-        for idx, infos_one_element in enumerate(list_info):
+        for infos_one_element, block_one_element in zip(list_info, blocks):
 
             # build infos name
             infos_one_element = {
@@ -169,24 +158,20 @@ def _fill_list_without_table(doc: Docx, infos: InfoValues) -> int:
             }
 
             # replace
-            start_idx = instr.start.idx_paragraph + 1 + nb_paragraphs_each_block * idx
-            end_idx = (
-                instr.start.idx_paragraph + 1 + nb_paragraphs_each_block * (idx + 1)
-            )
             nb_changes += replace_text_paragraphs(
                 doc=doc,
-                paragraphs=doc.paragraphs[start_idx:end_idx],
+                paragraphs=[Paragraph(p, parent) for p in block_one_element],
                 replace_text=build_replace_text(infos_one_element),
             )
 
     # remove instructions
-    paragraphs_to_remove = [
-        doc.paragraphs[idx]
+    paragraphs_to_remove = {
+        anchor.paragraph._p: anchor.paragraph
         for instr in list_instructions
-        for idx in (instr.start.idx_paragraph, instr.end.idx_paragraph)
+        for anchor in (instr.start, instr.end)
         if instr.first_name in infos.list_infos
-    ]
-    for p in paragraphs_to_remove:
+    }
+    for p in paragraphs_to_remove.values():
         remove_paragraph(p)
 
     return nb_changes
@@ -0,0 +1,445 @@
+import hashlib
+import json
+import os
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from docx.oxml.ns import qn
+from docx.oxml.text.paragraph import CT_P
+from docx.parts.hdrftr import FooterPart, HeaderPart
+
+from backend.generation.constants import BORDER_LEFT
+from backend.generation.list.fill_list_helper import (
+    ListInstruction,
+    RowInstruction,
+    build_fullname_info,
+    is_instruction,
+    preprocess_instructions,
+)
+from backend.generation.list.fill_table_list import (
+    is_the_table_a_table_list,
+    replace_table_list,
+)
+from backend.generation.replace_text import build_replace_text
+from backend.info_struct import InfoValues
+from backend.my_docx.docx_helper import (
+    TYPE_RUN_FORMAT_FALLBACK,
+    build_run_format_fallback,
+    duplicate_paragraphs_xml,
+    extract_text_from_run_xml,
+    normalize_runs_xml,
+    replace_text_paragraphs_xml,
+)
+from backend.my_docx.docx_xml_table import DocxXmlTable
+from backend.my_docx.my_docx import Docx
+from logger import f, logger
+from timing import timer
+
+# None : the paragraphs are already normalized (compiled template)
+TYPE_FALLBACK = Optional[Callable[[CT_P], TYPE_RUN_FORMAT_FALLBACK]]
+
+# ------------------- Public Method -------------------
+
+
+def fill_template_docx_xml(
+    template_path: Path, infos: InfoValues, path_output: Path
+) -> int:
+    """
+    Same generation as 'fill_template_docx' but working directly on the xml elements
+    (body, headers and footers) instead of going through the python-docx proxies.
+    """
+
+    doc = Docx(template_path)
+    run_format_fallback = build_run_format_fallback(doc)
+
+    body = doc.element.body
+    paragraphs: List[CT_P] = body.p_lst
+    tables = [DocxXmlTable(tbl, run_format_fallback) for tbl in body.tbl_lst]
+
+    # without table
+
+    # ind
+    logger.debug("Replace independant infos")
+    nb_changes = _replace_text_paragraphs_inds(paragraphs, infos, run_format_fallback)
+    nb_changes += _fill_headers_footers(
+        _iter_headers_footers(doc), infos, run_format_fallback
+    )
+    # list
+    logger.debug("Replace lists infos without tables")
+    nb_changes += _fill_list_without_table(
+        _read_list_instructions(paragraphs), infos, run_format_fallback
+    )
+
+    # table
+    logger.debug("Replace lists infos inside tables")
+    nb_changes += _fill_tables(tables, tables, infos, run_format_fallback)
+
+    doc.save(path_output)
+
+    return nb_changes
+
+
+def fill_template_docx_compiled(
+    template_path: Path, infos: InfoValues, path_output: Path
+) -> int:
+    """
+    Same generation as 'fill_template_docx_xml', the template being compiled once
+    (see 'compile_template_docx') and then reused by every generation.
+    """
+
+    return fill_compiled_template_docx(
+        compile_template_docx(template_path), infos, path_output
+    )
+
+
+# ------------------- Compiled template -------------------
+
+
+@dataclass
+class CompiledTemplateDocx:
+    """
+    Template with its runs already normalized, and where are the things to fill.
+    Paragraphs and tables are given by their index in the body.
+    """
+
+    path_docx: Path
+    placeholder_paragraphs: List[int]
+    # (first name, index start paragraph, index end paragraph)
+    list_instructions: List[Tuple[str, int, int]]
+    placeholder_tables: List[int]
+    table_lists: List[int]
+    # partnames of the headers and footers having placeholders
+    placeholder_parts: List[str]
+
+
+# bumped when the compiled format changes : the older compiled templates are redone
+COMPILED_FORMAT_VERSION = 1
+
+
+def _paths_compiled(template_path: Path) -> Tuple[Path, Path]:
+    digest = hashlib.sha256(template_path.read_bytes()).hexdigest()[:16]
+    stem = f"{template_path.stem}.{digest}.compiled"
+    return (
+        template_path.with_name(f"{stem}.docx"),
+        template_path.with_name(f"{stem}.json"),
+    )
+
+
+def compile_template_docx(template_path: Path) -> CompiledTemplateDocx:
+    """
+    The compiled template is persisted next to the template, keyed by its hash :
+    a modified template is compiled again.
+    """
+
+    path_docx, path_json = _paths_compiled(template_path)
+
+    # already compiled
+    compiled = _load_compiled(path_docx, path_json)
+    if compiled is not None:
+        logger.debug(f"'{template_path}' compiled template loaded.")
+        return compiled
+
+    doc = Docx(template_path)
+    run_format_fallback = build_run_format_fallback(doc)
+
+    body = doc.element.body
+    paragraphs: List[CT_P] = body.p_lst
+    tables = [DocxXmlTable(tbl, run_format_fallback) for tbl in body.tbl_lst]
+    parts = list(_iter_headers_footers(doc))
+
+    # normalize every paragraph once for all
+    for p in [
+        *paragraphs,
+        *(p for table in tables for tc in table.iter_unique_tcs() for p in tc.p_lst),
+        *(p for part in parts for p in part.element.iter(qn("w:p"))),
+    ]:
+        normalize_runs_xml(p, run_format_fallback(p))
+
+    # locate what will be filled
+    idx_paragraphs = {p: idx for idx, p in enumerate(paragraphs)}
+    compiled = CompiledTemplateDocx(
+        path_docx=path_docx,
+        placeholder_paragraphs=[
+            idx for idx, p in enumerate(paragraphs) if BORDER_LEFT in p.text
+        ],
+        list_instructions=[
+            (
+                instr.first_name,
+                idx_paragraphs[instr.start.p],
+                idx_paragraphs[instr.end.p],
+            )
+            for instr in _read_list_instructions(paragraphs)
+        ],
+        placeholder_tables=[
+            idx
+            for idx, table in enumerate(tables)
+            if any(BORDER_LEFT in p.text for p in table.tbl.iter(qn("w:p")))
+        ],
+        table_lists=[
+            idx for idx, table in enumerate(tables) if is_the_table_a_table_list(table)
+        ],
+        placeholder_parts=[
+            str(part.partname)
+            for part in parts
+            if any(BORDER_LEFT in p.text for p in part.element.iter(qn("w:p")))
+        ],
+    )
+
+    # persist : written aside then moved, a concurrent job never reads a partial file
+    # (the json last, it marks the compiled template as ready)
+    path_docx_tmp = _path_tmp(path_docx)
+    doc.save(path_docx_tmp)
+    os.replace(path_docx_tmp, path_docx)
+
+    path_json_tmp = _path_tmp(path_json)
+    with open(path_json_tmp, mode="w") as fp:
+        json.dump(
+            {
+                **asdict(compiled),
+                "path_docx": str(path_docx),
+                "version": COMPILED_FORMAT_VERSION,
+            },
+            fp,
+        )
+    os.replace(path_json_tmp, path_json)
+
+    logger.debug(f"'{template_path}' compiled.")
+    return compiled
+
+
+def _load_compiled(
+    path_docx: Path, path_json: Path
+) -> Optional[CompiledTemplateDocx]:
+    """
+    None when not compiled yet, or not readable : partial (written in place
+    by an older version) or compiled by another version.
+    """
+
+    if not (path_docx.exists() and path_json.exists()):
+        return None
+
+    try:
+        with open(path_json, mode="r") as fp:
+            data = json.load(fp)
+        if data.pop("version", None) != COMPILED_FORMAT_VERSION:
+            raise ValueError("other version")
+        compiled = CompiledTemplateDocx(**data)
+        # json has no tuples
+        compiled.list_instructions = [tuple(i) for i in compiled.list_instructions]
+    except (AttributeError, TypeError, ValueError) as e:
+        logger.info(
+            "Compiled template not reusable, compiled again "
+            + f(path_json=path_json, error=e)
+        )
+        return None
+
+    compiled.path_docx = path_docx
+    return compiled
+
+
+def _path_tmp(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+
+
+def fill_compiled_template_docx(
+    compiled: CompiledTemplateDocx, infos: InfoValues, path_output: Path
+) -> int:
+
+    doc = Docx(compiled.path_docx)
+
+    body = doc.element.body
+    paragraphs: List[CT_P] = body.p_lst
+    tables = [DocxXmlTable(tbl, None) for tbl in body.tbl_lst]
+
+    # without table
+
+    # ind
+    logger.debug("Replace independant infos")
+    nb_changes = _replace_text_paragraphs_inds(
+        [paragraphs[idx] for idx in compiled.placeholder_paragraphs], infos, None
+    )
+    nb_changes += _fill_headers_footers(
+        (
+            part
+            for part in _iter_headers_footers(doc)
+            if str(part.partname) in compiled.placeholder_parts
+        ),
+        infos,
+        None,
+    )
+    # list
+    logger.debug("Replace lists infos without tables")
+    nb_changes += _fill_list_without_table(
+        [
+            ListInstruction(
+                first_name=first_name,
+                start=ParagraphAnchor(p=paragraphs[idx_start]),
+                end=ParagraphAnchor(p=paragraphs[idx_end]),
+            )
+            for first_name, idx_start, idx_end in compiled.list_instructions
+        ],
+        infos,
+        None,
+    )
+
+    # table
+    logger.debug("Replace lists infos inside tables")
+    nb_changes += _fill_tables(
+        [tables[idx] for idx in compiled.placeholder_tables],
+        [tables[idx] for idx in compiled.table_lists],
+        infos,
+        None,
+    )
+
+    with timer.span("save", path=path_output.name):
+        doc.save(path_output)
+
+    return nb_changes
+
+
+# ------------------- Private Method -------------------
+
+
+def _replace_text_paragraphs_inds(
+    paragraphs: List[CT_P], infos: InfoValues, run_format_fallback: TYPE_FALLBACK
+) -> int:
+    return replace_text_paragraphs_xml(
+        paragraphs,
+        replace_text=build_replace_text(infos.independant_infos),
+        run_format_fallback=run_format_fallback,
+    )
+
+
+def _iter_headers_footers(doc: Docx):
+    return (
+        part
+        for part in doc.part.package.iter_parts()
+        if isinstance(part, (HeaderPart, FooterPart))
+    )
+
+
+def _fill_headers_footers(
+    parts, infos: InfoValues, run_format_fallback: TYPE_FALLBACK
+) -> int:
+
+    nb_changes = 0
+    for part in parts:
+        nb_changes += _replace_text_paragraphs_inds(
+            list(part.element.iter(qn("w:p"))), infos, run_format_fallback
+        )
+
+    return nb_changes
+
+
+def _fill_tables(
+    tables_ind: List[DocxXmlTable],
+    tables_list: List[DocxXmlTable],
+    infos: InfoValues,
+    run_format_fallback: TYPE_FALLBACK,
+) -> int:
+
+    nb_changes = 0
+
+    # ind
+    for table in tables_ind:
+        for tc in table.iter_unique_tcs():
+            nb_changes += _replace_text_paragraphs_inds(
+                tc.p_lst, infos, run_format_fallback
+            )
+
+    # list
+    for table in tables_list:
+        nb_changes += _fill_table_list(table, infos)
+
+    return nb_changes
+
+
+def _fill_table_list(table: DocxXmlTable, infos: InfoValues) -> int:
+
+    if not is_the_table_a_table_list(table):
+        return 0
+
+    res = replace_table_list(table, infos)
+
+    table.remove_column(col=1)
+
+    return res.nb_changes
+
+
+@dataclass
+class ParagraphAnchor:
+    p: CT_P
+
+    def __repr__(self):
+        return f"Paragraph(text='{self.p.text}')"
+
+
+def _read_list_instructions(
+    paragraphs: List[CT_P],
+) -> List[ListInstruction[ParagraphAnchor]]:
+
+    # find beginning and end
+    row_instructions: List[RowInstruction[ParagraphAnchor]] = [
+        RowInstruction(text=text, tracability=ParagraphAnchor(p=p))
+        for p in paragraphs
+        for child in p
+        if (text := extract_text_from_run_xml(child))
+        if is_instruction(text)
+    ]
+
+    # preprocess
+    return preprocess_instructions(row_instructions)
+
+
+def _fill_list_without_table(
+    list_instructions: List[ListInstruction[ParagraphAnchor]],
+    infos: InfoValues,
+    run_format_fallback: TYPE_FALLBACK,
+) -> int:
+
+    # fill
+    nb_changes = 0
+    for instr in list_instructions:
+
+        list_info = infos.list_infos.get(instr.first_name)
+        if list_info is None:
+            logger.info(f"{instr.first_name} not in infos")
+            continue
+
+        logger.debug("infos : %s", list_info)
+
+        # duplicate paragraphs (the anchors are elements : nothing to shift)
+        blocks = duplicate_paragraphs_xml(
+            instr.start.p, instr.end.p, n=len(list_info) - 1
+        )
+
+        # replace
+        for infos_one_element, block_one_element in zip(list_info, blocks):
+
+            # build infos name
+            infos_one_element = {
+                build_fullname_info(instr.first_name, sub_name): value
+                for sub_name, value in infos_one_element.items()
+                if value is not None
+            }
+
+            # replace
+            nb_changes += replace_text_paragraphs_xml(
+                paragraphs=block_one_element,
+                replace_text=build_replace_text(infos_one_element),
+                run_format_fallback=run_format_fallback,
+            )
+
+    # remove instructions
+    paragraphs_to_remove = dict.fromkeys(
+        anchor.p
+        for instr in list_instructions
+        for anchor in (instr.start, instr.end)
+        if instr.first_name in infos.list_infos
+    )
+    for p in paragraphs_to_remove:
+        p.getparent().remove(p)
+
+    return nb_changes
@@ -1,9 +1,9 @@
-import itertools
 from pathlib import Path
 from typing import Dict, Tuple
 
 from backend.excel.excel_book import ExcelBook
 from backend.excel.excel_sheet import ExcelSheet
+from backend.generation.constants import BORDER_LEFT
 from backend.generation.list.fill_table_list import (
     is_the_table_a_table_list,
     replace_table_list,
@@ -11,6 +11,7 @@ from backend.generation.list.fill_table_list import (
 from backend.generation.replace_text import replace_text
 from backend.info_struct import InfoValues
 from logger import logger
+from timing import timer
 
 # ------------------- Public Method -------------------
 
@@ -19,7 +20,9 @@ def fill_template_excel(path_excel: Path, infos: InfoValues, path_output: Path)
 
     eb = ExcelBook(path_excel=path_excel)
     nb_changes = _fill_excel(eb, infos)
-    eb.save(path_output)
+
+    with timer.span("save", path=path_output.name):
+        eb.save(path_output)
 
     return nb_changes
 
@@ -90,14 +93,11 @@ def _replace_ind_info(es: ExcelSheet, infos: InfoValues, first_column: int) -> i
     replace_text = _build_replace_text(pair_old_new=pair_old_new)
     # logger.info(pair_old_new)
 
-    # replace
+    # replace, only in the cells having a placeholder
     nb_changes = 0
-    max_row, max_col = es.get_dimensions()
-    for row, col in itertools.product(
-        range(1, max_row + 1), range(first_column, max_col + 1)
-    ):
+    for cell in es.get_cells_containing(BORDER_LEFT, min_col=first_column):
         nb_changes += es.replace_text_in_cell(
-            row=row, col=col, replace_text=replace_text
+            row=cell.row, col=cell.col, replace_text=replace_text
         )
 
     logger.info(f"Excel changes indenpendent : {nb_changes}")
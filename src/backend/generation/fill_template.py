@@ -1,60 +1,307 @@
+import multiprocessing
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
+from typing import List, Optional, Set, Tuple
 
 from backend.config_file.config_file import read_info_values
 from backend.excel.excel_book import ExcelBook
-from backend.generation.fill_docx import fill_template_docx
+from backend.generation.fill_docx_xml import (
+    compile_template_docx,
+    fill_template_docx_compiled,
+)
 from backend.generation.fill_excel import fill_template_excel
+from backend.generation.list.fill_list_helper import build_fullname_info
+from backend.generation.pdf_export import PdfConverterPool
 from backend.info_struct import InfoValues
-from logger import logger
-from logs_label import ExtensionFileNotSupported, PathNotExisting
+from logger import Log, f, logger
+from logs_label import (
+    BatchGenerationWrongInputs,
+    ExtensionFileNotSupported,
+    MergeListNotExisting,
+    PathNotExisting,
+)
+from progress import LAZY_PROGRESS, TYPE_PROGRESS_CALLBACK, Progress
+from timing import Span, timer
 
 # ------------------- Public Method -------------------
 
 
 def fill_template(
-    infos_path_file: Path, template_path: Path, path_folder_output: Path
+    infos_path_file: Path,
+    template_path: Path,
+    path_folder_output: Path,
+    merge_list_name: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    export_pdf: bool = False,
+    on_progress: TYPE_PROGRESS_CALLBACK = LAZY_PROGRESS,
 ) -> Path:
+    """
+    Args:
+        merge_list_name (Optional[str]): mail-merge mode, one document is generated
+        per element of this list info, each one with the sub-values of its element
+        usable as independant infos. The documents are returned in a zip.
+        export_pdf (bool): the generated documents are converted to pdf (needs LibreOffice).
+        on_progress (TYPE_PROGRESS_CALLBACK): called after each document generated
+    """
 
     # error detection
-    if not infos_path_file.exists():
-        raise PathNotExisting(infos_path_file)
-
-    if not template_path.exists():
-        raise PathNotExisting(template_path)
-
-    if template_path.suffix[1:] not in ["xlsx", "docx"]:
-        raise ExtensionFileNotSupported(template_path)
+    _check_inputs([infos_path_file], [template_path])
 
     # extracted infos from filled config file
     infos = read_info_values(infos_path_file)
 
-    logger.info(f"Infos : {infos}")
+    logger.debug("Infos : %s", infos)
+
+    if merge_list_name is not None:
+        return _fill_template_merge(
+            infos,
+            template_path,
+            path_folder_output,
+            merge_list_name,
+            max_workers,
+            export_pdf,
+            on_progress,
+        )
 
     # copy and filled the template
     path_output = path_folder_output / (
         template_path.stem + "_généré" + template_path.suffix
     )
 
-    if template_path.suffix.endswith("xlsx"):
-        logger.info("The template is an excel")
-        nb_changes = fill_template_excel(
-            path_excel=template_path, infos=infos, path_output=path_output
-        )
-    elif template_path.suffix.endswith("docx"):
-        logger.info("The template is a .docx")
-        nb_changes = fill_template_docx(
-            template_path=template_path, infos=infos, path_output=path_output
-        )
-    else:
-        raise ExtensionFileNotSupported(template_path)
+    on_progress(Progress("template fill", 0, 1, detail=template_path.name))
+    nb_changes = _fill_one_template(template_path, infos, path_output)
+    on_progress(Progress("template fill", 1, 1, detail=template_path.name))
 
     logger.info(f"nb_changes : {nb_changes}")
+
+    if export_pdf:
+        with PdfConverterPool(nb_workers=1) as pool:
+            path_output = pool.submit(path_output, path_folder_output).result()
+
     logger.info(f"Le modèle a bien été rempli et sauvegardé à '{path_output}'.")
 
     # return the new file
     return path_output
 
 
+def fill_templates_batch(
+    infos_path_files: List[Path],
+    template_paths: List[Path],
+    path_folder_output: Path,
+    max_workers: Optional[int] = None,
+    export_pdf: bool = False,
+    on_progress: TYPE_PROGRESS_CALLBACK = LAZY_PROGRESS,
+) -> Path:
+    """
+    Generation of one filled config file with many templates,
+    or of many filled config files with one template.
+    Each input is read once, the generations run in a process pool.
+
+    Args:
+        on_progress (TYPE_PROGRESS_CALLBACK): called after each document generated
+
+    Returns:
+        Path: zip holding every generated file
+    """
+
+    # error detection
+    if len(infos_path_files) != 1 and len(template_paths) != 1:
+        raise BatchGenerationWrongInputs(
+            nb_config_files=len(infos_path_files), nb_templates=len(template_paths)
+        )
+
+    _check_inputs(infos_path_files, template_paths)
+
+    # read each input once
+    infos_per_file = {path: read_info_values(path) for path in infos_path_files}
+    for template_path in template_paths:
+        if template_path.suffix.endswith("docx"):
+            compile_template_docx(template_path)
+
+    # one job per output
+    jobs: List[Tuple[Path, InfoValues, Path]] = []
+    names_used: Set[str] = set()
+    for infos_path_file, infos in infos_per_file.items():
+        for template_path in template_paths:
+            name = template_path.stem
+            if len(infos_path_files) > 1:
+                name += f"_{infos_path_file.stem}"
+
+            # same names in different folders must not overwrite each other
+            name = _unique_name(name + "_généré", names_used)
+            path_output = path_folder_output / (name + template_path.suffix)
+            jobs.append((template_path, infos, path_output))
+
+    # fill
+    path_zip = path_folder_output / "générations.zip"
+    _fill_jobs_to_zip(jobs, path_zip, max_workers, export_pdf, on_progress)
+
+    logger.info(f"Les modèles ont bien été remplis et sauvegardés dans '{path_zip}'.")
+
+    return path_zip
+
+
+# ------------------- Private Method -------------------
+
+
+def _check_inputs(infos_path_files: List[Path], template_paths: List[Path]) -> None:
+
+    for path in [*infos_path_files, *template_paths]:
+        if not path.exists():
+            raise PathNotExisting(path)
+
+    for template_path in template_paths:
+        if template_path.suffix[1:] not in ["xlsx", "docx"]:
+            raise ExtensionFileNotSupported(template_path)
+
+
+def _unique_name(name: str, names_used: Set[str]) -> str:
+    """
+    'name', or 'name_2', 'name_3'... when already used. Compared without extension :
+    the pdf exports of two outputs must not collide either.
+    """
+
+    unique_name = name
+    idx = 2
+    while unique_name in names_used:
+        unique_name = f"{name}_{idx}"
+        idx += 1
+
+    names_used.add(unique_name)
+    return unique_name
+
+
+def _fill_one_template(
+    template_path: Path, infos: InfoValues, path_output: Path
+) -> int:
+
+    with timer.span("template fill", template=template_path.name):
+        if template_path.suffix.endswith("xlsx"):
+            logger.info("The template is an excel")
+            return fill_template_excel(
+                path_excel=template_path, infos=infos, path_output=path_output
+            )
+
+        if template_path.suffix.endswith("docx"):
+            logger.info("The template is a .docx")
+            return fill_template_docx_compiled(
+                template_path=template_path, infos=infos, path_output=path_output
+            )
+
+    raise ExtensionFileNotSupported(template_path)
+
+
+def _fill_template_merge(
+    infos: InfoValues,
+    template_path: Path,
+    path_folder_output: Path,
+    merge_list_name: str,
+    max_workers: Optional[int],
+    export_pdf: bool,
+    on_progress: TYPE_PROGRESS_CALLBACK,
+) -> Path:
+
+    list_info = infos.list_infos.get(merge_list_name)
+    if list_info is None:
+        raise MergeListNotExisting(name=merge_list_name)
+
+    # parsed once, reused by every worker
+    if template_path.suffix.endswith("docx"):
+        compile_template_docx(template_path)
+
+    # one job per element : its sub-values become independant infos
+    jobs: List[Tuple[Path, InfoValues, Path]] = []
+    for idx, infos_one_element in enumerate(list_info, start=1):
+        infos_merged = InfoValues(
+            independant_infos={
+                **infos.independant_infos,
+                **{
+                    build_fullname_info(merge_list_name, sub_name): value
+                    for sub_name, value in infos_one_element.items()
+                },
+            },
+            list_infos={
+                name: l for name, l in infos.list_infos.items() if name != merge_list_name
+            },
+        )
+
+        path_output = path_folder_output / (
+            f"{template_path.stem}_généré_{idx}{template_path.suffix}"
+        )
+        jobs.append((template_path, infos_merged, path_output))
+
+    # fill
+    path_zip = path_folder_output / f"{template_path.stem}_généré_{merge_list_name}.zip"
+    _fill_jobs_to_zip(jobs, path_zip, max_workers, export_pdf, on_progress)
+
+    logger.info(f"Le modèle a bien été rempli et sauvegardé dans '{path_zip}'.")
+
+    return path_zip
+
+
+def _fill_jobs_to_zip(
+    jobs: List[Tuple[Path, InfoValues, Path]],
+    path_zip: Path,
+    max_workers: Optional[int],
+    export_pdf: bool,
+    on_progress: TYPE_PROGRESS_CALLBACK = LAZY_PROGRESS,
+) -> None:
+    """
+    Run the jobs (template, infos, output) in a process pool,
+    each output being added to the zip as soon as its job is done
+    (or queued for the pdf export, the pdfs being added once converted).
+    """
+
+    with (
+        # called from threads (jobs, sessions) : no fork
+        ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("forkserver")
+        ) as executor,
+        PdfConverterPool() if export_pdf else nullcontext() as pool,
+        zipfile.ZipFile(path_zip, mode="w", compression=zipfile.ZIP_DEFLATED) as z,
+    ):
+        results = executor.map(_fill_one_template_job, *zip(*jobs))
+
+        futures_pdf = []
+        on_progress(Progress("template fill", 0, len(jobs)))
+        for nb_done, ((_, _, path_output), (nb_changes, logs, spans)) in enumerate(
+            zip(jobs, results), start=1
+        ):
+            logger.add_logs(logs)
+            timer.add_spans(spans)
+            logger.info(f"nb_changes : {nb_changes} {f(path_output=path_output)}")
+            on_progress(
+                Progress("template fill", nb_done, len(jobs), detail=path_output.name)
+            )
+
+            if pool is None:
+                z.write(path_output, arcname=path_output.name)
+            else:
+                futures_pdf.append(pool.submit(path_output, path_output.parent))
+
+        for future in futures_pdf:
+            path_pdf = future.result()
+            z.write(path_pdf, arcname=path_pdf.name)
+
+
+def _fill_one_template_job(
+    template_path: Path, infos: InfoValues, path_output: Path
+) -> Tuple[int, List[Log], List[Span]]:
+    """Run in a worker process : its logs and timings are sent back with the result"""
+
+    logger.reset_logs()
+    timer.reset()
+    nb_changes = _fill_one_template(template_path, infos, path_output)
+
+    return (
+        nb_changes,
+        [log.picklable() for log in logger.get_logs()],
+        timer.root.children,
+    )
+
+
 # ------------------- Main Method -------------------
 
 if __name__ == "__main__":
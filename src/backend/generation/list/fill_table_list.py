@@ -1,4 +1,3 @@
-import itertools
 from dataclasses import dataclass
 from typing import List, Tuple
 
@@ -16,7 +15,7 @@ from backend.generation.list.fill_list_helper import (
 from backend.generation.replace_text import build_replace_text
 from backend.info_struct import InfoValues
 from backend.table.table_base import CELL_TYPE, TableBase
-from logger import f, logger
+from logger import f, lazy, logger
 
 # ------------------- Helper -------------------
 
@@ -29,8 +28,7 @@ def _get_column_instructions(
 
     return [
         RowInstruction(cell.str, tracability=cell)
-        for row in range(1, table.get_row_dimension() + 1)
-        if (cell := table.get_cell(row=row, col=1)) and cell.str
+        for cell in table.iter_cells(max_col=1)
     ]
 
 
@@ -43,7 +41,7 @@ def is_the_table_a_table_list(table: TableBase[CELL_TYPE]) -> bool:
     if max_row < 1 or max_col < 1:
         return False
 
-    text = table.get_cell(row=1, col=1).str
+    text = table.get_text_cell(row=1, col=1)
     if text is None:
         return False
 
@@ -85,12 +83,14 @@ def replace_table_list(
     # get name, start, end (do some checks)
     lists_instructions = preprocess_instructions(column_row_instruction)
     logger.debug(
-        f"lists_rows : {[(lst.start.row, lst.end.row) for lst in lists_instructions]}"
+        "lists_rows : %s",
+        lazy(lambda: [(lst.start.row, lst.end.row) for lst in lists_instructions]),
     )
 
-    # replace
+    # replace, bottom-up : the rows above the list being expanded never move
     nb_changes = 0
-    for instr in lists_instructions:
+    nb_rows_added = {}
+    for instr in reversed(lists_instructions):
 
         list_info = infos.list_infos.get(instr.first_name)
         if list_info is None:
@@ -105,57 +105,52 @@ def replace_table_list(
             )
         )
 
-        logger.debug(f"infos : {list_info}")
-
-        # insert rows
-        nb_rows_list = instr.end.row - instr.start.row + 1
-        nb_to_add = nb_rows_list * (len(list_info) - 1)
-        table.insert_rows(row=instr.end.row + 1, amount=nb_to_add)
-        logger.debug(f"nb_to_add : {nb_to_add}")
-
-        # copy content
-        for idx in range(1, len(list_info)):
-
-            table.copy_rectangle(
-                from_row=instr.start.row,
-                from_col=first_column,
-                to_row=instr.start.row + nb_rows_list * idx,
-                to_col=first_column,
-                nb_row=nb_rows_list,
-            )
-
-        # update other start and end
-        for instr_other in lists_instructions:
-            if instr_other.start.row <= instr.start.row:
-                continue
+        logger.debug("infos : %s", list_info)
 
-            instr_other.start.row += nb_to_add
-            instr_other.end.row += nb_to_add
-
-        # replace text
-        for idx_element, infos_list_one_element in enumerate(list_info):
+        # build one replace function per element
+        func_replace_texts = []
+        for infos_list_one_element in list_info:
 
             infos_list_one_element = {
                 build_fullname_info(instr.first_name, sub_name): value
                 for sub_name, value in infos_list_one_element.items()
                 if value is not None
             }
-            logger.debug(f"infos_list_one_element : {infos_list_one_element}")
+            logger.debug("infos_list_one_element : %s", infos_list_one_element)
 
-            func_replace_text = build_replace_text(pair_old_new=infos_list_one_element)
+            func_replace_texts.append(
+                build_replace_text(pair_old_new=infos_list_one_element)
+            )
 
-            offset = idx_element * nb_rows_list
-            for row, col in itertools.product(
-                range(instr.start.row + offset, instr.end.row + offset + 1),
-                range(first_column, table.get_col_dimension() + 1),
-            ):
-                nb_changes += table.replace_text_in_cell(row, col, func_replace_text)
+        # repeat the rows of the list for each element, already filled
+        nb_changes += table.repeat_block(
+            start_row=instr.start.row,
+            end_row=instr.end.row,
+            replace_texts=func_replace_texts,
+            from_col=first_column,
+        )
+
+        nb_rows_list = instr.end.row - instr.start.row + 1
+        nb_to_add = nb_rows_list * (len(list_info) - 1)
+        nb_rows_added[id(instr)] = nb_to_add
+        logger.debug("nb_to_add : %s", nb_to_add)
 
         logger.debug(
-            f"Table list changes {f(first_name=instr.first_name)} : {nb_changes}"
+            "Table list changes %s : %s", lazy(f, first_name=instr.first_name), nb_changes
         )
 
-    logger.debug(f"Table list changes : {nb_changes}")
+    logger.debug("Table list changes : %s", nb_changes)
+
+    # final rows of the instructions : shifted by the rows added above them
+    offset = 0
+    shifted = set()
+    for instr in lists_instructions:
+        for cell in (instr.start, instr.end):
+            if id(cell) not in shifted:
+                shifted.add(id(cell))
+                cell.row += offset
+
+        offset += nb_rows_added.get(id(instr), 0)
 
     res = ReplaceTableListRes(
         nb_changes=nb_changes,
@@ -0,0 +1,210 @@
+import contextvars
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from logger import f, logger
+from logs_label import LibreOfficeNotFound, PdfExportFailed
+from vars import PATH_TMP
+
+# (documents, output folder, profile folder of the worker)
+TYPE_CONVERTER = Callable[[List[Path], Path, Path], None]
+
+TYPE_JOB = Tuple[Path, Path, Future]
+
+# a hung LibreOffice must not block its worker forever
+TIMEOUT_SECONDS_PER_DOCUMENT = 60
+
+# ------------------- Converter -------------------
+
+
+def convert_with_libreoffice(
+    paths: List[Path], path_folder_output: Path, path_profile: Path
+) -> None:
+    """
+    One headless LibreOffice call for the whole batch.
+    Each worker keeps its own profile : the instances can run in parallel
+    and the profile is only initialized by the first call.
+
+    Raises:
+        LibreOfficeNotFound
+        PdfExportFailed: the conversion timed out
+    """
+
+    soffice = shutil.which("soffice") or shutil.which("libreoffice")
+    if soffice is None:
+        raise LibreOfficeNotFound()
+
+    timeout = TIMEOUT_SECONDS_PER_DOCUMENT * len(paths)
+    try:
+        subprocess.run(
+            [
+                soffice,
+                f"-env:UserInstallation={path_profile.resolve().as_uri()}",
+                "--headless",
+                "--convert-to",
+                "pdf",
+                "--outdir",
+                str(path_folder_output),
+                *[str(path) for path in paths],
+            ],
+            check=True,
+            capture_output=True,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired as e:
+        logger.warning(f"Pdf export : LibreOffice timed out {f(timeout=timeout)}")
+        raise PdfExportFailed(path=paths[0]) from e
+
+
+# ------------------- Pool -------------------
+
+
+class PdfConverterPool:
+    """
+    Workers converting documents to pdf. Each worker takes the documents
+    waiting in the queue by batches, converted with one converter call.
+    """
+
+    def __init__(
+        self,
+        nb_workers: int = 2,
+        batch_size: int = 8,
+        converter: Optional[TYPE_CONVERTER] = None,
+    ):
+        self.batch_size = batch_size
+        self.converter = converter or convert_with_libreoffice
+
+        self._queue: "queue.Queue[Optional[TYPE_JOB]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._nb_converted = 0
+        self._nb_batches = 0
+        self._start = time.perf_counter()
+
+        # LibreOffice refuses two instances on the same profile : one folder per pool
+        self._path_profiles = Path(
+            tempfile.mkdtemp(prefix="libreoffice-", dir=PATH_TMP)
+        )
+
+        self._workers = [
+            # in the context of the caller : same log store and timing span
+            threading.Thread(
+                target=contextvars.copy_context().run,
+                args=(self._work, idx),
+                daemon=True,
+            )
+            for idx in range(nb_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def __enter__(self) -> "PdfConverterPool":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def submit(self, path: Path, path_folder_output: Path) -> "Future[Path]":
+        """
+        Returns:
+            Future[Path]: path of the pdf, once converted
+        """
+
+        future: "Future[Path]" = Future()
+        self._queue.put((path, path_folder_output, future))
+        return future
+
+    def close(self) -> None:
+        """Wait for the queued documents and report the throughput"""
+
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        shutil.rmtree(self._path_profiles, ignore_errors=True)
+
+        elapsed = time.perf_counter() - self._start
+        logger.info(
+            f"Pdf export : {self._nb_converted} documents converted in {elapsed:.2f}s "
+            + f(
+                nb_batches=self._nb_batches,
+                documents_per_second=round(self._nb_converted / elapsed, 2),
+            )
+        )
+
+    def _next_batch(self) -> Tuple[List[TYPE_JOB], bool]:
+        """
+        Returns:
+            Tuple[List[TYPE_JOB], bool]: the batch and whether the worker has to stop
+        """
+
+        job = self._queue.get()
+        if job is None:
+            return [], True
+
+        batch = [job]
+        while len(batch) < self.batch_size:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if job is None:
+                return batch, True
+            batch.append(job)
+
+        return batch, False
+
+    def _work(self, idx_worker: int) -> None:
+
+        stop = False
+        while not stop:
+            batch, stop = self._next_batch()
+
+            # one call per output folder
+            per_folder: Dict[Path, List[TYPE_JOB]] = {}
+            for job in batch:
+                per_folder.setdefault(job[1], []).append(job)
+
+            for path_folder_output, jobs in per_folder.items():
+                self._convert(jobs, path_folder_output, idx_worker)
+
+    def _convert(
+        self, jobs: List[TYPE_JOB], path_folder_output: Path, idx_worker: int
+    ) -> None:
+
+        # a pdf of a previous run must not pass for this one
+        paths_pdf = [path_folder_output / f"{path.stem}.pdf" for path, _, _ in jobs]
+        for path_pdf in paths_pdf:
+            path_pdf.unlink(missing_ok=True)
+
+        try:
+            self.converter(
+                [path for path, _, _ in jobs],
+                path_folder_output,
+                self._path_profiles / f"profile-{idx_worker}",
+            )
+        except PdfExportFailed:
+            for path, _, future in jobs:
+                future.set_exception(PdfExportFailed(path=path))
+            return
+        except Exception as e:
+            for _, _, future in jobs:
+                future.set_exception(e)
+            return
+
+        for (path, _, future), path_pdf in zip(jobs, paths_pdf):
+            if path_pdf.exists():
+                future.set_result(path_pdf)
+            else:
+                future.set_exception(PdfExportFailed(path=path))
+
+        with self._lock:
+            self._nb_converted += len(jobs)
+            self._nb_batches += 1
@@ -1,29 +1,9 @@
 from dataclasses import dataclass
-from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, TypeVar, Union
-
-from backend.config_file.info_page import LIST_SPLITTER
-from utils.stream import Stream
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 TYPE_NAME = Union[str, Tuple[str, str]]
 TYPE_INFO_LIST_VALUES = Dict[str, List[Dict[str, Optional[str]]]]
 
-T = TypeVar("T")
-
-TupleInd = NamedTuple("independant_info", [("name", str), ("value", Optional[str])])
-TupleLst = NamedTuple(
-    "list_info",
-    [("first_name", str), ("idx", int), ("sub_name", str), ("value", Optional[str])],
-)
-TupleAll = NamedTuple("all_info", [("name", str), ("value", Optional[str])])
-
-
-def _predicate_keep_none_value(
-    keep: bool,
-) -> Callable[[Union[TupleInd, TupleLst]], bool]:
-    if keep:
-        return lambda t: True
-    return lambda t: t.value is not None
-
 
 @dataclass
 class InfoValues:
@@ -53,67 +33,30 @@ class InfoValues:
 
     # ------------------- Generic methods -------------------
 
-    def _stream_ind(self) -> Stream[TupleInd]:
-        lst = [
-            TupleInd(name=name, value=value)
-            for name, value in self.independant_infos.items()
-        ]
-        return Stream(lst)
-
-    def _stream_lst(self) -> Stream[TupleLst]:
-        lst = [
-            TupleLst(first_name=first_name, idx=idx, sub_name=sub_name, value=value)
-            for first_name, l in self.list_infos.items()
-            for idx, d in enumerate(l)
-            for sub_name, value in d.items()
-        ]
-        return Stream(lst)
-
-    def _stream_all(self) -> Stream[TupleAll]:
-        l1 = self._stream_ind().map(lambda t: TupleAll(name=t.name, value=t.value)).lst
-        l2 = (
-            self._stream_lst()
-            .map(
-                lambda t: TupleAll(
-                    name=f"{t.first_name}{LIST_SPLITTER}{t.sub_name}", value=t.value
-                )
-            )
-            .lst
-        )
-        return Stream(l1 + l2)
-
-    def _store_ind(self, s: Stream[TupleInd]) -> None:
-        self.independant_infos = {t.name: t.value for t in s.lst}
-
-    def _store_lst(self, s: Stream[TupleLst]) -> None:
-        l1 = s.groupby(key=lambda t: t.first_name).lst
-
-        d = {}
-        for first_name, l2 in l1:
-            s2 = Stream(l2).groupby(key=lambda t: t.idx)
-            l3 = Stream.to_list(s2)
-            l4 = [{t.sub_name: t.value for t in lst} for lst in l3]
-            d[first_name] = l4
+    def _iter_lst(self) -> Iterator[Tuple[str, str, Optional[str]]]:
+        """(first_name, sub_name, value) of every element of every list"""
 
-        self.list_infos = d
+        for first_name, l in self.list_infos.items():
+            for d in l:
+                for sub_name, value in d.items():
+                    yield first_name, sub_name, value
 
     # ------------------- Getter -------------------
 
     def get_names_independant_info(self, keep_none_values: bool) -> List[str]:
-        return (
-            self._stream_ind()
-            .filter(_predicate_keep_none_value(keep_none_values))
-            .map(mapper=lambda t: t.name)
-            .lst
-        )
+        return [
+            name
+            for name, value in self.independant_infos.items()
+            if keep_none_values or value is not None
+        ]
 
     def get_names_list_info(self, keep_none_values: bool) -> List[Tuple[str, str]]:
-        return (
-            self._stream_lst()
-            .filter(_predicate_keep_none_value(keep_none_values))
-            .map(mapper=lambda t: (t.first_name, t.sub_name))
-            .unique()
-            .lst
+        return list(
+            dict.fromkeys(
+                (first_name, sub_name)
+                for first_name, sub_name, value in self._iter_lst()
+                if keep_none_values or value is not None
+            )
         )
 
     def get_names(self, keep_none_values: bool) -> List[TYPE_NAME]:
@@ -122,30 +65,38 @@ class InfoValues:
         ) + self.get_names_list_info(keep_none_values)
 
     def get_name_nones(self) -> List[TYPE_NAME]:
-        return (
-            (
-                self._stream_ind()
-                .filter(lambda t: t.value is None)
-                .map(lambda t: t.name)
-                + self._stream_lst()
-                .filter(lambda t: t.value is None)
-                .map(lambda t: (t.first_name, t.sub_name))
+        return list(
+            dict.fromkeys(
+                [
+                    *(
+                        name
+                        for name, value in self.independant_infos.items()
+                        if value is None
+                    ),
+                    *(
+                        (first_name, sub_name)
+                        for first_name, sub_name, value in self._iter_lst()
+                        if value is None
+                    ),
+                ]
             )
-            .unique()
-            .lst
         )
 
     def count_values(self) -> int:
-        return self._stream_all().filter(_predicate_keep_none_value(False)).count()
+        return sum(
+            value is not None for value in self.independant_infos.values()
+        ) + sum(value is not None for _, _, value in self._iter_lst())
 
     # ------------------- Modifier -------------------
 
-    def filter_names(self, names_to_remove: TYPE_NAME) -> None:
-        s = self._stream_ind().filter(lambda t: t.name not in names_to_remove)
-        self._store_ind(s)
+    def filter_names(self, names_to_remove: List[TYPE_NAME]) -> None:
+        """Removes the independant infos and the whole lists having one of the names"""
 
-        s = self._stream_lst().filter(lambda t: t.first_name not in names_to_remove)
-        self._store_lst(s)
+        for name in names_to_remove:
+            if not isinstance(name, str):
+                continue
+            self.independant_infos.pop(name, None)
+            self.list_infos.pop(name, None)
 
     def update(self, other: "InfoValues") -> None:
         self.independant_infos.update(other.independant_infos)
@@ -4,6 +4,7 @@ from typing import Any, Dict, Optional
 import requests
 
 from backend.llm.llm_base import TYPE_MESSAGES, LlmBase
+from timing import timer
 
 
 class ClaudeClient(LlmBase):
@@ -75,7 +76,16 @@ class ClaudeClient(LlmBase):
                 f"API request failed with status {response.status_code}: {response.text}"
             )
 
-        return response.json()["content"][0]["text"]
+        content = response.json()
+
+        # token counts of the call, on the current span
+        usage = content.get("usage", {})
+        timer.annotate(
+            input_tokens=usage.get("input_tokens"),
+            output_tokens=usage.get("output_tokens"),
+        )
+
+        return content["content"][0]["text"]
 
 
 if __name__ == "__main__":
@@ -9,7 +9,7 @@ from logger import logger
 def _extract_json(s: str) -> dict:
     res = re.search(pattern="```json(.*)```", string=s, flags=re.DOTALL)
     extracted_str = res.group(1)
-    logger.info(extracted_str)
+    logger.debug(extracted_str)
     return json.loads(extracted_str)
 
 
@@ -1,22 +1,26 @@
-import zipfile
+import hashlib
+import weakref
 from copy import deepcopy
-from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from deepdiff import DeepDiff
 from docx import Document as OpenDocument
 from docx.enum.style import WD_STYLE_TYPE
 from docx.oxml.ns import qn
+from docx.oxml.table import CT_Row, CT_Tc
+from docx.oxml.text.paragraph import CT_P
 from docx.oxml.text.run import CT_R
+from docx.opc.part import Part
 from docx.oxml.xmlchemy import BaseOxmlElement
+from docx.table import Table
 from docx.text.paragraph import Paragraph
 from docx.text.run import Run
+from lxml import etree
 from lxml.etree import QName
 
 from backend.my_docx.my_docx import Docx
 from logger import f, logger
-from utils.image import images_equal
-from vars import PATH_TMP
+from utils.image import image_digest, images_equal
 
 # ------------------- Getter -------------------
 
@@ -210,36 +214,26 @@ def _localname(el: BaseOxmlElement) -> str:
 # ------------------- Image -------------------
 
 
-def _extract_image(path_docx: Path, image_rel_path: Path, path_folder_output) -> Path:
-    with zipfile.ZipFile(path_docx) as z:
-        for f in z.namelist():
-            if f.endswith(image_rel_path):
-                z.extract(f, path_folder_output)
-                return path_folder_output / f
+def _get_images_parts(doc: Docx, p: Paragraph) -> List[Part]:
+    """Parts of the images of the paragraph, as loaded with the document (nothing extracted)"""
 
+    return [
+        doc.part._rels[rId].target_part
+        for blip in p._p.xpath(".//w:drawing//a:blip")
+        if (rId := blip.get(qn("r:embed")))
+    ]
 
-def _get_images_rel_path(doc: Docx, p: Paragraph) -> List[Path]:
-
-    images: List[Path] = []
-    for run in p.runs:
-        drawings = run._element.xpath(".//w:drawing")
-        if drawings:
-            blips = run._element.xpath(".//a:blip")
-            for blip in blips:
-                rId = blip.get(
-                    "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed"
-                )
-                rel_path = doc.part._rels[rId].target_ref
-                images.append(rel_path)
 
-    return images
+# a part is one rel path inside one opened docx
+_IMAGE_DIGESTS: "weakref.WeakKeyDictionary[Part, bytes]" = weakref.WeakKeyDictionary()
 
 
-def _get_images(doc: Docx, p: Paragraph) -> List[Path]:
-    return [
-        _extract_image(doc.path, image_rel_path=rel_path, path_folder_output=PATH_TMP)
-        for rel_path in _get_images_rel_path(doc, p)
-    ]
+def _get_image_digest(part: Part) -> bytes:
+    digest = _IMAGE_DIGESTS.get(part)
+    if digest is None:
+        digest = image_digest(part.blob)
+        _IMAGE_DIGESTS[part] = digest
+    return digest
 
 
 # ------------------- Predicate -------------------
@@ -263,6 +257,75 @@ def _same_format(doc: Docx, p: Paragraph, a: CT_R, b: CT_R):
     return _run_signature(doc, p, a) == _run_signature(doc, p, b)
 
 
+# ------------------- Predicate (xml) -------------------
+
+TYPE_RUN_FORMAT_FALLBACK = Tuple[float, Any]
+
+
+def build_run_format_fallback(doc: Docx) -> Callable[[CT_P], TYPE_RUN_FORMAT_FALLBACK]:
+    """
+    The effective font size and color of a run without its own 'w:sz' or 'w:color'
+    only depend on the style of its paragraph, so they are resolved once per style.
+    """
+
+    cache: Dict[Optional[str], TYPE_RUN_FORMAT_FALLBACK] = {}
+
+    def run_format_fallback(p: CT_P) -> TYPE_RUN_FORMAT_FALLBACK:
+        style_id = p.style
+        if style_id not in cache:
+            p_style = doc.part.get_style(style_id, WD_STYLE_TYPE.PARAGRAPH)
+            normal = _safe_normal_style(doc)
+
+            if p_style and p_style.font.size:
+                size = p_style.font.size.pt
+            elif normal and normal.font.size:
+                size = normal.font.size.pt
+            else:
+                size = 11.0
+
+            if p_style and p_style.font.color.rgb:
+                color = tuple(p_style.font.color.rgb)
+            elif normal and normal.font.color.rgb:
+                color = tuple(normal.font.color.rgb)
+            else:
+                color = "000000"
+
+            cache[style_id] = (size, color)
+
+        return cache[style_id]
+
+    return run_format_fallback
+
+
+def _run_signature_xml(r: CT_R, fallback: TYPE_RUN_FORMAT_FALLBACK) -> Tuple:
+    """Same comparison as '_run_signature' but without any python-docx proxy"""
+
+    rPr = r.find(qn("w:rPr"))
+    if rPr is None:
+        return (None, None, None, *fallback, None, None)
+
+    def get(tag: str, attr: str = "w:val") -> Optional[str]:
+        el = rPr.find(qn(f"w:{tag}"))
+        return None if el is None else el.get(qn(attr))
+
+    def get_bool(tag: str) -> Optional[bool]:
+        el = rPr.find(qn(f"w:{tag}"))
+        return None if el is None else el.get(qn("w:val")) != "0"
+
+    sz = rPr.find(qn("w:sz"))
+    color = rPr.find(qn("w:color"))
+
+    return (
+        get_bool("b"),
+        get_bool("i"),
+        get("u"),
+        int(sz.get(qn("w:val"))) / 2 if sz is not None else fallback[0],
+        color.get(qn("w:val")) if color is not None else fallback[1],
+        get("highlight"),
+        get("shd", attr="w:fill"),
+    )
+
+
 # ------------------- Merge -------------------
 
 
@@ -328,6 +391,29 @@ def normalize_runs(doc: Docx, p: Paragraph, inplace: bool) -> Paragraph:
     return p
 
 
+def normalize_runs_xml(p: CT_P, fallback: TYPE_RUN_FORMAT_FALLBACK) -> None:
+    """In place equivalent of 'normalize_runs' working on the xml paragraph"""
+
+    previous: Optional[CT_R] = None
+    previous_signature = None
+
+    for el in list(p):
+
+        if not _is_run(el) or _is_protected_run_xml(el):
+            previous = None
+            continue
+
+        signature = _run_signature_xml(el, fallback)
+        if previous is not None and signature == previous_signature:
+            # merge text and remove the run
+            previous.text += el.text
+            p.remove(el)
+            continue
+
+        previous = el
+        previous_signature = signature
+
+
 # ------------------- Format -------------------
 
 
@@ -354,37 +440,44 @@ def _extract_paragraph(doc: Docx, p: Paragraph, normalize: bool) -> Dict[str, An
     }
 
 
-def _extract_doc_structure(doc: Docx, normalize: bool) -> List[Dict[str, Any]]:
-    blocks: List[Dict[str, Any]] = []
+def _extract_table(doc: Docx, table: Table, normalize: bool) -> Dict[str, Any]:
+    table_data = []
+    text = ""
+    for row in table.rows:
+        row_data = []
+        for cell in row.cells:
+            cell_paragraphs = [
+                _extract_paragraph(doc, p, normalize) for p in cell.paragraphs
+            ]
+            row_data.append(
+                {
+                    "type": "cell",
+                    "background": _get_cell_background(cell),
+                    "content": cell_paragraphs,
+                }
+            )
+            text += cell.text + "\n"
 
-    # parapgraph
-    for p in doc.paragraphs:
-        blocks.append(_extract_paragraph(doc, p, normalize))
-
-    # table
-    for table in doc.tables:
-        table_data = []
-        text = ""
-        for row in table.rows:
-            row_data = []
-            for cell in row.cells:
-                cell_paragraphs = [
-                    _extract_paragraph(doc, p, normalize) for p in cell.paragraphs
-                ]
-                row_data.append(
-                    {
-                        "type": "cell",
-                        "background": _get_cell_background(cell),
-                        "content": cell_paragraphs,
-                    }
-                )
-                text += cell.text + "\n"
-
-            table_data.append(row_data)
-
-        blocks.append({"type": "table", "content": table_data, "id": text[:30]})
+        table_data.append(row_data)
 
-    return blocks
+    return {"type": "table", "content": table_data, "id": text[:30]}
+
+
+def _get_blocks(doc: Docx) -> List[Union[Paragraph, Table]]:
+    # parapgraph then table
+    return [*doc.paragraphs, *doc.tables]
+
+
+def _extract_block(
+    doc: Docx, block: Union[Paragraph, Table], normalize: bool
+) -> Dict[str, Any]:
+    if isinstance(block, Paragraph):
+        return _extract_paragraph(doc, block, normalize)
+    return _extract_table(doc, block, normalize)
+
+
+def _extract_doc_structure(doc: Docx, normalize: bool) -> List[Dict[str, Any]]:
+    return [_extract_block(doc, block, normalize) for block in _get_blocks(doc)]
 
 
 def _compare_structures(a: list, b: list) -> bool:
@@ -415,8 +508,8 @@ def _docx_image_equals(d1: Docx, d2: Docx) -> bool:
 
     for p1, p2 in zip(d1.paragraphs, d2.paragraphs):
         # get images in order
-        images1 = _get_images(d1, p1)
-        images2 = _get_images(d2, p2)
+        images1 = _get_images_parts(d1, p1)
+        images2 = _get_images_parts(d2, p2)
 
         if len(images1) != len(images2):
             logger.info(
@@ -425,11 +518,16 @@ def _docx_image_equals(d1: Docx, d2: Docx) -> bool:
             return False
 
         for i1, i2 in zip(images1, images2):
-            if not images_equal(i1, i2):
+            if not images_equal(
+                i1.blob,
+                i2.blob,
+                digest1=_get_image_digest(i1),
+                digest2=_get_image_digest(i2),
+            ):
                 logger.info(f"Docx equality image {_tip_paragraph(p1)}")
                 return False
 
-        return True
+    return True
 
 
 def paragraph_equals(
@@ -443,15 +541,66 @@ def paragraph_equals(
     return _compare_structures([e1], [e2])
 
 
-def docx_equals(d1: Docx, d2: Docx, normalize: bool = True) -> bool:
+def _canonical_hash(el: BaseOxmlElement) -> str:
+    return hashlib.sha256(etree.tostring(el, method="c14n")).hexdigest()
 
-    # paragraphs and tables
-    struct1 = _extract_doc_structure(d1, normalize)
-    struct2 = _extract_doc_structure(d2, normalize)
 
-    if not _compare_structures(struct1, struct2):
+def _docx_structure_equals_fast(d1: Docx, d2: Docx, normalize: bool) -> bool:
+    """
+    Same result as comparing the whole structures, but the blocks
+    with the same canonical xml (and the same styles) are not extracted.
+    """
+
+    # the effective formatting of a block depends on the styles
+    same_styles = _canonical_hash(d1.styles.element) == _canonical_hash(
+        d2.styles.element
+    )
+
+    if same_styles and _canonical_hash(d1.element.body) == _canonical_hash(
+        d2.element.body
+    ):
+        return True
+
+    blocks1 = _get_blocks(d1)
+    blocks2 = _get_blocks(d2)
+
+    if len(blocks1) != len(blocks2):
+        logger.info(f"Different number of blocks : {len(blocks1)} != {len(blocks2)}")
         return False
 
+    # detailed diff of the mismatching blocks only
+    mismatches = [
+        (b1, b2)
+        for b1, b2 in zip(blocks1, blocks2)
+        if not same_styles or _canonical_hash(b1._element) != _canonical_hash(b2._element)
+    ]
+
+    return _compare_structures(
+        [_extract_block(d1, b1, normalize) for b1, _ in mismatches],
+        [_extract_block(d2, b2, normalize) for _, b2 in mismatches],
+    )
+
+
+def docx_equals(
+    d1: Docx, d2: Docx, normalize: bool = True, fast: bool = True
+) -> bool:
+    """
+    Args:
+        fast (bool): the blocks are first compared by the hash of their canonical xml,
+        only the mismatching ones are compared structurally
+    """
+
+    # paragraphs and tables
+    if fast:
+        if not _docx_structure_equals_fast(d1, d2, normalize):
+            return False
+    else:
+        struct1 = _extract_doc_structure(d1, normalize)
+        struct2 = _extract_doc_structure(d2, normalize)
+
+        if not _compare_structures(struct1, struct2):
+            return False
+
     # image
     if not _docx_image_equals(d1, d2):
         return False
@@ -487,28 +636,138 @@ def replace_text_paragraphs(
     return nb_changes
 
 
-def duplicate_paragraphs(
-    doc: Docx, start_idx_paragraph: int, end_idx_paragraph: int, n: int
+def replace_text_paragraphs_xml(
+    paragraphs: List[CT_P],
+    replace_text: Callable[[str], Tuple[str, int]],
+    run_format_fallback: Optional[Callable[[CT_P], TYPE_RUN_FORMAT_FALLBACK]],
 ) -> int:
     """
-    Returns:
-        int: number of paragraphs added
+    Equivalent of 'replace_text_paragraphs' working on the xml paragraphs.
+    Without 'run_format_fallback', the paragraphs are considered already normalized.
     """
 
-    assert start_idx_paragraph > 0
+    nb_changes = 0
+
+    for p in paragraphs:
+        if run_format_fallback is not None:
+            normalize_runs_xml(p, run_format_fallback(p))
+
+        for r in p.r_lst:
+
+            if _is_protected_run_xml(r):
+                continue
+
+            changed_text, nb_new_changes = replace_text(r.text)
+
+            if nb_new_changes:
+                r.text = changed_text
+                nb_changes += nb_new_changes
+
+    return nb_changes
+
+
+def paragraphs_between_xml(start: CT_P, end: CT_P) -> List[CT_P]:
+    """
+    Paragraphs strictly between 'start' and 'end' (siblings of the same parent).
+    """
+
+    if start is end:
+        return []
+
+    paragraphs: List[CT_P] = []
+    for el in start.itersiblings():
+        if el is end:
+            break
+        if el.tag == qn("w:p"):
+            paragraphs.append(el)
 
-    start_p = doc.paragraphs[start_idx_paragraph - 1]._p
+    return paragraphs
 
-    # Paragraphs to duplicate
-    block = doc.paragraphs[start_idx_paragraph : end_idx_paragraph + 1]
 
-    # Insert duplicated block after 'start'
+def duplicate_paragraphs_xml(start: CT_P, end: CT_P, n: int) -> List[List[CT_P]]:
+    """
+    Insert 'n' clones of the paragraphs between 'start' and 'end', right after 'start'.
+    The anchors being elements, nothing has to be shifted afterwards.
+
+    Returns:
+        List[List[CT_P]]: every block in the document order, the original one being the last
+    """
+
+    block = paragraphs_between_xml(start, end)
+    if not block:
+        return [block] * (n + 1)
+
+    blocks: List[List[CT_P]] = []
     for _ in range(n):
-        for p in reversed(block):
-            new_p = deepcopy(p._p)
-            start_p.addnext(new_p)
+        new_block = [deepcopy(p) for p in block]
+        for new_p in new_block:
+            block[0].addprevious(new_p)
+        blocks.append(new_block)
+    blocks.append(block)
+
+    return blocks
+
+
+def duplicate_rows_xml(trs: List[CT_Row], amount: int, from_col: int = 1) -> None:
+    """
+    Insert, right after the last row of 'trs', 'amount' clones of the whole block.
+    The cells before 'from_col' of the clones are emptied.
+    """
+
+    last_tr = trs[-1]
+    for _ in range(amount):
+        for tr in trs:
+            new_tr = _clone_row_xml(tr, from_col)
+            last_tr.addnext(new_tr)
+            last_tr = new_tr
+
+
+def repeat_rows_xml(
+    trs: List[CT_Row],
+    replace_texts: List[Callable[[str], Tuple[str, int]]],
+    replace_text_in_tc: Callable[[CT_Tc, Callable[[str], Tuple[str, int]]], int],
+    from_col: int = 1,
+) -> int:
+    """
+    The block 'trs' is kept for the first element and cloned, right after it,
+    for each of the others. Each clone is filled before being inserted.
+
+    Returns:
+        int: number of changes
+    """
+
+    if not replace_texts:
+        return 0
+
+    nb_changes = 0
+
+    # clones are taken from the block before it is filled
+    last_tr = trs[-1]
+    for replace_text in replace_texts[1:]:
+        for tr in trs:
+            new_tr = _clone_row_xml(tr, from_col)
+            for tc in new_tr.tc_lst[from_col - 1 :]:
+                nb_changes += replace_text_in_tc(tc, replace_text)
+
+            last_tr.addnext(new_tr)
+            last_tr = new_tr
+
+    # the block itself
+    for tr in trs:
+        for tc in tr.tc_lst[from_col - 1 :]:
+            nb_changes += replace_text_in_tc(tc, replace_texts[0])
+
+    return nb_changes
+
+
+def _clone_row_xml(tr: CT_Row, from_col: int) -> CT_Row:
+    new_tr = deepcopy(tr)
+
+    for tc in new_tr.tc_lst[: from_col - 1]:
+        tc.clear_content()
+        tc.add_p()
 
-    return n * len(block)
+    return new_tr
 
 
 def remove_paragraph(paragraph: Paragraph) -> None:
@@ -1,9 +1,15 @@
 from copy import deepcopy
-from typing import Callable, Tuple
+from typing import Callable, List, Tuple
 
+from docx.oxml.table import CT_Tc
 from docx.table import Table, _Cell
+from docx.text.paragraph import Paragraph
 
-from backend.my_docx.docx_helper import replace_text_paragraphs
+from backend.my_docx.docx_helper import (
+    duplicate_rows_xml,
+    repeat_rows_xml,
+    replace_text_paragraphs,
+)
 from backend.my_docx.docx_table_cell import DocxTableCell
 from backend.my_docx.my_docx import Docx
 from backend.table.table_base import TableBase
@@ -21,7 +27,7 @@ class DocxTable(TableBase[DocxTableCell]):
     def get_col_dimension(self):
         return max(len(row.cells) for row in self.table.rows)
 
-    def get_cell(self, row, col, copy: bool = True) -> DocxTableCell:
+    def get_cell(self, row, col, copy: bool = False) -> DocxTableCell:
         cell = self.table.rows[row - 1].cells[col - 1]
         return DocxTableCell(
             row=row,
@@ -50,6 +56,38 @@ class DocxTable(TableBase[DocxTableCell]):
             else:
                 rows[row_idx - 1]._tr.addnext(new_tr)
 
+    def duplicate_rows(
+        self, start_row: int, end_row: int, amount: int, from_col: int = 1
+    ) -> None:
+        # the rows are cloned as a whole from the source block
+        duplicate_rows_xml(
+            self.table._tbl.tr_lst[start_row - 1 : end_row],
+            amount=amount,
+            from_col=from_col,
+        )
+
+    def repeat_block(
+        self,
+        start_row: int,
+        end_row: int,
+        replace_texts: List[Callable[[str], Tuple[str, int]]],
+        from_col: int = 1,
+    ) -> int:
+
+        def replace_text_in_tc(tc: CT_Tc, replace_text) -> int:
+            return replace_text_paragraphs(
+                doc=self.doc,
+                paragraphs=[Paragraph(p, self.table) for p in tc.p_lst],
+                replace_text=replace_text,
+            )
+
+        return repeat_rows_xml(
+            self.table._tbl.tr_lst[start_row - 1 : end_row],
+            replace_texts=replace_texts,
+            replace_text_in_tc=replace_text_in_tc,
+            from_col=from_col,
+        )
+
     def replace_text_in_cell(
         self, row, col, replace_text: Callable[[str], Tuple[str, int]]
     ) -> int:
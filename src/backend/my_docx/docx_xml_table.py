@@ -0,0 +1,180 @@
+from copy import deepcopy
+from typing import Callable, List, Optional, Tuple
+
+from docx.oxml.ns import qn
+from docx.oxml.table import CT_Row, CT_Tbl, CT_Tc
+from docx.oxml.text.paragraph import CT_P
+
+from backend.my_docx.docx_helper import (
+    TYPE_RUN_FORMAT_FALLBACK,
+    duplicate_rows_xml,
+    repeat_rows_xml,
+    replace_text_paragraphs_xml,
+)
+from backend.my_docx.docx_xml_table_cell import DocxXmlTableCell
+from backend.table.table_base import TableBase
+
+
+def _row_cells(tr: CT_Row) -> List[CT_Tc]:
+    """
+    Same layout as python-docx '_Row.cells' :
+    a cell spanning many grid columns is repeated,
+    a vertically merged cell is resolved to the top one.
+    """
+
+    cells: List[CT_Tc] = []
+    for tc in tr.tc_lst:
+        root = tc
+        while root.vMerge == "continue":
+            root = root._tc_above
+        cells.extend([root] * root.grid_span)
+
+    return cells
+
+
+def _cell_text(tc: CT_Tc) -> str:
+    return "\n".join(p.text for p in tc.p_lst)
+
+
+class DocxXmlTable(TableBase[DocxXmlTableCell]):
+    """Table working directly on the 'w:tbl' element with a precomputed cell grid"""
+
+    def __init__(
+        self,
+        tbl: CT_Tbl,
+        run_format_fallback: Optional[Callable[[CT_P], TYPE_RUN_FORMAT_FALLBACK]],
+    ):
+        self.tbl = tbl
+        self.run_format_fallback = run_format_fallback
+        self._grid: Optional[List[List[CT_Tc]]] = None
+
+    # ------------------- Grid -------------------
+
+    def _get_grid(self) -> List[List[CT_Tc]]:
+        # computed once and only invalidated when the structure of the table changes
+        if self._grid is None:
+            self._grid = [_row_cells(tr) for tr in self.tbl.tr_lst]
+        return self._grid
+
+    def iter_unique_tcs(self) -> List[CT_Tc]:
+        """Cells in reading order, merged cells only once"""
+        return list(dict.fromkeys(tc for row in self._get_grid() for tc in row))
+
+    # ------------------- Getter -------------------
+
+    def get_row_dimension(self):
+        return len(self._get_grid())
+
+    def get_col_dimension(self):
+        return max(len(row) for row in self._get_grid())
+
+    def get_cell(self, row, col, copy: bool = False) -> DocxXmlTableCell:
+        tc = self._get_grid()[row - 1][col - 1]
+        return DocxXmlTableCell(
+            row=row,
+            col=col,
+            str=_cell_text(tc),
+            tc=deepcopy(tc) if copy else tc,
+        )
+
+    # ------------------- Modifiers -------------------
+
+    def insert_rows(self, row: int, amount: int) -> None:
+        trs = self.tbl.tr_lst
+        row_idx = row - 1
+
+        if row_idx < 0 or row_idx > len(trs):
+            raise IndexError("row index out of range")
+
+        # Use a reference row for structure + formatting
+        ref_tr = trs[row_idx - 1] if row_idx > 0 else trs[0]
+
+        for _ in range(amount):
+            new_tr = deepcopy(ref_tr)
+
+            if row == 0:
+                trs[row_idx].addprevious(new_tr)
+            else:
+                trs[row_idx - 1].addnext(new_tr)
+
+        self._grid = None
+
+    def duplicate_rows(
+        self, start_row: int, end_row: int, amount: int, from_col: int = 1
+    ) -> None:
+        # the rows are cloned as a whole from the source block
+        duplicate_rows_xml(
+            self.tbl.tr_lst[start_row - 1 : end_row], amount=amount, from_col=from_col
+        )
+
+        self._grid = None
+
+    def repeat_block(
+        self,
+        start_row: int,
+        end_row: int,
+        replace_texts: List[Callable[[str], Tuple[str, int]]],
+        from_col: int = 1,
+    ) -> int:
+
+        def replace_text_in_tc(tc: CT_Tc, replace_text) -> int:
+            return replace_text_paragraphs_xml(
+                paragraphs=tc.p_lst,
+                replace_text=replace_text,
+                run_format_fallback=self.run_format_fallback,
+            )
+
+        nb_changes = repeat_rows_xml(
+            self.tbl.tr_lst[start_row - 1 : end_row],
+            replace_texts=replace_texts,
+            replace_text_in_tc=replace_text_in_tc,
+            from_col=from_col,
+        )
+
+        self._grid = None
+
+        return nb_changes
+
+    def replace_text_in_cell(
+        self, row, col, replace_text: Callable[[str], Tuple[str, int]]
+    ) -> int:
+        tc = self._get_grid()[row - 1][col - 1]
+        return replace_text_paragraphs_xml(
+            paragraphs=tc.p_lst,
+            replace_text=replace_text,
+            run_format_fallback=self.run_format_fallback,
+        )
+
+    def copy_cell(self, src_cell: DocxXmlTableCell, row, col) -> None:
+
+        dst_tc = self._get_grid()[row - 1][col - 1]
+
+        # Remove existing content
+        dst_tc.clear_content()
+
+        # Copy all children (paragraphs, properties, etc.)
+        for child in src_cell.tc:
+            dst_tc.append(deepcopy(child))
+
+    def remove_column(self, col: int) -> None:
+
+        col_idx = col - 1
+
+        if col_idx < 0:
+            raise IndexError("Column index must be >= 0")
+
+        # Remove the cell from each row
+        for tr in self.tbl.tr_lst:
+            tcs = tr.tc_lst
+            if col_idx >= len(tcs):
+                raise IndexError("Column index out of range")
+            tr.remove(tcs[col_idx])
+
+        # Remove gridCol if tblGrid exists
+        tbl_grid = self.tbl.find(qn("w:tblGrid"))
+        if tbl_grid is not None:
+            grid_cols = tbl_grid.gridCol_lst
+            if col_idx < len(grid_cols):
+                tbl_grid.remove(grid_cols[col_idx])
+
+        self._grid = None
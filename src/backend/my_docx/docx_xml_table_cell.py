@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+
+from docx.oxml.table import CT_Tc
+
+
+@dataclass
+class DocxXmlTableCell:
+    row: int
+    col: int
+    str: str
+    tc: CT_Tc
+
+    def __repr__(self):
+        return f"Cell(row={self.row}, col={self.col}, str={self.str})"
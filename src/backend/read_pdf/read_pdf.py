@@ -10,6 +10,8 @@ from tqdm import tqdm
 from backend.read_pdf.ocr import PytesseractOCR
 from logger import logger
 from logs_label import ExtensionFileNotSupported, FileDataError, PathNotExisting
+from progress import LAZY_PROGRESS, TYPE_PROGRESS_CALLBACK, Progress
+from timing import timer
 
 # ------------------- Public Method -------------------
 
@@ -22,14 +24,21 @@ def is_scanned(pdf_path: Path) -> bool:
     return not text
 
 
-def read_all_pdf(pdf_path: Path) -> List[str]:
+def read_all_pdf(
+    pdf_path: Path, on_progress: TYPE_PROGRESS_CALLBACK = LAZY_PROGRESS
+) -> List[str]:
+    """
+    Args:
+        on_progress (TYPE_PROGRESS_CALLBACK): called after each page OCR'd
+    """
 
     _check_ext(pdf_path)
 
-    if is_scanned(pdf_path):
-        return _ocr_pdf(pdf_path)
-    else:
-        return _read_pdf_natiely(pdf_path)
+    with timer.span("pdf read", path=pdf_path.name):
+        if is_scanned(pdf_path):
+            return _ocr_pdf(pdf_path, on_progress=on_progress)
+        else:
+            return _read_pdf_natiely(pdf_path)
 
 
 # ------------------- Private Method -------------------
@@ -72,6 +81,7 @@ def _ocr_pdf(
     pdf_path: Path,
     pages: Optional[List[int]] = None,
     dpi=300,
+    on_progress: TYPE_PROGRESS_CALLBACK = LAZY_PROGRESS,
 ) -> List[str]:
     """
     Performs OCR on a PDF and return the text.
@@ -81,6 +91,7 @@ def _ocr_pdf(
         output_path (str, optional): Path to save the output text. If None, uses the PDF name with .txt extension
         language (str, optional): Language for OCR. Default is 'eng'
         dpi (int, optional): DPI for rendering PDF. Higher is better quality but slower.
+        on_progress (TYPE_PROGRESS_CALLBACK): called after each page OCR'd
     """
 
     if not pdf_path.exists():
@@ -104,6 +115,7 @@ def _ocr_pdf(
 
         # Process each page
         text_per_page = []
+        on_progress(Progress("ocr page", 0, len(pages), detail=pdf_path.name))
         for i, image in tqdm(list(enumerate(images)), desc="OCR pages"):
 
             page_number = i + 1
@@ -111,10 +123,16 @@ def _ocr_pdf(
                 continue
 
             # Perform OCR
-            text = ocr.image_to_string(image)
+            with timer.span("ocr page", page=page_number):
+                text = ocr.image_to_string(image)
 
             # store result
             text_per_page.append(text)
+            on_progress(
+                Progress(
+                    "ocr page", len(text_per_page), len(pages), detail=pdf_path.name
+                )
+            )
 
     return text_per_page
 
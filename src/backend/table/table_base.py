@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Callable, Generic, List, Optional, Tuple, TypeVar
+from typing import Callable, Generic, Iterator, List, Optional, Tuple, TypeVar
 
 from backend.table.cell_base import CellBase
 from logger import f, logger
@@ -37,7 +37,12 @@ class TableBase(Generic[CELL_TYPE], ABC):
         pass
 
     @abstractmethod
-    def get_cell(self, row: int, col: int) -> CELL_TYPE:
+    def get_cell(self, row: int, col: int, copy: bool = False) -> CELL_TYPE:
+        """
+        Args:
+            copy (bool): the cell returned does not share its content with the table
+            (needed when the cell is pasted on a zone it is read from).
+        """
         pass
 
     # ------------------- Default method -------------------
@@ -45,6 +50,38 @@ class TableBase(Generic[CELL_TYPE], ABC):
     def get_dimensions(self) -> Tuple[int, int]:
         return (self.get_row_dimension(), self.get_col_dimension())
 
+    def get_text_cell(self, row: int, col: int) -> Optional[str]:
+        return self.get_cell(row=row, col=col).str
+
+    def iter_cells(
+        self, min_row: int = 1, min_col: int = 1, max_col: Optional[int] = None
+    ) -> Iterator[CELL_TYPE]:
+        """
+        Cells having a text, row by row.
+        Implementations storing their cells sparsely only visit the stored ones.
+        """
+
+        max_row, max_col_table = self.get_dimensions()
+        max_col = max_col_table if max_col is None else min(max_col, max_col_table)
+
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                cell = self.get_cell(row=row, col=col)
+                if cell.str:
+                    yield cell
+
+    def get_cells_containing(
+        self, marker: str, min_col: int = 1, max_col: Optional[int] = None
+    ) -> List[CELL_TYPE]:
+        return [
+            cell
+            for cell in self.iter_cells(min_col=min_col, max_col=max_col)
+            if marker in cell.str
+        ]
+
+    def get_populated_rows(self, min_row: int = 1) -> List[int]:
+        return list(dict.fromkeys(cell.row for cell in self.iter_cells(min_row=min_row)))
+
     def copy_rectangle(
         self,
         from_row: int,
@@ -63,9 +100,18 @@ class TableBase(Generic[CELL_TYPE], ABC):
         if nb_col is None:
             nb_col = (max_col + 1) - from_col
 
-        # copy
+        # copy (a snapshot is only needed if the source is overwritten by the paste)
+        overlap = (
+            from_row < to_row + nb_row
+            and to_row < from_row + nb_row
+            and from_col < to_col + nb_col
+            and to_col < from_col + nb_col
+        )
         texts: List[List[CELL_TYPE]] = [
-            [self.get_cell(row, col) for col in range(from_col, from_col + nb_col)]
+            [
+                self.get_cell(row, col, copy=overlap)
+                for col in range(from_col, from_col + nb_col)
+            ]
             for row in range(from_row, from_row + nb_row)
         ]
 
@@ -80,3 +126,75 @@ class TableBase(Generic[CELL_TYPE], ABC):
                     continue
 
                 self.copy_cell(src_cell=cell, row=row, col=col)
+
+    def duplicate_rows(
+        self, start_row: int, end_row: int, amount: int, from_col: int = 1
+    ) -> None:
+        """
+        Insert, right after 'end_row', 'amount' copies of the rows from 'start_row' to 'end_row'.
+        Only the content of the columns from 'from_col' is copied.
+        """
+
+        nb_row = end_row - start_row + 1
+        self.insert_rows(row=end_row + 1, amount=nb_row * amount)
+
+        for idx in range(1, amount + 1):
+            self.copy_rectangle(
+                from_row=start_row,
+                from_col=from_col,
+                to_row=start_row + nb_row * idx,
+                to_col=from_col,
+                nb_row=nb_row,
+            )
+
+    def expand_row_blocks(
+        self, blocks: List[Tuple[int, int, int]], from_col: int = 1
+    ) -> None:
+        """
+        Same as 'duplicate_rows' for each block (start_row, end_row, amount),
+        the positions being the ones before any duplication.
+        The blocks must not overlap.
+        """
+
+        # bottom-up : the blocks above are not moved
+        for start_row, end_row, amount in sorted(blocks, reverse=True):
+            self.duplicate_rows(start_row, end_row, amount, from_col=from_col)
+
+    def repeat_block(
+        self,
+        start_row: int,
+        end_row: int,
+        replace_texts: List[Callable[[str], Tuple[str, int]]],
+        from_col: int = 1,
+    ) -> int:
+        """
+        Repeat the rows from 'start_row' to 'end_row' once per element of 'replace_texts',
+        each repetition being filled with its own replace function.
+        The block itself is used for the first element.
+        Only the columns from 'from_col' are copied and filled.
+
+        Returns:
+            int: number of changes
+        """
+
+        if not replace_texts:
+            return 0
+
+        nb_row = end_row - start_row + 1
+        self.duplicate_rows(
+            start_row=start_row,
+            end_row=end_row,
+            amount=len(replace_texts) - 1,
+            from_col=from_col,
+        )
+
+        nb_changes = 0
+        for idx, replace_text in enumerate(replace_texts):
+            first_row = start_row + nb_row * idx
+            for row in range(first_row, first_row + nb_row):
+                for col in range(from_col, self.get_col_dimension() + 1):
+                    nb_changes += self.replace_text_in_cell(
+                        row=row, col=col, replace_text=replace_text
+                    )
+
+        return nb_changes
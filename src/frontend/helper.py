@@ -1,8 +1,20 @@
-from typing import List
+import json
+from typing import List, Optional
 
 import streamlit as st
 from streamlit.delta_generator import DeltaGenerator
 
+from job_queue import Job, JobQueue
+from vars import PATH_TMP, WORKSPACE_QUOTA_BYTES, WORKSPACE_TTL_SECONDS
+from workspace import Workspace
+
+PROGRESS_LABELS = {
+    "source": "sources",
+    "ocr page": "pages OCR",
+    "llm call": "appels au LLM",
+    "template fill": "modèles remplis",
+}
+
 
 def columns(n: int) -> List[DeltaGenerator]:
     st.markdown(
@@ -23,3 +35,99 @@ def columns(n: int) -> List[DeltaGenerator]:
 def text_success_failed(message: str, failed: bool) -> None:
     func = st.error if failed else st.success
     func(message)
+
+
+def show_timings(job: Job) -> None:
+    """Timing tree of the job, downloadable as a chrome trace"""
+
+    if job.timings is None:
+        return
+
+    with st.expander(f"Durées ({job.timings['duration']:.1f}s)"):
+        st.json(job.timings, expanded=2)
+        st.download_button(
+            label="Télécharger la trace",
+            data=json.dumps(job.trace),
+            file_name="trace.json",
+            mime="application/json",
+        )
+
+
+# ------------------- Workspace -------------------
+
+
+@st.cache_resource
+def get_workspace() -> Workspace:
+    """One workspace per server, collected in the background"""
+
+    workspace = Workspace(
+        root=PATH_TMP, ttl=WORKSPACE_TTL_SECONDS, quota=WORKSPACE_QUOTA_BYTES
+    )
+    workspace.collect()
+    workspace.start_collector()
+    return workspace
+
+
+# ------------------- Jobs -------------------
+
+
+@st.cache_resource
+def get_job_queue() -> JobQueue:
+    """One queue per server, shared by the sessions"""
+    return JobQueue(path_db=PATH_TMP / "jobs.sqlite")
+
+
+def get_job(key: str) -> Optional[Job]:
+    """Job of the session, kept in the url to be found again after a refresh"""
+
+    job_id = st.session_state.get(key) or st.query_params.get(key)
+    if job_id is None:
+        return None
+
+    st.session_state[key] = job_id
+    return get_job_queue().get(job_id)
+
+
+def set_job(key: str, job_id: str) -> None:
+    st.session_state[key] = job_id
+    st.query_params[key] = job_id
+
+
+def forget_job(key: str) -> None:
+    st.session_state[key] = None
+    st.query_params.pop(key, None)
+
+
+def show_job(job: Job, message_success: str, message_failed: str) -> None:
+    """Progress of the job, polled until it ends, then its result"""
+
+    if job.is_finished:
+        text_success_failed(
+            message_failed if job.failed else message_success, job.failed
+        )
+        show_timings(job)
+        return
+
+    # measured by the previous jobs
+    stage_durations = get_job_queue().get_stage_durations()
+
+    @st.fragment(run_every=1)
+    def poll():
+        job_polled = get_job_queue().get(job.id)
+        if job_polled is None or job_polled.is_finished:
+            # the whole page is built again with the result
+            st.rerun()
+
+        st.info("En cours...")
+        remaining = job_polled.remaining_seconds(stage_durations)
+        for stage, p in job_polled.progress.items():
+            text = f"{PROGRESS_LABELS.get(stage, stage)} : {p.done}"
+            if p.total is not None:
+                text += f"/{p.total}"
+            if p.detail:
+                text += f" ({p.detail})"
+            if stage in remaining:
+                text += f", environ {remaining[stage]:.0f}s restantes"
+            st.progress(p.ratio or 0.0, text=text)
+
+    poll()
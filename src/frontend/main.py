@@ -8,10 +8,9 @@ from typing import List, Tuple
 import streamlit as st
 from streamlit.delta_generator import DeltaGenerator
 
-import file_helper
+import frontend.helper
 from frontend import page_extraction, page_generation
 from frontend.page import Page
-from vars import PATH_TMP
 
 # pages
 pages: List[Page] = [page_extraction.PageExtraction(), page_generation.PageGeneration()]
@@ -19,17 +18,21 @@ pages: List[Page] = [page_extraction.PageExtraction(), page_generation.PageGener
 
 # launch
 if "page" not in st.session_state:
-    # Initialize selected page in session state
-    st.session_state.page = pages[0]
-    st.session_state.page.reset()
-
-    # remove all
-    file_helper.rmtree(
-        PATH_TMP,
-        rm_root=False,
-        ext_file_to_avoid_removing_at_the_root=["py", "gitkeep"],
+    # Initialize selected page in session state : after a refresh, the page
+    # of the job kept in the url, not reset to find the job again
+    st.session_state.page = next(
+        (
+            page
+            for page in pages
+            if page.job_key is not None and page.job_key in st.query_params
+        ),
+        pages[0],
     )
 
+    # temporary files : collected in the background, not removed here
+    # (the other sessions may still use them)
+    frontend.helper.get_workspace()
+
 
 # Navigation Buttons at the Top (Rectangles)
 st.markdown(
@@ -65,6 +68,7 @@ for col, page in pages_details:
 
         # change button
         if pressed and st.session_state.page != page:
+            st.session_state.page.reset()
             page.reset()
             st.session_state.page = page
             st.rerun()
@@ -1,7 +1,11 @@
 from abc import ABC, abstractmethod
+from typing import Optional
 
 
 class Page(ABC):
+    # key of the job of the page, kept in the session state and in the url
+    job_key: Optional[str] = None
+
     def __init__(self):
         pass
 
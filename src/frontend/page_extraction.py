@@ -12,31 +12,26 @@ from frontend.upload_button import (
     build_upload_button_multiple_files,
     build_upload_button_one_file,
 )
-from logger import ERROR, logger
-from vars import PATH_TMP, SUPPORTED_FILES_EXT_EXTRACTION
+from job_queue import JobStatus
+from vars import SUPPORTED_FILES_EXT_EXTRACTION
 
-
-def _build_extraction_folder_path() -> Path:
-    return PATH_TMP / f"extraction-{st.session_state.count_extraction}"
+JOB_KEY = "extraction_job"
 
 
 class PageExtraction(Page):
+    job_key = JOB_KEY
 
     def get_name(self):
         return "Extraction"
 
     def reset(self):
-        st.session_state.infos_path_file = None
-        st.session_state.enable_download_extraction = False
+        frontend.helper.forget_job(JOB_KEY)
 
     def build_page(self):
 
         if not "count_extraction" in st.session_state:
             st.session_state.count_extraction = 1
 
-            while _build_extraction_folder_path().exists():
-                st.session_state.count_extraction += 1
-
         # description
         build_description(
             content="""
@@ -50,7 +45,7 @@ class PageExtraction(Page):
 
         # uploaders
         def on_change_uploaded_files():
-            st.session_state.enable_download_extraction = False
+            frontend.helper.forget_job(JOB_KEY)
 
         config_file = build_upload_button_one_file(
             "fichier de configuration", type="xlsx", on_change=on_change_uploaded_files
@@ -70,68 +65,68 @@ class PageExtraction(Page):
             assert documents != []
 
             # create folder of the extraction
-            dir_extraction = _build_extraction_folder_path()
-            os.makedirs(dir_extraction)
+            workspace = frontend.helper.get_workspace()
+            dir_extraction = workspace.create_job_dir("extraction")
 
-            # create symbolic links
+            # create symbolic links (the members of a zip keep their folders)
             for doc in documents:
-                os.symlink(src=doc.path, dst=dir_extraction / doc.name)
-
-            # call the backend for extraction
-            logger.reset_logs()
-            try:
-                infos_file_path = extract_infos_from_config_file_and_files_tree(
-                    path_config_file=config_file.path,
-                    path_folder_sources=dir_extraction,
-                )
-                failed = False
-            except:
-                failed = True
-
-            if len(logger.get_logs(level_to_keep=ERROR)) > 0:
-                failed = True
-
-            # update global variables
-            if not failed:
-                st.session_state.infos_path_file = infos_file_path
-                st.session_state.enable_download_extraction = True
-                st.session_state.count_extraction += 1
-
-            st.session_state.extraction_failed = failed
+                path_link = dir_extraction / doc.name
+                os.makedirs(path_link.parent, exist_ok=True)
+                os.symlink(src=doc.path, dst=path_link)
+
+            # kept in the workspace while the job runs
+            lease = workspace.lease(
+                dir_extraction, config_file.path, *[doc.path for doc in documents]
+            )
+
+            # the backend extracts in a worker, the page polls the job
+            job_id = frontend.helper.get_job_queue().submit(
+                "extraction",
+                extract_infos_from_config_file_and_files_tree,
+                on_done=lease.release,
+                path_config_file=config_file.path,
+                path_folder_sources=dir_extraction,
+            )
+            frontend.helper.set_job(JOB_KEY, job_id)
+            st.session_state.count_extraction += 1
+
+        job = frontend.helper.get_job(JOB_KEY)
+        enable_download = job is not None and job.status == JobStatus.DONE
+        if enable_download:
+            frontend.helper.get_workspace().touch(Path(job.result))
 
         # button extraction
-        button_extraction_clicked = col1.button(
+        col1.button(
             label="Extraire",
             on_click=extract,
-            disabled=not config_file or not documents,
+            disabled=not config_file
+            or not documents
+            or (job is not None and not job.is_finished),
             use_container_width=True,
         )
 
         # button download extraction
         data = read_data_conditionned(
-            path=st.session_state.infos_path_file,
-            condition=st.session_state.enable_download_extraction,
+            path=job.result if enable_download else None,
+            condition=enable_download,
         )
 
         col2.download_button(
             label="Télécharger extraction",
             data=data,
             file_name=f"extraction{st.session_state.count_extraction-1}.xlsx",
-            disabled=not st.session_state.enable_download_extraction,
+            disabled=not enable_download,
             use_container_width=True,
         )
 
-        # message extraction success/fails
-        if button_extraction_clicked:
-            message = (
-                (
+        # progress, then message extraction success/fails
+        if job is not None:
+            frontend.helper.show_job(
+                job,
+                message_success="L'extraction s'est déroulée avec succès.",
+                message_failed=(
                     "L'extraction a echouée.\n"
                     + "Veuillez vérifier que votre fichier de configuration est correct.\n"
                     + "Si le problème persiste, contactez Sacha Hibon en incluant **tous** les fichiers utilisés."
-                )
-                if st.session_state.extraction_failed
-                else "L'extraction s'est déroulée avec succès."
-            )
-            frontend.helper.text_success_failed(
-                message, st.session_state.extraction_failed
+                ),
             )
@@ -9,31 +9,25 @@ import frontend.helper
 from backend import fill_template
 from frontend.description import build_description
 from frontend.upload_button import build_upload_button_one_file
-from logger import ERROR, logger
-from vars import PATH_TMP
+from job_queue import JobStatus
 
-
-def _build_generation_folder_path() -> Path:
-    return PATH_TMP / f"generation-{st.session_state.count_generation}"
+JOB_KEY = "generation_job"
 
 
 class PageGeneration(Page):
+    job_key = JOB_KEY
 
     def get_name(self):
         return "Génération"
 
     def reset(self):
-        st.session_state.enable_download_generation = False
-        st.session_state.generated_file_path = None
+        frontend.helper.forget_job(JOB_KEY)
 
     def build_page(self):
 
         if not "count_generation" in st.session_state:
             st.session_state.count_generation = 1
 
-            while _build_generation_folder_path().exists():
-                st.session_state.count_generation += 1
-
         # description
         build_description(
             content="""A partir
@@ -46,7 +40,7 @@ class PageGeneration(Page):
 
         # uploaders
         def on_change_uploaded_files():
-            st.session_state.enable_download_generation = False
+            frontend.helper.forget_job(JOB_KEY)
 
         filled_config_file = build_upload_button_one_file(
             french_label="fichier de configuration rempli",
@@ -67,41 +61,44 @@ class PageGeneration(Page):
             assert filled_config_file is not None
             assert template is not None
 
-            # call the backend for generation
-            logger.reset_logs()
-            try:
-                generated_file_path = fill_template(
-                    infos_path_file=filled_config_file.path,
-                    template_path=template.path,
-                    path_folder_output=PATH_TMP,
-                )
-                failed = False
-            except:
-                failed = True
-
-            if len(logger.get_logs(level_to_keep=ERROR)) > 0:
-                failed = True
-
-            # update global variables
-            if not failed:
-                st.session_state.generated_file_path = generated_file_path
-                st.session_state.enable_download_generation = True
-                st.session_state.count_generation += 1
-
-            st.session_state.generation_failed = failed
+            # folder of the generation, kept in the workspace while the job runs
+            workspace = frontend.helper.get_workspace()
+            dir_generation = workspace.create_job_dir("generation")
+            lease = workspace.lease(
+                dir_generation, filled_config_file.path, template.path
+            )
+
+            # the backend generates in a worker, the page polls the job
+            job_id = frontend.helper.get_job_queue().submit(
+                "generation",
+                fill_template,
+                on_done=lease.release,
+                infos_path_file=filled_config_file.path,
+                template_path=template.path,
+                path_folder_output=dir_generation,
+            )
+            frontend.helper.set_job(JOB_KEY, job_id)
+            st.session_state.count_generation += 1
+
+        job = frontend.helper.get_job(JOB_KEY)
+        enable_download = job is not None and job.status == JobStatus.DONE
+        if enable_download:
+            frontend.helper.get_workspace().touch(Path(job.result))
 
         # button generation
-        button_generation_clicked = col1.button(
+        col1.button(
             label="Generate",
             on_click=generate,
-            disabled=not filled_config_file or not template,
+            disabled=not filled_config_file
+            or not template
+            or (job is not None and not job.is_finished),
             use_container_width=True,
         )
 
         # button download
         data = read_data_conditionned(
-            path=st.session_state.generated_file_path,
-            condition=st.session_state.enable_download_generation,
+            path=job.result if enable_download else None,
+            condition=enable_download,
         )
 
         tn = Path(template.name if template else "toto.txt")
@@ -109,21 +106,18 @@ class PageGeneration(Page):
             label="Télécharger génération",
             data=data,
             file_name=f"{tn.stem}_généré{st.session_state.count_generation-1}{tn.suffix}",
-            disabled=not st.session_state.enable_download_generation,
+            disabled=not enable_download,
             use_container_width=True,
         )
 
-        # text success/failed
-        if button_generation_clicked:
-            message = (
-                (
+        # progress, then text success/failed
+        if job is not None:
+            frontend.helper.show_job(
+                job,
+                message_success="La génération s'est déroulée avec succès.",
+                message_failed=(
                     "La génération a echouée.\n"
                     + "Veuillez vérifier que votre fichier de configuration et que vos modèles sont corrects.\n"
                     + "Si le problème persiste, contactez Sacha Hibon en incluant **tous** les fichiers utilisés."
-                )
-                if st.session_state.generation_failed
-                else "La génération s'est déroulée avec succès."
-            )
-            frontend.helper.text_success_failed(
-                message, st.session_state.generation_failed
+                ),
             )
@@ -1,21 +1,26 @@
-import os
 import zipfile
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, List, Optional, Tuple, Union
+from typing import Callable, List, Optional, Union
 
 import streamlit as st
 from streamlit.elements.widgets.audio_input import UploadedFile
 
-import io_helper
-from vars import PATH_TMP
+import frontend.helper
+from io_helper import iter_zip_members
+from logger import f, logger
+from logs_label import WorkspaceQuotaExceeded
+from upload_store import UploadStore
+from vars import SUPPORTED_FILES_EXT_EXTRACTION
 
 TYPE_ON_CHANGE = Callable[[], None]
 
 
 @dataclass
 class SavedFile:
+    # name given by the user, relative path for a member of a zip
     name: str
+    # hash of the content
     id: str
     path: Path
 
@@ -48,7 +53,7 @@ def _build_upload_button(
     type: Union[str, List[str]],
     on_change: TYPE_ON_CHANGE,
     accept_multiple_files: bool,
-) -> List[Path]:
+) -> List[SavedFile]:
 
     # create button
     col = st.container(border=True)
@@ -73,47 +78,80 @@ def _build_upload_button(
     if not isinstance(uploaded_file, list):
         uploaded_file = [uploaded_file]
 
+    # files already stored in a previous run of the script
+    if "uploads" not in st.session_state:
+        st.session_state.uploads = {}
+
     saved_files: List[SavedFile] = []
 
-    # save the uploaded files in tmp/
+    workspace = frontend.helper.get_workspace()
+
     for file in uploaded_file:
+        saved = st.session_state.uploads.get(file.file_id)
+
+        # stored again if removed from the workspace in between
+        if saved is None or not all(sf.path.exists() for sf in saved):
+            try:
+                saved = _store_uploaded_file(file)
+            except WorkspaceQuotaExceeded as e:
+                col.error(
+                    f"Pas assez d'espace pour enregistrer '{file.name}', réessayez plus tard."
+                )
+                logger.error(e.msg(), extra=e)
+                continue
+            st.session_state.uploads[file.file_id] = saved
+
+        # used by the session : kept in the workspace
+        workspace.touch(*[sf.path for sf in saved])
+        saved_files.extend(saved)
 
-        # build the path to save
-        filename = Path(file.name)
-        ext = filename.suffix.lower()[1:]
+    return saved_files
 
-        filename_dst = (
-            f"{filename.stem}-{file.file_id}{filename.suffix if ext != 'zip' else ''}"
-        )
-        path_dst = PATH_TMP / filename_dst
-
-        # already saved ?
-        if not path_dst.exists():
-            print(f"Saving uploaded file : {filename_dst}")
-
-            # save it according to its extension
-            if ext in ["xlsx", "docx", "pdf"]:
-                io_helper.write(file.getvalue(), path_dst=path_dst)
-            elif ext == "zip":
-                _extract_zip_file(file, path_dst=path_dst)
-            else:
-                raise RuntimeError(f"The extension '{ext}' is not supported.")
-
-        # store the path(s)
-        if ext == "zip":
-            for rep in os.listdir(path=path_dst):
-                sf = SavedFile(name=rep, id=file.file_id, path=path_dst / rep)
-                saved_files.append(sf)
-        else:
-            sf = SavedFile(name=file.name, id=file.file_id, path=path_dst)
-            saved_files.append(sf)
 
-    return saved_files
+@st.cache_resource
+def _get_upload_store() -> UploadStore:
+    """One store per server, shared by the sessions"""
+    return UploadStore(root=frontend.helper.get_workspace().path_uploads)
+
 
+def _store_uploaded_file(file: UploadedFile) -> List[SavedFile]:
+    """
+    Streamed to the upload store, the members of a zip one by one
+
+    Raises:
+        WorkspaceQuotaExceeded
+    """
+
+    workspace = frontend.helper.get_workspace()
+    store = _get_upload_store()
+
+    ext = Path(file.name).suffix.lower()[1:]
+    if ext not in ["xlsx", "docx", "zip", *SUPPORTED_FILES_EXT_EXTRACTION]:
+        raise RuntimeError(f"The extension '{ext}' is not supported.")
+
+    workspace.reserve(file.size)
+    file.seek(0)
+    stored = store.store(file, name=file.name)
+    if ext != "zip":
+        return [SavedFile(name=file.name, id=stored.digest, path=stored.path)]
 
-def _extract_zip_file(uploaded_file: UploadedFile, path_dst: Path) -> None:
     try:
-        io_helper.extract_zip_file(uploaded_file.getvalue(), path_dst=path_dst)
+        # room for the members extracted
+        with zipfile.ZipFile(stored.path) as zf:
+            workspace.reserve(
+                sum(
+                    member.file_size
+                    for member, _ in iter_zip_members(
+                        zf, exts=SUPPORTED_FILES_EXT_EXTRACTION
+                    )
+                )
+            )
+
+        members = store.store_zip_members(
+            stored.path, exts=SUPPORTED_FILES_EXT_EXTRACTION
+        )
     except zipfile.BadZipFile:
-        # print("Le fichier enregistré n'est pas un fichier ZIP valide.")
-        print("The uploaded file is not a valid ZIP file.")
+        logger.warning(f"The uploaded file is not a valid ZIP file {f(name=file.name)}")
+        return []
+
+    return [SavedFile(name=m.name, id=m.digest, path=m.path) for m in members]
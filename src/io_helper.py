@@ -1,18 +1,82 @@
-import io
+import hashlib
+import os
+import shutil
 import zipfile
-from pathlib import Path
-from typing import Union
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
 
+# size of the chunks copied, the files are never fully held in memory
+CHUNK_SIZE = 1024 * 1024
 
-def extract_zip_file(zip_file: bytes, path_dst: Union[str, Path]) -> None:
+
+def extract_zip_file(
+    zip_file: Union[str, Path, BinaryIO],
+    path_dst: Union[str, Path],
+    exts: Optional[List[str]] = None,
+) -> List[Path]:
     """
+    Extract the members one by one, in chunks.
+
+    Args:
+        exts (Optional[List[str]]): extensions of the members to extract, all if None
+
+    Returns:
+        List[Path]: paths of the members extracted
 
     Raises:
         zipfile.BadZipFile
     """
 
-    with zipfile.ZipFile(io.BytesIO(zip_file)) as zf:
-        zf.extractall(path=path_dst)
+    paths = []
+    with zipfile.ZipFile(zip_file) as zf:
+        for member, name in iter_zip_members(zf, exts):
+            path = Path(path_dst) / name
+            os.makedirs(path.parent, exist_ok=True)
+            with zf.open(member) as src, open(path, "wb") as dst:
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
+            paths.append(path)
+
+    return paths
+
+
+def iter_zip_members(
+    zf: zipfile.ZipFile, exts: Optional[List[str]] = None
+) -> Iterator[Tuple[zipfile.ZipInfo, str]]:
+    """
+    Files of the zip with their relative path, without the directories, the hidden
+    files (e.g. __MACOSX/) and the paths going outside of the folder (zip slip).
+    """
+
+    for member in zf.infolist():
+        if member.is_dir():
+            continue
+
+        path = PurePosixPath(member.filename)
+        if path.is_absolute() or ".." in path.parts:
+            continue
+        if any(part.startswith((".", "__MACOSX")) for part in path.parts):
+            continue
+        if exts is not None and path.suffix.lower()[1:] not in exts:
+            continue
+
+        yield member, str(path)
+
+
+def write_stream(src: BinaryIO, path_dst: Union[str, Path]) -> str:
+    """
+    Copy in chunks, hashed while written.
+
+    Returns:
+        str: sha256 of the content
+    """
+
+    sha = hashlib.sha256()
+    with open(path_dst, "wb") as dst:
+        while chunk := src.read(CHUNK_SIZE):
+            sha.update(chunk)
+            dst.write(chunk)
+
+    return sha.hexdigest()
 
 
 def write(bytes_to_write: bytes, path_dst: Union[str, Path]) -> None:
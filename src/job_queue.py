@@ -0,0 +1,310 @@
+import json
+import multiprocessing
+import sqlite3
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from logger import ERROR, f, logger
+from progress import Progress
+from timing import timer
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created REAL NOT NULL,
+    started REAL,
+    finished REAL,
+    progress TEXT NOT NULL DEFAULT '{}',
+    result TEXT,
+    errors TEXT NOT NULL DEFAULT '[]',
+    timings TEXT,
+    trace TEXT
+)
+"""
+
+# time spent per unit of each progress stage, over the previous jobs
+_SCHEMA_STAGES = """
+CREATE TABLE IF NOT EXISTS stages (
+    stage TEXT PRIMARY KEY,
+    nb INTEGER NOT NULL,
+    seconds REAL NOT NULL
+)
+"""
+
+# ------------------- Structure -------------------
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    status: JobStatus
+    created: float
+    started: Optional[float]
+    finished: Optional[float]
+    # last progress of each stage (e.g. pages OCR'd, sources done)
+    progress: Dict[str, Progress]
+    # path returned by the job
+    result: Optional[str]
+    errors: List[str]
+    # timing tree of the run ('Span.to_dict') and its chrome trace
+    timings: Optional[Dict[str, Any]]
+    trace: Optional[Dict[str, Any]]
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (JobStatus.DONE, JobStatus.FAILED)
+
+    @property
+    def failed(self) -> bool:
+        return self.status == JobStatus.FAILED
+
+    def remaining_seconds(self, stage_durations: Dict[str, float]) -> Dict[str, float]:
+        """
+        Args:
+            stage_durations (Dict[str, float]): 'JobQueue.get_stage_durations'
+
+        Returns:
+            Dict[str, float]: estimation of the time left of each stage whose total
+            is known and which has already been measured
+        """
+
+        return {
+            stage: (p.total - p.done) * stage_durations[stage]
+            for stage, p in self.progress.items()
+            if p.total is not None and stage in stage_durations
+        }
+
+
+# ------------------- Queue -------------------
+
+
+class JobQueue:
+    """
+    Jobs (extractions, generations) run in a process pool, their state
+    is kept in a SQLite database : it is read by polling from any session
+    and survives a page refresh.
+    """
+
+    def __init__(self, path_db: Path, max_workers: Optional[int] = None):
+        self.path_db = path_db
+        # the server is multi-threaded (sessions, workspace collector) : no fork
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("forkserver")
+        )
+        self._futures: Dict[str, Future] = {}
+
+        with closing(_connect(path_db)) as conn, conn:
+            conn.execute(_SCHEMA)
+            conn.execute(_SCHEMA_STAGES)
+            # jobs of a previous server : their workers are gone
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished = ?, errors = ? WHERE status IN (?, ?)",
+                (
+                    JobStatus.FAILED.value,
+                    time.time(),
+                    json.dumps(["Job interrupted by a restart of the server."]),
+                    JobStatus.QUEUED.value,
+                    JobStatus.RUNNING.value,
+                ),
+            )
+
+    def submit(
+        self,
+        kind: str,
+        func: Callable[..., Any],
+        on_done: Optional[Callable[[], None]] = None,
+        **kwargs,
+    ) -> str:
+        """
+        Args:
+            func (Callable[..., Any]): picklable function, run in a worker process,
+            taking an 'on_progress' argument (TYPE_PROGRESS_CALLBACK)
+            on_done (Optional[Callable[[], None]]): called in this process once the job
+            has ended (e.g. release what the job was using)
+
+        Returns:
+            str: id of the job
+        """
+
+        job_id = uuid.uuid4().hex
+        with closing(_connect(self.path_db)) as conn, conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, created) VALUES (?, ?, ?, ?)",
+                (job_id, kind, JobStatus.QUEUED.value, time.time()),
+            )
+
+        future = self._executor.submit(_run_job, self.path_db, job_id, func, kwargs)
+        # only kept while running : the queue lives as long as the server
+        self._futures[job_id] = future
+        future.add_done_callback(lambda _: self._futures.pop(job_id, None))
+        if on_done is not None:
+            future.add_done_callback(lambda _: on_done())
+        logger.info(f"Job submitted {f(job_id=job_id, kind=kind)}")
+
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with closing(_connect(self.path_db)) as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+
+        if row is None:
+            return None
+
+        return Job(
+            id=row["id"],
+            kind=row["kind"],
+            status=JobStatus(row["status"]),
+            created=row["created"],
+            started=row["started"],
+            finished=row["finished"],
+            progress={
+                stage: Progress(stage=stage, **p)
+                for stage, p in json.loads(row["progress"]).items()
+            },
+            result=row["result"],
+            errors=json.loads(row["errors"]),
+            timings=json.loads(row["timings"]) if row["timings"] else None,
+            trace=json.loads(row["trace"]) if row["trace"] else None,
+        )
+
+    def get_stage_durations(self) -> Dict[str, float]:
+        """
+        Returns:
+            Dict[str, float]: mean duration of a unit of each stage (a page OCR'd,
+            a llm call, ...), measured by the previous jobs
+        """
+
+        with closing(_connect(self.path_db)) as conn:
+            rows = conn.execute("SELECT stage, nb, seconds FROM stages").fetchall()
+
+        return {row["stage"]: row["seconds"] / row["nb"] for row in rows if row["nb"]}
+
+    def wait(
+        self, job_id: str, timeout: Optional[float] = None, poll_interval: float = 0.1
+    ) -> Optional[Job]:
+        """
+        Wait for a job : through its future while this queue runs it,
+        else by polling the database.
+
+        Raises:
+            TimeoutError
+        """
+
+        future = self._futures.get(job_id)
+        if future is not None:
+            future.result(timeout=timeout)
+            return self.get(job_id)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job.is_finished:
+                return job
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Job {job_id} not finished after {timeout}s")
+            time.sleep(poll_interval)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+# ------------------- Worker -------------------
+
+
+def _run_job(
+    path_db: Path, job_id: str, func: Callable[..., Any], kwargs: Dict[str, Any]
+) -> None:
+    """
+    Run in a worker process : the state of the job is written in the database.
+    'func' reports its progress through its 'on_progress' argument.
+    """
+
+    logger.reset_logs()
+    timer.reset(name=job_id)
+
+    progress: Dict[str, Dict[str, Any]] = {}
+
+    def on_progress(p: Progress) -> None:
+        progress[p.stage] = {"done": p.done, "total": p.total, "detail": p.detail}
+        _update(path_db, job_id, progress=json.dumps(progress))
+
+    _update(path_db, job_id, status=JobStatus.RUNNING.value, started=time.time())
+
+    try:
+        result = func(**kwargs, on_progress=on_progress)
+        errors = [log.msg for log in logger.get_logs(level_to_keep=ERROR)]
+    except Exception as e:
+        result = None
+        errors = [log.msg for log in logger.get_logs(level_to_keep=ERROR)]
+        errors.append(f"{e.__class__.__name__}: {e}")
+    timer.stop()
+
+    if not errors:
+        _add_stage_durations(path_db, stages=progress.keys())
+
+    _update(
+        path_db,
+        job_id,
+        status=(JobStatus.FAILED if errors else JobStatus.DONE).value,
+        finished=time.time(),
+        result=None if result is None else str(result),
+        errors=json.dumps(errors),
+        timings=json.dumps(timer.root.to_dict()),
+        trace=json.dumps(timer.to_chrome_trace()),
+    )
+
+
+# ------------------- Private Method -------------------
+
+
+def _connect(path_db: Path) -> sqlite3.Connection:
+    # written by the worker processes, read by the sessions
+    conn = sqlite3.connect(path_db, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+def _add_stage_durations(path_db: Path, stages: Iterable[str]) -> None:
+    """Durations of the spans of the stages, named as them"""
+
+    durations: Dict[str, List[float]] = {stage: [] for stage in stages}
+    for span in timer.root.iter_spans():
+        if span.name in durations:
+            durations[span.name].append(span.duration)
+
+    with closing(_connect(path_db)) as conn, conn:
+        conn.executemany(
+            "INSERT INTO stages (stage, nb, seconds) VALUES (?, ?, ?) "
+            + "ON CONFLICT(stage) DO UPDATE SET "
+            + "nb = nb + excluded.nb, seconds = seconds + excluded.seconds",
+            [
+                (stage, len(values), sum(values))
+                for stage, values in durations.items()
+                if values
+            ],
+        )
+
+
+def _update(path_db: Path, job_id: str, **values) -> None:
+    columns = ", ".join(f"{name} = ?" for name in values)
+    with closing(_connect(path_db)) as conn, conn:
+        conn.execute(
+            f"UPDATE jobs SET {columns} WHERE id = ?", (*values.values(), job_id)
+        )
@@ -1,6 +1,13 @@
+import contextvars
+import dataclasses
+import heapq
+import itertools
 import logging
 import os
+import pickle
 import sys
+import threading
+from collections import deque
 from dataclasses import dataclass
 from logging import (  # for the use of the other files
     DEBUG,
@@ -9,33 +16,147 @@ from logging import (  # for the use of the other files
     WARNING,
     _nameToLevel,
 )
-from typing import List, Optional
+from typing import Callable, Deque, Dict, List, Optional, Tuple
 
 from logs_label_base import LogLabel
 
+# logs kept per level, the oldest ones are dropped
+MAX_LOGS_PER_LEVEL = int(os.environ.get("LOGGER_MAX_LOGS_PER_LEVEL", 1000))
+# longer messages and label texts (llm answers, ocr texts) are truncated
+MAX_LEN_TEXT = int(os.environ.get("LOGGER_MAX_LEN_TEXT", 2000))
+
 
 def f(**kwargs):
     return "[" + ",".join(f"{name}={s}" for name, s in kwargs.items()) + "]"
 
 
+class lazy:
+    """
+    Argument of a log message, computed only when the log is emitted :
+    logger.debug("rows : %s", lazy(f, first_name=name, rows=rows))
+    """
+
+    __slots__ = ("func", "args", "kwargs")
+
+    def __init__(self, func: Callable[..., object], *args, **kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def __str__(self) -> str:
+        return str(self.func(*self.args, **self.kwargs))
+
+
 @dataclass
 class Log:
     level: str
     msg: str
     label: Optional[LogLabel]
 
+    def picklable(self) -> "Log":
+        """Copy which can be sent to another process (the label may hold xml elements)"""
+        try:
+            pickle.dumps(self.label)
+            label = self.label
+        except Exception:
+            label = None
+
+        return Log(level=self.level, msg=str(self.msg), label=label)
+
+
+def _truncate(text: str) -> str:
+    if len(text) <= MAX_LEN_TEXT:
+        return text
+    return text[:MAX_LEN_TEXT] + f"... [{len(text) - MAX_LEN_TEXT} characters truncated]"
+
+
+def _truncate_label(label: Optional[LogLabel]) -> Optional[LogLabel]:
+    """Copy of the label with its long texts truncated, the label itself otherwise"""
+
+    if label is None or not dataclasses.is_dataclass(label):
+        return label
+
+    long_texts = {
+        field.name: _truncate(value)
+        for field in dataclasses.fields(label)
+        if field.init
+        and isinstance(value := getattr(label, field.name), str)
+        and len(value) > MAX_LEN_TEXT
+    }
+    if not long_texts:
+        return label
+
+    try:
+        return dataclasses.replace(label, **long_texts)
+    except Exception:
+        return label
+
+
+class LogStore:
+    """
+    Logs of one run : a bounded buffer per level, filled from any thread.
+    Sorted by level when emitted, so keeping only the important logs
+    does not go through the others.
+    """
+
+    def __init__(self, max_logs_per_level: int = MAX_LOGS_PER_LEVEL):
+        self._lock = threading.Lock()
+        self._count = itertools.count()
+        self._max_logs_per_level = max_logs_per_level
+        # {level: [(order, log)]}
+        self._logs: Dict[int, Deque[Tuple[int, Log]]] = {}
+        self.nb_dropped = 0
+
+    def append(self, log: Log) -> None:
+        level = _nameToLevel[log.level]
+        with self._lock:
+            logs = self._logs.get(level)
+            if logs is None:
+                logs = self._logs[level] = deque(maxlen=self._max_logs_per_level)
+            if len(logs) == logs.maxlen:
+                self.nb_dropped += 1
+            logs.append((next(self._count), log))
+
+    def extend(self, logs: List[Log]) -> None:
+        for log in logs:
+            self.append(log)
+
+    def get(self, level_to_keep: int = DEBUG) -> List[Log]:
+        with self._lock:
+            kept = [
+                list(logs) for level, logs in self._logs.items() if level >= level_to_keep
+            ]
+        return [log for _, log in heapq.merge(*kept, key=lambda item: item[0])]
+
+    def remove(self, to_remove: Callable[[Log], bool]) -> None:
+        with self._lock:
+            for logs in self._logs.values():
+                kept = [item for item in logs if not to_remove(item[1])]
+                logs.clear()
+                logs.extend(kept)
+
+
+# store of the current run (context of the thread or of the asyncio task),
+# the default one when no run has been started
+_DEFAULT_STORE = LogStore()
+_CURRENT_STORE: contextvars.ContextVar[LogStore] = contextvars.ContextVar(
+    "log_store", default=_DEFAULT_STORE
+)
+
 
 class StoreHandler(logging.StreamHandler):
 
-    logs: List[Log] = []
-
     def emit(self, record):
 
-        self.logs.append(
+        # formatted once, for the store and the stream
+        record.msg = record.getMessage()
+        record.args = None
+
+        _CURRENT_STORE.get().append(
             Log(
                 level=record.levelname,
-                msg=record.msg,
-                label=record.__dict__.get("label"),
+                msg=_truncate(record.msg),
+                label=_truncate_label(record.__dict__.get("label")),
             )
         )
 
@@ -62,27 +183,35 @@ class MyLogger(logging.Logger):
         if level:
             self.setLevel(level)
 
+    def setLevel(self, level) -> None:
+        super().setLevel(level)
+        # not registered in the logging manager : its level cache is not cleared
+        self._cache.clear()
+
+    def is_debug(self) -> bool:
+        """Guard of the debug blocks too costly to be built when not logged"""
+        return self.isEnabledFor(DEBUG)
+
     def get_logs(self, level_to_keep=DEBUG) -> List[Log]:
-        logs: List[Log] = self.handlers[0].logs
-        return [log for log in logs if _nameToLevel[log.level] >= level_to_keep]
+        return _CURRENT_STORE.get().get(level_to_keep)
 
     def get_logs_label(self) -> List[LogLabel]:
         return [log.label for log in self.get_logs() if log.label]
 
     def filter_logs(self, log_label):
-        self.handlers[0].logs = [
-            log for log in self.get_logs() if log.label.__class__ != log_label
-        ]
+        _CURRENT_STORE.get().remove(lambda log: log.label.__class__ == log_label)
 
     def filter_logs_level(self, log_level_to_keep):
-        self.handlers[0].logs = [
-            log
-            for log in self.get_logs()
-            if _nameToLevel[log.level] >= log_level_to_keep
-        ]
+        _CURRENT_STORE.get().remove(
+            lambda log: _nameToLevel[log.level] < log_level_to_keep
+        )
+
+    def add_logs(self, logs: List[Log]):
+        _CURRENT_STORE.get().extend(logs)
 
     def reset_logs(self):
-        self.handlers[0].logs = []
+        """Start a new run : the logs of the current context go to a new store"""
+        _CURRENT_STORE.set(LogStore())
 
 
 # global logger
@@ -75,6 +75,53 @@ class ExtensionFileNotSupported(LogLabel, RuntimeError):
         )
 
 
+@dataclass
+class BatchGenerationWrongInputs(LogLabel, RuntimeError):
+    nb_config_files: int
+    nb_templates: int
+
+    def msg(self):
+        return (
+            "A batch generation takes one config file and many templates, or many config files and one template. "
+            + f"Here {self.nb_config_files} config files and {self.nb_templates} templates are given."
+        )
+
+
+@dataclass
+class MergeListNotExisting(LogLabel, RuntimeError):
+    name: str
+
+    def msg(self):
+        return f"The list info '{self.name}' used for the mail-merge is not in the config file"
+
+
+@dataclass
+class LibreOfficeNotFound(LogLabel, RuntimeError):
+
+    def msg(self):
+        return "LibreOffice ('soffice') is needed for the pdf export but is not installed"
+
+
+@dataclass
+class PdfExportFailed(LogLabel, RuntimeError):
+    path: Path
+
+    def msg(self):
+        return f"The pdf export of '{self.path}' failed"
+
+
+@dataclass
+class WorkspaceQuotaExceeded(LogLabel, RuntimeError):
+    nb_bytes_asked: int
+    nb_bytes_free: int
+
+    def msg(self):
+        return (
+            f"Not enough space in the workspace : {self.nb_bytes_asked} bytes asked, "
+            + f"{self.nb_bytes_free} bytes free"
+        )
+
+
 @dataclass
 class FileDataError(LogLabel, RuntimeError):
     path: Path
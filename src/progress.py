@@ -0,0 +1,24 @@
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+@dataclass
+class Progress:
+    # unit of work counted, same name as its timing span (e.g. "ocr page", "source")
+    stage: str
+    done: int
+    total: Optional[int] = None
+    # what is being processed (name of the source, of the pdf, ...)
+    detail: Optional[str] = None
+
+    @property
+    def ratio(self) -> Optional[float]:
+        if not self.total:
+            return None
+        return min(self.done / self.total, 1.0)
+
+
+TYPE_PROGRESS_CALLBACK = Callable[[Progress], None]
+
+# when nobody follows the progress
+LAZY_PROGRESS: TYPE_PROGRESS_CALLBACK = lambda _: None
@@ -0,0 +1,148 @@
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from logger import f, lazy, logger
+
+
+@dataclass
+class Span:
+    name: str
+    # seconds, from time.perf_counter (same clock for every process of the machine)
+    start: float
+    end: Optional[float] = None
+    attrs: Dict[str, Any] = field(default_factory=dict)
+    children: List["Span"] = field(default_factory=list)
+    pid: int = field(default_factory=os.getpid)
+    tid: int = field(default_factory=threading.get_ident)
+
+    @property
+    def duration(self) -> float:
+        end = time.perf_counter() if self.end is None else self.end
+        return end - self.start
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "duration": round(self.duration, 6),
+            "attrs": {name: str(value) for name, value in self.attrs.items()},
+            "children": [child.to_dict() for child in self.children],
+        }
+
+    def iter_spans(self) -> Iterator["Span"]:
+        yield self
+        for child in self.children:
+            yield from child.iter_spans()
+
+
+class Timer:
+    """
+    Timing tree of a run : each span is a stage, nested in the span opened
+    when it started (per thread). Spans opened in a thread without
+    a current span are attached to the root.
+    The root is selected through a context variable, as the log store : each run
+    (session, job, test) started by 'reset' has its own tree.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._current = contextvars.ContextVar("current_span", default=None)
+        self._root: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+            "root_span", default=None
+        )
+
+    @property
+    def root(self) -> Span:
+        """Root of the current context, started on first use when never reset"""
+
+        root = self._root.get()
+        if root is None:
+            root = Span(name="run", start=time.perf_counter())
+            self._root.set(root)
+        return root
+
+    def reset(self, name: str = "run") -> None:
+        """Start a new run : the spans of the current context go to a new tree"""
+        self._root.set(Span(name=name, start=time.perf_counter()))
+        self._current.set(None)
+
+    def stop(self) -> None:
+        """End of the run : the root duration stops growing"""
+        self.root.end = time.perf_counter()
+
+    # ------------------- Spans -------------------
+
+    @contextmanager
+    def span(self, name: str, **attrs) -> Iterator[Span]:
+        parent = self._current.get() or self.root
+        span = Span(name=name, start=time.perf_counter(), attrs=attrs)
+        with self._lock:
+            parent.children.append(span)
+
+        token = self._current.set(span)
+        try:
+            yield span
+        finally:
+            span.end = time.perf_counter()
+            self._current.reset(token)
+            logger.debug(
+                "Timing : %s %.3fs %s", name, span.duration, lazy(f, **span.attrs)
+            )
+
+    def timed(self, name: Optional[str] = None) -> Callable:
+        """Decorator version of 'span', named after the function by default"""
+
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name or func.__name__):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def annotate(self, **attrs) -> None:
+        """Add attributes (e.g. token counts) to the current span"""
+        span = self._current.get() or self.root
+        span.attrs.update(attrs)
+
+    def add_spans(self, spans: List[Span]) -> None:
+        """Attach spans recorded elsewhere (e.g. in a worker process) to the current span"""
+        parent = self._current.get() or self.root
+        with self._lock:
+            parent.children.extend(spans)
+
+    # ------------------- Export -------------------
+
+    def to_json(self) -> str:
+        return json.dumps(self.root.to_dict(), ensure_ascii=False, indent=1)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Trace Event Format, readable by chrome://tracing or Perfetto"""
+
+        return {
+            "traceEvents": [
+                {
+                    "name": span.name,
+                    "ph": "X",
+                    "ts": span.start * 1e6,
+                    "dur": span.duration * 1e6,
+                    "pid": span.pid,
+                    "tid": span.tid,
+                    "args": {name: str(value) for name, value in span.attrs.items()},
+                }
+                for span in self.root.iter_spans()
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+
+# global timer
+timer = Timer()
@@ -0,0 +1,99 @@
+import json
+import os
+import uuid
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, List, Optional
+
+import io_helper
+from logger import f, logger
+
+
+@dataclass
+class StoredFile:
+    # name given by the user (relative path inside a zip)
+    name: str
+    # sha256 of the content
+    digest: str
+    path: Path
+
+
+class UploadStore:
+    """
+    Uploaded files stored once per content : each file is written in chunks
+    under the hash of its content, identical uploads share the same file.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def store(self, src: BinaryIO, name: str) -> StoredFile:
+        """Stream 'src' to the store, hashed while written"""
+
+        path_tmp = self.root / f".{uuid.uuid4().hex}.part"
+        digest = io_helper.write_stream(src, path_dst=path_tmp)
+
+        path = self.root / (digest + Path(name).suffix.lower())
+        if path.exists():
+            os.remove(path_tmp)
+            os.utime(path)
+        else:
+            os.replace(path_tmp, path)
+            logger.info(f"Uploaded file stored {f(name=name, digest=digest)}")
+
+        return StoredFile(name=name, digest=digest, path=path)
+
+    def store_zip_members(self, path_zip: Path, exts: List[str]) -> List[StoredFile]:
+        """
+        Store the members of the zip with one of the extensions, one by one.
+        The members found are kept next to the zip : read once per zip content.
+
+        Raises:
+            zipfile.BadZipFile
+        """
+
+        path_index = path_zip.with_suffix(".members.json")
+        stored_files = _read_index(path_index)
+
+        # the members may have been removed since (unused for too long)
+        if stored_files is not None and all(sf.path.exists() for sf in stored_files):
+            return stored_files
+
+        stored_files = []
+        with zipfile.ZipFile(path_zip) as zf:
+            for member, name in io_helper.iter_zip_members(zf, exts):
+                with zf.open(member) as src:
+                    stored_files.append(self.store(src, name=name))
+
+        # written aside then moved, as the content : never read half-written
+        path_tmp = self.root / f".{uuid.uuid4().hex}.part"
+        with open(path_tmp, mode="w") as fp:
+            json.dump(
+                [
+                    {"name": sf.name, "digest": sf.digest, "path": str(sf.path)}
+                    for sf in stored_files
+                ],
+                fp,
+            )
+        os.replace(path_tmp, path_index)
+
+        return stored_files
+
+
+def _read_index(path_index: Path) -> Optional[List[StoredFile]]:
+    """None when missing or unreadable (e.g. truncated by a crash) : rebuilt"""
+
+    try:
+        with open(path_index, mode="r") as fp:
+            return [
+                StoredFile(name=m["name"], digest=m["digest"], path=Path(m["path"]))
+                for m in json.load(fp)
+            ]
+    except FileNotFoundError:
+        return None
+    except (KeyError, TypeError, ValueError) as e:
+        logger.info(f"Zip index unreadable, rebuilt {f(path=path_index, error=e)}")
+        return None
+
@@ -1,14 +1,47 @@
+import hashlib
+import io
 from pathlib import Path
+from typing import Optional, Union
 
-import numpy as np
 from PIL import Image
 
+# path of the image file or its encoded bytes
+TYPE_IMAGE = Union[Path, bytes]
 
-def images_equal(img1_path: Path, img2_path: Path) -> bool:
-    img1 = Image.open(img1_path)
-    img2 = Image.open(img2_path)
 
-    if img1.size != img2.size or img1.mode != img2.mode:
-        return False
+def image_digest(data: bytes) -> bytes:
+    return hashlib.sha256(data).digest()
 
-    return np.array_equal(np.array(img1), np.array(img2))
+
+def _read_bytes(img: TYPE_IMAGE) -> bytes:
+    return img if isinstance(img, bytes) else Path(img).read_bytes()
+
+
+def images_equal(
+    img1: TYPE_IMAGE,
+    img2: TYPE_IMAGE,
+    digest1: Optional[bytes] = None,
+    digest2: Optional[bytes] = None,
+) -> bool:
+    """
+    Same encoded bytes are equal without decoding anything,
+    otherwise the decoded pixels are compared (same image, other encoding).
+
+    Args:
+        digest1 (Optional[bytes]): 'image_digest' of img1 when already known
+        digest2 (Optional[bytes]): 'image_digest' of img2 when already known
+    """
+
+    data1 = _read_bytes(img1)
+    data2 = _read_bytes(img2)
+
+    # encodings
+    if (digest1 or image_digest(data1)) == (digest2 or image_digest(data2)):
+        return True
+
+    # pixels (the header is enough to compare size and mode)
+    with Image.open(io.BytesIO(data1)) as pil1, Image.open(io.BytesIO(data2)) as pil2:
+        if pil1.size != pil2.size or pil1.mode != pil2.mode:
+            return False
+
+        return pil1.tobytes() == pil2.tobytes()
@@ -1,6 +1,6 @@
 import os
 from pathlib import Path
-from typing import Callable, List
+from typing import Callable, List, Optional
 
 import tmp as tmp_module
 
@@ -30,3 +30,11 @@ SUPPORTED_FILES_EXT_EXTRACTION: List[str] = ["pdf", "txt"]
 
 # RUN PARAMETERS
 TEST_WITHOUT_INTERNET: bool = os.environ.get("TEST_WITHOUT_INTERNET") is not None
+
+# workspace : unused temporary files removed after this time, space they can take
+WORKSPACE_TTL_SECONDS: float = float(os.environ.get("WORKSPACE_TTL_SECONDS", 6 * 3600))
+WORKSPACE_QUOTA_BYTES: Optional[int] = (
+    int(os.environ["WORKSPACE_QUOTA_BYTES"])
+    if "WORKSPACE_QUOTA_BYTES" in os.environ
+    else None
+)
@@ -0,0 +1,222 @@
+import os
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from logger import f, logger
+from logs_label import WorkspaceQuotaExceeded
+
+# period of the background collection
+GC_INTERVAL_SECONDS = 10 * 60
+
+
+class Lease:
+    """Entries of the workspace in use (e.g. by a running job) : never collected"""
+
+    def __init__(self, workspace: "Workspace", entries: List[Path]):
+        self._workspace = workspace
+        self.entries = entries
+        self._released = False
+
+    def release(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        self._workspace._release(self.entries)
+
+    def __enter__(self) -> "Lease":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.release()
+
+
+class Workspace:
+    """
+    Temporary files of the app : one folder per job and the uploaded files.
+    An entry (a job folder, an uploaded file) is removed when it is not leased
+    and has not been used for 'ttl' seconds, or earlier, the least recently used
+    first, when space is needed under the quota.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        ttl: float,
+        quota: Optional[int] = None,
+    ):
+        self.root = root
+        self.ttl = ttl
+        self.quota = quota
+
+        self.path_jobs = root / "jobs"
+        self.path_uploads = root / "uploads"
+        os.makedirs(self.path_jobs, exist_ok=True)
+        os.makedirs(self.path_uploads, exist_ok=True)
+
+        # {entry: number of leases}
+        self._leases: Dict[Path, int] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    # ------------------- Entries -------------------
+
+    def create_job_dir(self, kind: str) -> Path:
+        path = self.path_jobs / f"{kind}-{uuid.uuid4().hex}"
+        os.makedirs(path)
+        return path
+
+    def touch(self, *paths: Path) -> None:
+        """The entries of the paths are used : their ttl starts again"""
+
+        for entry in self._entries_of(paths):
+            try:
+                os.utime(entry)
+            except FileNotFoundError:
+                pass
+
+    def lease(self, *paths: Path) -> Lease:
+        entries = self._entries_of(paths)
+        with self._lock:
+            for entry in entries:
+                self._leases[entry] = self._leases.get(entry, 0) + 1
+
+        self.touch(*entries)
+        return Lease(self, entries)
+
+    def _release(self, entries: List[Path]) -> None:
+        with self._lock:
+            for entry in entries:
+                self._leases[entry] -= 1
+                if self._leases[entry] == 0:
+                    del self._leases[entry]
+
+        # the ttl starts at the end of the use
+        self.touch(*entries)
+
+    # ------------------- Space -------------------
+
+    def usage(self) -> int:
+        return sum(size for _, _, size in self._iter_entries())
+
+    def reserve(self, nb_bytes: int) -> None:
+        """
+        Make room for 'nb_bytes' under the quota.
+
+        Raises:
+            WorkspaceQuotaExceeded
+        """
+
+        if self.quota is None:
+            return
+
+        nb_bytes_free = self.quota - self.usage()
+        if nb_bytes <= nb_bytes_free:
+            return
+
+        nb_bytes_free += self.collect(nb_bytes_needed=nb_bytes - nb_bytes_free)
+        if nb_bytes > nb_bytes_free:
+            raise WorkspaceQuotaExceeded(
+                nb_bytes_asked=nb_bytes, nb_bytes_free=nb_bytes_free
+            )
+
+    # ------------------- Garbage collection -------------------
+
+    def collect(self, nb_bytes_needed: int = 0) -> int:
+        """
+        Remove the expired entries, then the least recently used ones
+        until 'nb_bytes_needed' are freed.
+
+        Returns:
+            int: number of bytes freed
+        """
+
+        now = time.time()
+        nb_bytes_freed = 0
+        nb_removed = 0
+
+        for entry, mtime, size in sorted(self._iter_entries(), key=lambda e: e[1]):
+            if now - mtime < self.ttl and nb_bytes_freed >= nb_bytes_needed:
+                continue
+
+            # not leased in between
+            with self._lock:
+                if entry in self._leases:
+                    continue
+                _remove(entry)
+
+            nb_bytes_freed += size
+            nb_removed += 1
+
+        if nb_removed:
+            logger.info(
+                "Workspace collected "
+                + f(nb_removed=nb_removed, nb_bytes_freed=nb_bytes_freed)
+            )
+
+        return nb_bytes_freed
+
+    def start_collector(self, interval: float = GC_INTERVAL_SECONDS) -> None:
+        """Collect in a background thread, every 'interval' seconds"""
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.collect()
+                except Exception as e:
+                    logger.warning(f"Workspace collection failed : {e}")
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def stop_collector(self) -> None:
+        self._stop.set()
+
+    # ------------------- Private Method -------------------
+
+    def _entries_of(self, paths) -> List[Path]:
+        """The job folder or the uploaded file holding each path"""
+
+        entries = []
+        for path in paths:
+            for parent in (self.path_jobs, self.path_uploads):
+                if path.is_relative_to(parent) and path != parent:
+                    entries.append(parent / path.relative_to(parent).parts[0])
+                    break
+
+        return entries
+
+    def _iter_entries(self) -> Iterator[Tuple[Path, float, int]]:
+        """(entry, last use, size) of the entries, without the files being written"""
+
+        for parent in (self.path_jobs, self.path_uploads):
+            for name in os.listdir(parent):
+                if name.startswith("."):
+                    continue
+
+                entry = parent / name
+                try:
+                    yield entry, entry.lstat().st_mtime, _size(entry)
+                except FileNotFoundError:
+                    # removed in between
+                    continue
+
+
+def _size(path: Path) -> int:
+    if not path.is_dir() or path.is_symlink():
+        return path.lstat().st_size
+
+    return sum(
+        (Path(root) / name).lstat().st_size
+        for root, _, names in os.walk(path)
+        for name in names
+    )
+
+
+def _remove(path: Path) -> None:
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        path.unlink(missing_ok=True)
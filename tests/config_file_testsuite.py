@@ -13,7 +13,11 @@ from helper_testsuite import (
     wrapper_try,
 )
 
-from backend.config_file.config_file import fill_config_file, read_config_file
+from backend.config_file.config_file import (
+    fill_config_file,
+    load_config_file,
+    read_config_file,
+)
 from backend.config_file.info_page.read import (
     read_info_page,
     read_info_page_and_preprocess,
@@ -21,6 +25,7 @@ from backend.config_file.info_page.read import (
 )
 from backend.config_file.source_page import TYPE_SOURCES, read_source_page
 from backend.excel.excel_book import ExcelBook
+from backend.excel.excel_book_texts import ExcelBookTexts
 from backend.info_struct import ExtractionData, InfoExtractionDatas, InfoValues
 from logger import ERROR, logger
 from logs_label import (
@@ -63,9 +68,9 @@ SUB_FOLDER_INFO_PAGE = "read_config_file/info_page"
 # ------------------- Read sources -------------------
 
 
-def _read_sources(filename: str) -> TYPE_SOURCES:
+def _read_sources(filename: str, book_class=ExcelBook) -> TYPE_SOURCES:
     _, path_config_file = _from_folder_name_and_filename("sources", filename)
-    return read_source_page(ExcelBook(path_config_file))
+    return read_source_page(book_class(path_config_file))
 
 
 # def from_folder_name(folder_name: str) -> Tuple[Path, Path]:
@@ -86,9 +91,10 @@ def _read_sources(filename: str) -> TYPE_SOURCES:
         ("gap", {"o1": "1.txt"}),
     ],
 )
-def test_read_source_page_good(filename: str, expected_sources: dict):
+@pytest.mark.parametrize("book_class", [ExcelBook, ExcelBookTexts])
+def test_read_source_page_good(filename: str, expected_sources: dict, book_class):
     def f():
-        sources = _read_sources(filename)
+        sources = _read_sources(filename, book_class)
         assert sources == expected_sources
 
     wrapper_test_good(f)
@@ -114,12 +120,14 @@ def test_read_source_page_good(filename: str, expected_sources: dict):
         # duplicated names
     ],
 )
+@pytest.mark.parametrize("book_class", [ExcelBook, ExcelBookTexts])
 def test_read_source_page_wrong(
     filename: str,
     expected_log_label_class: TYPE_EXPECTED_LOG_LABEL_CLASS,
+    book_class,
 ):
     wrapper_test_logs(
-        runnable=lambda: _read_sources(filename),
+        runnable=lambda: _read_sources(filename, book_class),
         expected_log_label_class=expected_log_label_class,
     )
 
@@ -141,11 +149,13 @@ def test_read_source_page_raise(
 # ------------------- Read info page -------------------
 
 
-def _read_infos(filename: str, folder: str) -> List[ExtractionData]:
+def _read_infos(
+    filename: str, folder: str, book_class=ExcelBook
+) -> List[ExtractionData]:
     _, path_config_file = _from_folder_name_and_filename(
         f"read_config_file/info_page/{folder}", filename
     )
-    return read_info_page(ExcelBook(path_config_file))
+    return read_info_page(book_class(path_config_file))
 
 
 @pytest.mark.parametrize(
@@ -304,9 +314,12 @@ def _read_infos(filename: str, folder: str) -> List[ExtractionData]:
         ),
     ],
 )
-def test_read_info_page_good(filename: str, expected_infos: List[ExtractionData]):
+@pytest.mark.parametrize("book_class", [ExcelBook, ExcelBookTexts])
+def test_read_info_page_good(
+    filename: str, expected_infos: List[ExtractionData], book_class
+):
     def f():
-        sources = _read_infos(filename, "good")
+        sources = _read_infos(filename, "good", book_class)
         assert sources == expected_infos
 
     wrapper_test_good(f)
@@ -384,13 +397,15 @@ def test_read_info_page_partial_good(
         ("names_duplicated_between_ind_and_lst", NameDuplicated, 1),
     ],
 )
+@pytest.mark.parametrize("book_class", [ExcelBook, ExcelBookTexts])
 def test_read_info_page_wrong(
     filename: str,
     expected_log_label_class: TYPE_EXPECTED_LOG_LABEL_CLASS,
     nb_expected_info: int,
+    book_class,
 ):
     def f():
-        eds = _read_infos(filename, "wrong")
+        eds = _read_infos(filename, "wrong", book_class)
         assert len(eds) == nb_expected_info
 
     wrapper_test_logs(
@@ -499,11 +514,11 @@ def test_read_info_page_preprocess_all(filename):
 # ------------------- Read info page info values -------------------
 
 
-def _read_infos_values(filename: str) -> InfoValues:
+def _read_infos_values(filename: str, book_class=ExcelBook) -> InfoValues:
     _, path_config_file = _from_folder_name_and_filename(
         f"{SUB_FOLDER_INFO_PAGE}/good", filename
     )
-    return read_info_values(ExcelBook(path_config_file))
+    return read_info_values(book_class(path_config_file))
 
 
 @pytest.mark.parametrize(
@@ -542,11 +557,12 @@ def _read_infos_values(filename: str) -> InfoValues:
         ),
     ],
 )
+@pytest.mark.parametrize("book_class", [ExcelBook, ExcelBookTexts])
 def test_read_info_page_values(
-    filename: str, expected_infos: Dict[str, InfoExtractionDatas]
+    filename: str, expected_infos: Dict[str, InfoExtractionDatas], book_class
 ):
     def f():
-        infos = _read_infos_values(filename)
+        infos = _read_infos_values(filename, book_class)
         logger.filter_logs(EmptynessExcelCell)
 
         assert infos == expected_infos
@@ -639,7 +655,9 @@ def test_read_config_file_raise():
 # ------------------- Fill config file -------------------
 
 
-def _fill_config_file(filename: str, folder: str, infos: InfoValues) -> None:
+def _fill_config_file(
+    filename: str, folder: str, infos: InfoValues, with_texts: bool = False
+) -> None:
     folder_name = f"fill_config_file/{folder}"
     _, path_config_file = _from_folder_name_and_filename(
         filename=filename, folder_name=folder_name
@@ -649,6 +667,7 @@ def _fill_config_file(filename: str, folder: str, infos: InfoValues) -> None:
         path_config_file=path_config_file,
         infos=infos,
         path_output=output_path,
+        texts=load_config_file(path_config_file) if with_texts else None,
     )
     return output_path
 
@@ -731,9 +750,12 @@ def _excel_equals(path1: Path, path2: Path) -> bool:
         ),
     ],
 )
-def test_fill_config_file_good(filename: str, infos_values: InfoValues):
+@pytest.mark.parametrize("with_texts", [False, True])
+def test_fill_config_file_good(filename: str, infos_values: InfoValues, with_texts: bool):
 
-    actual_path = _fill_config_file(filename, folder="good", infos=infos_values)
+    actual_path = _fill_config_file(
+        filename, folder="good", infos=infos_values, with_texts=with_texts
+    )
     expected_path = (
         PATH_TEST_DOCS_TESTSUITE / f"fill_config_file/good/{filename}_expected.xlsx"
     )
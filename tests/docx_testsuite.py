@@ -1,3 +1,4 @@
+import io
 import os
 from pathlib import Path
 from typing import Dict, Tuple
@@ -7,12 +8,14 @@ from docx import Document as OpenDocument
 from docx.table import Table
 from docx.text.paragraph import Paragraph
 from helper_testsuite import biv, wrapper_test_good, wrapper_try
+from PIL import Image
 
 from backend.generation.replace_text import build_replace_text
 from backend.my_docx.docx_helper import docx_equals, normalize_runs, paragraph_equals
 from backend.my_docx.docx_table import DocxTable
 from backend.my_docx.my_docx import Docx
 from logs_label import DuplicatesNameAfterHarmonization
+from utils.image import images_equal
 from vars import PATH_TEST_DOCS_TESTSUITE
 
 # ------------------- Equals -------------------
@@ -26,7 +29,8 @@ filenames_equals = [
 
 
 @pytest.mark.parametrize(("filename"), filenames_equals)
-def test_not_equals(filename: str):
+@pytest.mark.parametrize(("fast"), [True, False])
+def test_not_equals(filename: str, fast: bool):
     path_folder = PATH_TEST_DOCS_TESTSUITE / "docx/not_equals"
     path1 = path_folder / filename
     path2 = path_folder / f"{Path(filename).stem}_not.docx"
@@ -34,7 +38,7 @@ def test_not_equals(filename: str):
     def runnable():
         d1 = Docx(path1)
         d2 = Docx(path2)
-        assert not docx_equals(d1, d2)
+        assert not docx_equals(d1, d2, fast=fast)
 
     wrapper_test_good(runnable=runnable)
 
@@ -53,7 +57,8 @@ def test_equals(filename: str):
 
 
 @pytest.mark.parametrize(("filename1", "filename2"), [("split_run", "split_run_not")])
-def test_equals(filename1: str, filename2: str):
+@pytest.mark.parametrize(("fast"), [True, False])
+def test_equals(filename1: str, filename2: str, fast: bool):
     path_folder = PATH_TEST_DOCS_TESTSUITE / "docx/equals"
     path1 = path_folder / f"{filename1}.docx"
     path2 = path_folder / f"{filename2}.docx"
@@ -61,11 +66,33 @@ def test_equals(filename1: str, filename2: str):
     def runnable():
         d1 = Docx(path1)
         d2 = Docx(path2)
-        assert docx_equals(d1, d2)
+        assert docx_equals(d1, d2, fast=fast)
 
     wrapper_test_good(runnable=runnable)
 
 
+def _encode_image(color: Tuple[int, int, int], format: str) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (4, 4), color).save(buffer, format=format)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize(
+    ("color2", "format2", "expected"),
+    [
+        ((255, 0, 0), "PNG", True),
+        ((255, 0, 0), "BMP", True),
+        ((0, 255, 0), "PNG", False),
+        ((0, 255, 0), "BMP", False),
+    ],
+)
+def test_images_equal(color2: Tuple[int, int, int], format2: str, expected: bool):
+    assert (
+        images_equal(_encode_image((255, 0, 0), "PNG"), _encode_image(color2, format2))
+        == expected
+    )
+
+
 # ------------------- Merge -------------------
 
 
@@ -320,3 +347,34 @@ def test_copy_rectanble_table(
 #         _, table = _extract_first_table(path)
 
 #     wrapper_test_good(runnable=runnable)
+
+
+@pytest.mark.parametrize(
+    ("filename", "start_row", "end_row", "amount"),
+    [("copy_rectangle1", 1, 2, 2), ("copy_rectangle2", 2, 2, 3)],
+)
+def test_duplicate_rows_table(filename: str, start_row: int, end_row: int, amount: int):
+
+    path = PATH_TEST_DOCS_TESTSUITE / f"docx/table/{filename}.docx"
+
+    def runnable():
+        _, table = _extract_first_table(path)
+        rows, cols = table.get_dimensions()
+        block = [
+            [table.get_cell(row, col).str for col in range(2, cols + 1)]
+            for row in range(start_row, end_row + 1)
+        ]
+
+        table.duplicate_rows(start_row, end_row, amount=amount, from_col=2)
+
+        nb_row = end_row - start_row + 1
+        assert table.get_dimensions() == (rows + nb_row * amount, cols)
+        for idx in range(1, amount + 1):
+            for offset, texts in enumerate(block):
+                row = end_row + 1 + (idx - 1) * nb_row + offset
+                assert table.get_cell(row, 1).str == ""
+                assert [
+                    table.get_cell(row, col).str for col in range(2, cols + 1)
+                ] == texts
+
+    wrapper_test_good(runnable=runnable)
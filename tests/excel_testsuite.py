@@ -1,10 +1,16 @@
 import os
+from pathlib import Path
+from typing import List, Optional, Tuple
 
 import pytest
 from helper_testsuite import wrapper_test_good
+from openpyxl import Workbook
+from openpyxl.styles.fills import PatternFill
+from openpyxl.styles.fonts import Font
 
 from backend.excel.excel_book import ExcelBook
-from backend.excel.excel_sheet_equality import equals_cell
+from backend.excel.excel_sheet_equality import equals_cell, sheet_fingerprint
+from backend.table.table_base import TableBase
 from logger import f, logger
 from vars import PATH_TEST_DOCS_TESTSUITE
 
@@ -29,6 +35,30 @@ def test_get_cell(filename: str, text_expected: str):
     wrapper_test_good(runnable=g)
 
 
+def test_get_cell_lazy_style():
+    path = PATH_TEST_DOCS_TESTSUITE / "excel/get_cell/cell_rich_text.xlsx"
+
+    def g():
+        es = ExcelBook(path).first_es
+        nb_cells = len(es.ws._cells)
+
+        # reading an empty coordinate does not create it
+        cell = es.get_cell(row=1000, col=1000)
+        assert cell.str is None and not cell.has_style
+        assert es.get_text_cell(row=1000, col=1000) is None
+        assert len(es.ws._cells) == nb_cells
+
+        # the view follows the sheet, the snapshot does not
+        view = es.get_cell(row=1, col=1)
+        snapshot = es.get_cell(row=1, col=1, copy=True)
+        bold = snapshot.font.b
+        es.ws.cell(1, 1).font = Font(b=not bold)
+        assert view.font.b == (not bold)
+        assert snapshot.font.b == bold
+
+    wrapper_test_good(runnable=g)
+
+
 # ------------------- Equals -------------------
 
 
@@ -78,6 +108,47 @@ def test_equals_with_himself(filename: str):
     assert ExcelBook(path).equals(ExcelBook(path))
 
 
+@pytest.mark.parametrize(
+    ("filename", "same"),
+    [
+        ("bold", True),
+        ("bold_not", False),
+        ("color_text_not", False),
+        ("border_not", False),
+        ("rich_cell_text_not", False),
+    ],
+)
+def test_sheet_fingerprint(filename: str, same: bool):
+    path_folder = PATH_TEST_DOCS_TESTSUITE / "excel/equals"
+    es1 = ExcelBook(path_folder / f"{filename.removesuffix('_not')}.xlsx").first_es
+    es2 = ExcelBook(path_folder / f"{filename}.xlsx").first_es
+
+    max_row = min(es1.get_row_dimension(), es2.get_row_dimension())
+    max_col = min(es1.get_col_dimension(), es2.get_col_dimension())
+    fp1 = sheet_fingerprint(es1, max_row=max_row, max_col=max_col)
+    fp2 = sheet_fingerprint(es2, max_row=max_row, max_col=max_col)
+
+    assert (fp1.digest == fp2.digest) == same
+    assert (fp1.rows == fp2.rows) == same
+
+
+def test_sheet_fingerprint_stored_empty_cells():
+    path = PATH_TEST_DOCS_TESTSUITE / "excel/equals/bold.xlsx"
+    es1 = ExcelBook(path).first_es
+    es2 = ExcelBook(path).first_es
+
+    # stored in the second sheet only, without value nor style
+    max_row = es1.get_row_dimension()
+    max_col = es1.get_col_dimension()
+    for row in range(1, max_row + 1):
+        for col in range(1, max_col + 1):
+            es2.ws.cell(row=row, column=col)
+
+    fp1 = sheet_fingerprint(es1, max_row=max_row, max_col=max_col)
+    fp2 = sheet_fingerprint(es2, max_row=max_row, max_col=max_col)
+    assert fp1 == fp2
+
+
 # ------------------- Copy -------------------
 
 
@@ -136,3 +207,194 @@ def test_copy_cell_rectangle(filename: str):
         assert eb.equals(ExcelBook(path_excel=path_expected))
 
     wrapper_test_good(runnable=runnable)
+
+
+@pytest.mark.parametrize(
+    ("filename", "start_row", "end_row", "amount", "from_col"),
+    [("rectangle", 1, 2, 2, 1), ("rectangle", 1, 1, 3, 2)],
+)
+def test_duplicate_rows(
+    filename: str, start_row: int, end_row: int, amount: int, from_col: int
+):
+
+    path_input = PATH_TEST_DOCS_TESTSUITE / "excel" / "copy" / f"{filename}.xlsx"
+
+    def runnable():
+        # bulk copy
+        eb = ExcelBook(path_excel=path_input)
+        eb.first_es.duplicate_rows(start_row, end_row, amount, from_col=from_col)
+
+        # cell by cell copy
+        eb_expected = ExcelBook(path_excel=path_input)
+        TableBase.duplicate_rows(
+            eb_expected.first_es, start_row, end_row, amount, from_col=from_col
+        )
+
+        # equals
+        assert eb.equals(eb_expected)
+
+    wrapper_test_good(runnable=runnable)
+
+
+@pytest.mark.parametrize(
+    ("filename", "blocks", "from_col"),
+    [
+        ("rectangle", [(1, 1, 2), (3, 4, 1)], 1),
+        ("rectangle", [(3, 3, 3), (1, 2, 1)], 1),
+        ("rectangle", [(1, 2, 0), (4, 4, 2)], 2),
+    ],
+)
+def test_expand_row_blocks(
+    filename: str, blocks: List[Tuple[int, int, int]], from_col: int
+):
+
+    path_input = PATH_TEST_DOCS_TESTSUITE / "excel" / "copy" / f"{filename}.xlsx"
+
+    def runnable():
+        # one pass
+        eb = ExcelBook(path_excel=path_input)
+        eb.first_es.expand_row_blocks(blocks, from_col=from_col)
+
+        # block by block
+        eb_expected = ExcelBook(path_excel=path_input)
+        TableBase.expand_row_blocks(eb_expected.first_es, blocks, from_col=from_col)
+
+        # equals
+        assert eb.equals(eb_expected)
+
+    wrapper_test_good(runnable=runnable)
+
+
+def _write_styled_rows(path: Path, rows: List[Tuple[Optional[str], ...]]) -> Path:
+    """The style follows the value : bold for the 'h*', filled for the 'a' and 'b'"""
+
+    wb = Workbook()
+    for idx_row, row in enumerate(rows, start=1):
+        for idx_col, value in enumerate(row, start=1):
+            if value is None:
+                continue
+            cell = wb.active.cell(row=idx_row, column=idx_col, value=value)
+            if value.startswith("h"):
+                cell.font = Font(b=True)
+            if value in ("a", "b"):
+                cell.fill = PatternFill("solid", fgColor="FFFF00")
+    wb.save(path)
+    return path
+
+
+@pytest.mark.parametrize(
+    ("method", "args", "rows_expected"),
+    [
+        (
+            "expand_row_blocks",
+            ([(2, 2, 2), (3, 4, 1)],),
+            [
+                ("h1", "h2"),
+                ("a", "b"),
+                ("a", "b"),
+                ("a", "b"),
+                ("c", "d"),
+                ("e", None),
+                ("c", "d"),
+                ("e", None),
+            ],
+        ),
+        (
+            "duplicate_rows",
+            (2, 3, 1, 2),
+            [
+                ("h1", "h2"),
+                ("a", "b"),
+                ("c", "d"),
+                (None, "b"),
+                (None, "d"),
+                ("e", None),
+            ],
+        ),
+    ],
+)
+def test_row_copies_expected(tmp_path: Path, method: str, args, rows_expected):
+
+    rows = [("h1", "h2"), ("a", "b"), ("c", "d"), ("e", None)]
+    path_input = _write_styled_rows(tmp_path / "input.xlsx", rows)
+    path_expected = _write_styled_rows(tmp_path / "expected.xlsx", rows_expected)
+
+    def runnable():
+        eb = ExcelBook(path_excel=path_input)
+        getattr(eb.first_es, method)(*args)
+        eb.save(tmp_path / "actual.xlsx")
+
+        assert ExcelBook(tmp_path / "actual.xlsx").equals(ExcelBook(path_expected))
+
+    wrapper_test_good(runnable=runnable)
+
+
+@pytest.mark.parametrize(
+    ("filename", "start_row", "end_row", "from_col"),
+    [("rectangle", 3, 4, 1), ("rectangle", 3, 3, 2)],
+)
+def test_repeat_block(filename: str, start_row: int, end_row: int, from_col: int):
+
+    path_input = PATH_TEST_DOCS_TESTSUITE / "excel" / "copy" / f"{filename}.xlsx"
+    replace_texts = [
+        lambda s: (s, 0),
+        lambda s: (s.upper(), 1),
+        lambda s: (s * 2, 1),
+    ]
+
+    def runnable():
+        # one pass
+        eb = ExcelBook(path_excel=path_input)
+        nb_changes = eb.first_es.repeat_block(
+            start_row, end_row, replace_texts, from_col=from_col
+        )
+
+        # duplicate then replace
+        eb_expected = ExcelBook(path_excel=path_input)
+        nb_changes_expected = TableBase.repeat_block(
+            eb_expected.first_es, start_row, end_row, replace_texts, from_col=from_col
+        )
+
+        # equals
+        assert nb_changes == nb_changes_expected
+        assert eb.equals(eb_expected)
+
+    wrapper_test_good(runnable=runnable)
+
+
+# ------------------- Iteration -------------------
+
+
+@pytest.mark.parametrize(
+    ("folder", "filename", "min_row", "min_col", "max_col"),
+    [
+        ("generation/xlsx", "ind", 1, 1, None),
+        ("generation/xlsx", "list_two_elements", 1, 2, None),
+        ("generation/xlsx", "list_two_elements", 2, 1, 1),
+        ("excel/copy", "rectangle", 3, 2, 4),
+    ],
+)
+def test_iter_cells(
+    folder: str, filename: str, min_row: int, min_col: int, max_col: int
+):
+
+    path_input = PATH_TEST_DOCS_TESTSUITE / folder / f"{filename}.xlsx"
+
+    def runnable():
+        es = ExcelBook(path_excel=path_input).first_es
+        nb_cells = len(es.ws._cells)
+
+        # only the stored cells
+        cells = list(es.iter_cells(min_row=min_row, min_col=min_col, max_col=max_col))
+        assert len(es.ws._cells) == nb_cells
+
+        # every coordinate
+        cells_expected = list(
+            TableBase.iter_cells(es, min_row=min_row, min_col=min_col, max_col=max_col)
+        )
+
+        assert [(c.row, c.col, c.str) for c in cells] == [
+            (c.row, c.col, c.str) for c in cells_expected
+        ]
+
+    wrapper_test_good(runnable=runnable)
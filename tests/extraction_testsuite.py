@@ -1,4 +1,7 @@
+import io
 import os
+import threading
+import zipfile
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
@@ -22,9 +25,19 @@ from backend.extraction.extract_info_from_natural_language import (
     extract_info_from_natural_language,
 )
 from backend.extraction.extract_info_from_pdf import extract_info_from_pdf
+from backend.extraction.manifest import ExtractionManifest
 from backend.info_struct import InfoExtractionDatas, InfoValues
 from backend.llm.llm_test import LlmTest
-from logger import ERROR, logger
+from logger import (
+    DEBUG,
+    ERROR,
+    INFO,
+    MAX_LEN_TEXT,
+    Log,
+    LogStore,
+    lazy,
+    logger,
+)
 from logs_label import (
     ExtensionFileNotSupported,
     ExtractionNotFoundInfo,
@@ -32,12 +45,152 @@ from logs_label import (
     LlmFailedAnswer,
     PathNotExisting,
 )
+from progress import Progress
+from upload_store import UploadStore
 from vars import PATH_TEST_DOCS_TESTSUITE
 
 # ------------------- Utils -------------------
 
 PATH_DIR_TESTS = PATH_TEST_DOCS_TESTSUITE / "extraction"
 
+# ------------------- Info values -------------------
+
+
+def test_info_values_names():
+    infos = biv(
+        inds={"n1": "v1", "n2": None, "n3": "v3"},
+        lists={
+            "l1": [{"s1": "v4", "s2": None}, {"s1": None, "s2": "v5"}],
+            "l2": [{"s1": "v6"}],
+        },
+    )
+
+    assert infos.get_names(keep_none_values=False) == [
+        "n1",
+        "n3",
+        ("l1", "s1"),
+        ("l1", "s2"),
+        ("l2", "s1"),
+    ]
+    assert infos.get_names(keep_none_values=True)[:3] == ["n1", "n2", "n3"]
+    assert infos.get_name_nones() == ["n2", ("l1", "s2"), ("l1", "s1")]
+    assert infos.count_values() == 5
+
+    infos.filter_names(["n1", "l1", ("l2", "s1")])
+    assert infos == biv(inds={"n2": None, "n3": "v3"}, lists={"l2": [{"s1": "v6"}]})
+    assert infos.count_values() == 2
+
+
+# ------------------- Logs -------------------
+
+
+def test_log_store():
+
+    store = LogStore(max_logs_per_level=2)
+    for idx in range(3):
+        store.append(Log(level="INFO", msg=f"info {idx}", label=None))
+        store.append(Log(level="ERROR", msg=f"error {idx}", label=None))
+
+    # the oldest logs of each level are dropped, the order is kept
+    assert store.nb_dropped == 2
+    assert [log.msg for log in store.get(DEBUG)] == [
+        "info 1",
+        "error 1",
+        "info 2",
+        "error 2",
+    ]
+    assert [log.msg for log in store.get(ERROR)] == ["error 1", "error 2"]
+
+    store.remove(lambda log: log.level == "INFO")
+    assert [log.msg for log in store.get(INFO)] == ["error 1", "error 2"]
+
+
+def test_logs_truncated_and_per_context():
+
+    logger.reset_logs()
+
+    text = "a" * (2 * MAX_LEN_TEXT)
+    logger.warning(text, extra=LlmFailedAnswer(info_to_extract=bied(), text=text))
+
+    (log,) = logger.get_logs()
+    assert len(log.msg) < len(text)
+    assert log.label.text == log.msg
+
+    # a thread without a run of its own does not see the logs of this one
+    logs_thread = []
+    thread = threading.Thread(target=lambda: logs_thread.extend(logger.get_logs()))
+    thread.start()
+    thread.join()
+    assert log not in logs_thread
+
+    logger.reset_logs()
+
+
+def test_logs_lazy_formatting():
+
+    calls = []
+
+    def build(name: str) -> str:
+        calls.append(name)
+        return name
+
+    level = logger.level
+    logger.reset_logs()
+    try:
+        # not built when the debug logs are filtered out
+        logger.setLevel(INFO)
+        assert not logger.is_debug()
+        logger.debug("skipped : %s", lazy(build, "skipped"))
+        assert calls == []
+
+        logger.setLevel(DEBUG)
+        assert logger.is_debug()
+        logger.debug("kept : %s", lazy(build, "kept"))
+        assert calls == ["kept"]
+        assert [log.msg for log in logger.get_logs()] == ["kept : kept"]
+    finally:
+        logger.setLevel(level)
+        logger.reset_logs()
+
+
+# ------------------- Uploads -------------------
+
+
+def test_upload_store(tmp_path: Path):
+
+    store = UploadStore(root=tmp_path / "uploads")
+
+    # same content, stored once
+    sf1 = store.store(io.BytesIO(b"content"), name="a.TXT")
+    sf2 = store.store(io.BytesIO(b"content"), name="b.txt")
+    assert sf1.path == sf2.path
+    assert sf1.path.suffix == ".txt"
+    assert sf1.path.read_bytes() == b"content"
+    assert (sf1.name, sf2.name) == ("a.TXT", "b.txt")
+
+    # only the supported members of the zip, inside the folder
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, mode="w") as zf:
+        zf.writestr("folder/doc.txt", "content")
+        zf.writestr("folder/image.png", "not extracted")
+        zf.writestr("__MACOSX/folder/._doc.txt", "hidden")
+        zf.writestr("../outside.txt", "zip slip")
+    buffer.seek(0)
+
+    path_zip = store.store(buffer, name="docs.zip").path
+    for _ in range(2):
+        members = store.store_zip_members(path_zip, exts=["pdf", "txt"])
+        assert [(m.name, m.path) for m in members] == [("folder/doc.txt", sf1.path)]
+
+    assert len(os.listdir(store.root)) == 3  # content, zip and its members index
+
+    # a truncated index (crash, full disk) is rebuilt
+    path_zip.with_suffix(".members.json").write_text('[{"name": "fol')
+    members = store.store_zip_members(path_zip, exts=["pdf", "txt"])
+    assert [(m.name, m.path) for m in members] == [("folder/doc.txt", sf1.path)]
+    assert len(os.listdir(store.root)) == 3
+
+
 # ------------------- From natural language -------------------
 
 
@@ -150,6 +303,29 @@ def test_from_pdf_good(
     wrapper_test_good(runnable=f)
 
 
+def test_from_txt_progress():
+
+    llm = LlmTest()
+    path_txt = PATH_DIR_TESTS / "n1_v1.txt"
+    ied = bied(inds=[bed(name="n1"), bed(name="n2", exact=True)])
+    progresses: List[Progress] = []
+
+    extract_from_txt(
+        llm=llm,
+        path_txt=path_txt,
+        info_to_extract=ied,
+        on_progress=progresses.append,
+    )
+
+    # one call for the short infos, one for the exact one
+    assert [(p.stage, p.done, p.total) for p in progresses] == [
+        ("llm call", 0, 2),
+        ("llm call", 1, 2),
+        ("llm call", 2, 2),
+    ]
+    assert progresses[-1].ratio == 1.0
+
+
 @pytest.mark.parametrize(
     ["ied", "pdf_filename", "force_answer", "expected", "expected_log_label_class"],
     [
@@ -333,6 +509,7 @@ def test_from_config_file_and_files_tree_good(
             path_config_file=paths.config_file,
             path_folder_sources=paths.folder_sources,
             path_folder_output=paths.folder_config_file,
+            incremental=False,
         )
         actual = ExcelBook(path_config_file_filled)
         assert actual.equals(expected)
@@ -349,6 +526,57 @@ def test_from_config_file_and_files_tree_good(
         os.environ.pop("TEST_WITHOUT_INTERNET")
 
 
+def test_from_config_file_and_files_tree_incremental(monkeypatch, tmp_path: Path):
+
+    paths = _get_config_paths(
+        folder_config_file="config_file",
+        config_file_name="multiple_sources",
+        folder_sources_name="./",
+    )
+    path_manifest = tmp_path / "multiple_sources_rempli.manifest.json"
+    expected = ExcelBook(paths.config_file_expected)
+
+    # count the calls to the llm
+    nb_calls = []
+    create_message = LlmTest.create_message
+
+    def create_message_counted(self, *args, **kwargs):
+        nb_calls.append(None)
+        return create_message(self, *args, **kwargs)
+
+    monkeypatch.setattr(LlmTest, "create_message", create_message_counted)
+
+    def extract() -> Path:
+        return extract_infos_from_config_file_and_files_tree(
+            path_config_file=paths.config_file,
+            path_folder_sources=paths.folder_sources,
+            path_folder_output=tmp_path,
+        )
+
+    def f():
+        path_manifest.unlink(missing_ok=True)
+
+        # first run
+        extract()
+        nb_calls_first = len(nb_calls)
+        assert nb_calls_first > 0
+
+        # nothing changed : nothing extracted
+        assert ExcelBook(extract()).equals(expected)
+        assert len(nb_calls) == nb_calls_first
+
+        # one definition changed : only its source is called
+        manifest = ExtractionManifest.load(path_manifest)
+        source = next(iter(manifest.sources.values()))
+        next(iter(source.independant_infos.values())).fingerprint = "changed"
+        manifest.save()
+
+        assert ExcelBook(extract()).equals(expected)
+        assert len(nb_calls) == nb_calls_first + 1
+
+    wrapper_test_good(f)
+
+
 @pytest.mark.parametrize(
     ["folder_sources_name", "expected_log_label_class"],
     (
@@ -378,6 +606,7 @@ def test_from_config_file_and_files_tree_good_claude(
             path_config_file=paths.config_file,
             path_folder_sources=paths.folder_sources,
             path_folder_output=paths.folder_config_file,
+            incremental=False,
         )
         actual = ExcelBook(path_config_file_filled)
         assert actual.equals(expected)
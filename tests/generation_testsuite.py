@@ -1,3 +1,10 @@
+import json
+import os
+import shutil
+import threading
+import time
+import zipfile
+from dataclasses import replace
 from pathlib import Path
 from typing import Dict
 
@@ -6,14 +13,32 @@ from helper_testsuite import biv, wrapper_test_good, wrapper_try
 
 from backend.excel.excel_book import ExcelBook
 from backend.generation.fill_docx import fill_template_docx
+from backend.generation.fill_docx_xml import (
+    compile_template_docx,
+    fill_template_docx_compiled,
+    fill_template_docx_xml,
+)
 from backend.generation.fill_excel import fill_template_excel
-from backend.generation.fill_template import fill_template
+from backend.generation.fill_template import fill_template, fill_templates_batch
+from backend.generation.pdf_export import PdfConverterPool
 from backend.generation.replace_text import replace_text
 from backend.info_struct import InfoValues
 from backend.my_docx.docx_helper import docx_equals
 from backend.my_docx.my_docx import Docx
-from logs_label import DuplicatesNameAfterHarmonization
+from job_queue import JobQueue, JobStatus
+from logger import logger
+from logs_label import (
+    BatchGenerationWrongInputs,
+    DuplicatesNameAfterHarmonization,
+    EmptynessExcelCell,
+    MergeListNotExisting,
+    PdfExportFailed,
+    WorkspaceQuotaExceeded,
+)
+from progress import Progress
+from timing import timer
 from vars import PATH_TEST_DOCS_TESTSUITE
+from workspace import Workspace
 
 # ------------------- Replace text -------------------
 
@@ -159,7 +184,15 @@ def test_replace_text_raise():
         ("list_sin_table_empty_infos", biv(lists={})),
     ],
 )
-def test_fill_docx(filename: str, infos: InfoValues):
+@pytest.mark.parametrize(
+    ["fill_template_docx_func"],
+    [
+        (fill_template_docx,),
+        (fill_template_docx_xml,),
+        (fill_template_docx_compiled,),
+    ],
+)
+def test_fill_docx(filename: str, infos: InfoValues, fill_template_docx_func):
 
     path = PATH_TEST_DOCS_TESTSUITE / "generation/docx"
     path_input = path / f"{filename}.docx"
@@ -167,7 +200,7 @@ def test_fill_docx(filename: str, infos: InfoValues):
     path_expected = path / f"{filename}_expected.docx"
 
     def f():
-        fill_template_docx(
+        fill_template_docx_func(
             template_path=path_input, infos=infos, path_output=path_output
         )
         assert docx_equals(d1=Docx(path_output), d2=Docx(path_expected))
@@ -175,6 +208,41 @@ def test_fill_docx(filename: str, infos: InfoValues):
     wrapper_test_good(runnable=f)
 
 
+def test_fill_docx_compiled_reused():
+
+    path = PATH_TEST_DOCS_TESTSUITE / "generation/docx"
+    path_input = path / "list_sin_table_two_lists.docx"
+    path_expected = path / "list_sin_table_two_lists_expected.docx"
+    infos = biv(
+        lists={
+            "n1": [{"s1": "v1"}, {"s1": "v2"}],
+            "n2": [{"s1": "v3"}, {"s1": "v4"}],
+        }
+    )
+
+    def f():
+        compiled = compile_template_docx(path_input)
+        assert compiled.path_docx.exists()
+
+        # the second generation reuses the persisted compiled template
+        for idx in range(2):
+            path_output = path / f"list_sin_table_two_lists_actual{idx}.docx"
+            fill_template_docx_compiled(
+                template_path=path_input, infos=infos, path_output=path_output
+            )
+            assert docx_equals(d1=Docx(path_output), d2=Docx(path_expected))
+
+        assert compile_template_docx(path_input) == compiled
+
+        # partial or compiled by another version : compiled again
+        path_json = compiled.path_docx.with_suffix(".json")
+        for content in ["", json.dumps({"version": 0}), "[]"]:
+            path_json.write_text(content)
+            assert compile_template_docx(path_input) == compiled
+
+    wrapper_test_good(runnable=f)
+
+
 # ------------------- Excel -------------------
 
 
@@ -258,3 +326,370 @@ def test_fill_template_general(template_filename: str):
             assert False
 
     wrapper_test_good(runnable=runnable)
+
+
+def test_fill_templates_batch():
+
+    path = PATH_TEST_DOCS_TESTSUITE / "generation/general"
+
+    def runnable():
+        path_zip = fill_templates_batch(
+            infos_path_files=[path / "excel_ind_config_file.xlsx"],
+            template_paths=[path / "excel_ind.xlsx"],
+            path_folder_output=path,
+            max_workers=1,
+        )
+
+        with zipfile.ZipFile(path_zip) as z:
+            assert z.namelist() == ["excel_ind_généré.xlsx"]
+
+        assert ExcelBook(path / "excel_ind_généré.xlsx").equals(
+            ExcelBook(path / "excel_ind_expected.xlsx")
+        )
+
+    wrapper_test_good(runnable=runnable)
+
+
+def test_fill_templates_batch_same_names(tmp_path: Path):
+
+    path = PATH_TEST_DOCS_TESTSUITE / "generation/general"
+
+    # two templates named the same, in different folders
+    template_paths = []
+    for folder in ("a", "b"):
+        os.makedirs(tmp_path / folder)
+        template_paths.append(
+            Path(shutil.copy(path / "excel_ind.xlsx", tmp_path / folder))
+        )
+
+    def runnable():
+        path_zip = fill_templates_batch(
+            infos_path_files=[path / "excel_ind_config_file.xlsx"],
+            template_paths=template_paths,
+            path_folder_output=tmp_path,
+            max_workers=1,
+        )
+
+        with zipfile.ZipFile(path_zip) as z:
+            assert sorted(z.namelist()) == [
+                "excel_ind_généré.xlsx",
+                "excel_ind_généré_2.xlsx",
+            ]
+
+    wrapper_test_good(runnable=runnable)
+
+
+def test_fill_templates_batch_timings():
+
+    path = PATH_TEST_DOCS_TESTSUITE / "generation/general"
+
+    def runnable():
+        timer.reset()
+        with timer.span("batch", nb=1):
+            timer.annotate(label="test")
+            fill_templates_batch(
+                infos_path_files=[path / "excel_ind_config_file.xlsx"],
+                template_paths=[path / "excel_ind.xlsx"],
+                path_folder_output=path,
+                max_workers=1,
+            )
+        timer.stop()
+
+        # spans of the worker process attached under the current span
+        (batch,) = timer.root.children
+        assert batch.attrs == {"nb": 1, "label": "test"}
+        (template_fill,) = batch.children
+        assert template_fill.name == "template fill"
+        assert template_fill.attrs == {"template": "excel_ind.xlsx"}
+        assert [span.name for span in template_fill.children] == ["save"]
+
+        events = timer.to_chrome_trace()["traceEvents"]
+        assert [event["name"] for event in events] == [
+            "run",
+            "batch",
+            "template fill",
+            "save",
+        ]
+        assert all(event["dur"] >= 0 for event in events)
+
+    wrapper_test_good(runnable=runnable)
+
+
+def test_timings_per_context():
+
+    roots = {}
+    barrier = threading.Barrier(2)
+
+    # two concurrent runs (e.g. two sessions) : each one has its own tree
+    def run(name: str):
+        timer.reset(name=name)
+        barrier.wait()
+        with timer.span(f"stage {name}"):
+            barrier.wait()
+        timer.stop()
+        roots[name] = timer.root
+
+    threads = [threading.Thread(target=run, args=(name,)) for name in ("a", "b")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for name, root in roots.items():
+        assert root.name == name
+        assert [span.name for span in root.children] == [f"stage {name}"]
+
+    # without reset : a tree started in the thread, not shared with the others
+    roots_not_reset = []
+
+    def run_not_reset():
+        with timer.span("stage"):
+            pass
+        roots_not_reset.append(timer.root)
+
+    for _ in range(2):
+        thread = threading.Thread(target=run_not_reset)
+        thread.start()
+        thread.join()
+
+    root1, root2 = roots_not_reset
+    assert root1 is not root2
+    assert [span.name for span in root1.children] == ["stage"]
+    assert [span.name for span in root2.children] == ["stage"]
+
+
+def test_fill_templates_batch_wrong_inputs():
+
+    path = PATH_TEST_DOCS_TESTSUITE / "generation/general"
+
+    def runnable():
+        fill_templates_batch(
+            infos_path_files=[
+                path / "excel_ind_config_file.xlsx",
+                path / "docx_ind_config_file.xlsx",
+            ],
+            template_paths=[path / "excel_ind.xlsx", path / "docx_ind.docx"],
+            path_folder_output=path,
+        )
+
+    wrapper_try(runnable, BatchGenerationWrongInputs)
+
+
+def test_fill_template_merge():
+
+    path = PATH_TEST_DOCS_TESTSUITE / "generation/general"
+    infos_path_file = (
+        PATH_TEST_DOCS_TESTSUITE / "read_config_file/info_page/good/values_big.xlsx"
+    )
+
+    def runnable():
+        path_zip = fill_template(
+            infos_path_file=infos_path_file,
+            template_path=path / "merge.xlsx",
+            path_folder_output=path,
+            merge_list_name="n1",
+            max_workers=1,
+        )
+        logger.filter_logs(EmptynessExcelCell)
+
+        with zipfile.ZipFile(path_zip) as z:
+            assert z.namelist() == ["merge_généré_1.xlsx", "merge_généré_2.xlsx"]
+
+        texts = [
+            ExcelBook(path / f"merge_généré_{idx}.xlsx").first_es.get_text_cell(1, 1)
+            for idx in (1, 2)
+        ]
+        assert texts == ["t6 t1 t2", "t6 t4 t5"]
+
+    wrapper_test_good(runnable=runnable)
+
+
+def test_fill_template_merge_wrong_list():
+
+    path = PATH_TEST_DOCS_TESTSUITE / "generation/general"
+
+    def runnable():
+        fill_template(
+            infos_path_file=path / "excel_ind_config_file.xlsx",
+            template_path=path / "merge.xlsx",
+            path_folder_output=path,
+            merge_list_name="not_a_list",
+        )
+
+    wrapper_try(runnable, MergeListNotExisting)
+
+
+# ------------------- Job queue -------------------
+
+
+def test_job_queue(tmp_path: Path):
+
+    path = PATH_TEST_DOCS_TESTSUITE / "generation/general"
+    path_db = tmp_path / "jobs.sqlite"
+
+    def runnable():
+        queue = JobQueue(path_db=path_db, max_workers=1)
+        try:
+            released = threading.Event()
+            job_done = queue.submit(
+                "generation",
+                fill_template,
+                on_done=released.set,
+                infos_path_file=path / "excel_ind_config_file.xlsx",
+                template_path=path / "excel_ind.xlsx",
+                path_folder_output=tmp_path,
+            )
+            job_failed = queue.submit(
+                "generation",
+                fill_template,
+                infos_path_file=path / "not_existing.xlsx",
+                template_path=path / "excel_ind.xlsx",
+                path_folder_output=tmp_path,
+            )
+
+            job = queue.wait(job_done, timeout=60)
+            assert job.status == JobStatus.DONE
+            assert released.wait(timeout=5)
+            assert job.errors == []
+            assert job.progress == {
+                "template fill": Progress(
+                    "template fill", 1, 1, detail="excel_ind.xlsx"
+                )
+            }
+            assert job.result == str(tmp_path / "excel_ind_généré.xlsx")
+            assert job.timings["children"][0]["name"] == "template fill"
+
+            job = queue.wait(job_failed, timeout=60)
+            assert job.status == JobStatus.FAILED
+            assert "PathNotExisting" in job.errors[-1]
+
+            # a finished job is no longer tracked (dropped before 'on_done'),
+            # still waited by polling
+            assert job_done not in queue._futures
+            assert queue.wait(job_done, timeout=5).is_finished
+
+            # measured for the estimations of the next jobs
+            durations = queue.get_stage_durations()
+            assert durations["template fill"] > 0
+
+            job = replace(
+                queue.get(job_done),
+                progress={"template fill": Progress("template fill", 1, 3)},
+            )
+            assert job.remaining_seconds(durations) == {
+                "template fill": 2 * durations["template fill"]
+            }
+        finally:
+            queue.shutdown()
+
+        # persisted for the other sessions
+        assert JobQueue(path_db=path_db, max_workers=1).get(job_done).is_finished
+
+    wrapper_test_good(runnable=runnable)
+
+
+def test_workspace(tmp_path: Path):
+
+    workspace = Workspace(root=tmp_path, ttl=60, quota=100)
+
+    dir_job = workspace.create_job_dir("generation")
+    (dir_job / "output.xlsx").write_bytes(b"a" * 40)
+    path_upload = workspace.path_uploads / "digest.pdf"
+    path_upload.write_bytes(b"b" * 40)
+    assert workspace.usage() == 80
+
+    # used recently : kept
+    assert workspace.collect() == 0
+
+    # not enough room : the least recently used entry not leased is removed
+    old = time.time() - 30
+    os.utime(dir_job, (old, old))
+    with workspace.lease(path_upload):
+        workspace.reserve(50)
+    assert not dir_job.exists()
+    assert path_upload.exists()
+
+    # leased entries are kept, even expired
+    with workspace.lease(path_upload):
+        wrapper_try(lambda: workspace.reserve(80), WorkspaceQuotaExceeded)
+
+        old = time.time() - 120
+        os.utime(path_upload, (old, old))
+        assert workspace.collect() == 0
+
+    # released, used again
+    assert workspace.collect() == 0
+
+    os.utime(path_upload, (old, old))
+    assert workspace.collect() == 40
+    assert workspace.usage() == 0
+
+
+# ------------------- Pdf export -------------------
+
+
+def test_pdf_converter_pool_batches(tmp_path: Path):
+
+    path = PATH_TEST_DOCS_TESTSUITE / "generation/general"
+    paths = [path / "docx_ind.docx", path / "excel_ind.xlsx", path / "merge.xlsx"]
+    calls = []
+    paths_profile = set()
+
+    # stand-in of LibreOffice
+    def converter(paths_batch, path_folder_output, path_profile):
+        calls.append(paths_batch)
+        paths_profile.add(path_profile)
+        for p in paths_batch:
+            (path_folder_output / f"{p.stem}.pdf").write_bytes(b"%PDF-1.4")
+
+    def runnable():
+        with PdfConverterPool(nb_workers=1, batch_size=2, converter=converter) as pool:
+            futures = [pool.submit(p, tmp_path) for p in paths]
+            paths_pdf = [future.result() for future in futures]
+
+        assert paths_pdf == [tmp_path / f"{p.stem}.pdf" for p in paths]
+        assert sum(len(batch) for batch in calls) == len(paths)
+        assert all(len(batch) <= 2 for batch in calls)
+
+        # a profile per pool, removed once closed
+        with PdfConverterPool(nb_workers=1, converter=converter) as pool:
+            pool.submit(paths[0], tmp_path).result()
+        assert len(paths_profile) == 2
+        assert not any(p.parent.exists() for p in paths_profile)
+
+    wrapper_test_good(runnable=runnable)
+
+
+def test_pdf_converter_pool_failed(tmp_path: Path):
+
+    path = PATH_TEST_DOCS_TESTSUITE / "generation/general"
+
+    # pdf left by a previous run
+    (tmp_path / "excel_ind_config_file.pdf").write_bytes(b"%PDF-1.4")
+
+    # converter producing nothing
+    def runnable():
+        with PdfConverterPool(converter=lambda *_: None) as pool:
+            pool.submit(path / "excel_ind_config_file.xlsx", tmp_path).result()
+
+    wrapper_try(runnable, PdfExportFailed)
+
+
+@pytest.mark.skipif(
+    shutil.which("soffice") is None, reason="LibreOffice is not installed"
+)
+def test_fill_template_export_pdf():
+
+    path = PATH_TEST_DOCS_TESTSUITE / "generation/general"
+
+    def runnable():
+        path_pdf = fill_template(
+            infos_path_file=path / "excel_ind_config_file.xlsx",
+            template_path=path / "excel_ind.xlsx",
+            path_folder_output=path,
+            export_pdf=True,
+        )
+        assert path_pdf == path / "excel_ind_généré.pdf"
+        assert path_pdf.read_bytes().startswith(b"%PDF")
+
+    wrapper_test_good(runnable=runnable)